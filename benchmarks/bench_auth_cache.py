@@ -0,0 +1,71 @@
+"""
+Verified-token cache benchmark
+
+Measures authenticated GET /orders/{order_id} throughput of the in-process
+app with and without the verified-token cache, and the cost of
+AuthDependencies.get_current_user alone.
+
+Usage:
+    python -m benchmarks.bench_auth_cache [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+import structlog
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.api.dependencies.auth import auth_deps
+from src.main import app
+from src.shared.auth.token_cache import VerifiedTokenCache
+
+
+async def requests_per_second(requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        token = (await client.post("/auth/token/orders-write")).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        order = {"nom_client": "bench", "montant": 1.0, "devise": "EUR"}
+        order_id = (await client.post("/orders", headers=headers, json=order)).json()[
+            "order"
+        ]
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(f"/orders/{order_id}", headers=headers)
+        return requests / (time.perf_counter() - start)
+
+
+def dependency_cost_us(iterations: int) -> float:
+    token = auth_deps.jwt_service.create_access_token("bench", ["orders:read"])
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        auth_deps.get_current_user(credentials)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'token cache':<12}{'req/s':>10}{'get_current_user (µs)':>24}")
+    for label, cache in (("off", None), ("on", VerifiedTokenCache())):
+        auth_deps.token_cache = cache
+        rps = asyncio.run(requests_per_second(args.requests))
+        cost = dependency_cost_us(args.requests * 10)
+        print(f"{label:<12}{rps:>10.0f}{cost:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Correlation ID middleware benchmark
+
+Compares requests/second of a small app wrapped in the previous
+BaseHTTPMiddleware implementation of CorrelationIdMiddleware with the pure
+ASGI one, served by uvicorn and loaded by concurrent httpx clients.
+
+Usage:
+    python -m benchmarks.bench_correlation_middleware [--requests 3000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import threading
+import time
+import uuid
+from typing import Callable
+
+import httpx
+import structlog
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.middleware.correlation_id import (
+    CorrelationIdMiddleware,
+    correlation_id_context,
+    logger,
+)
+
+
+class LegacyCorrelationIdMiddleware(BaseHTTPMiddleware):
+    """Previous BaseHTTPMiddleware implementation, kept for comparison"""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        correlation_id = request.headers.get("X-Correlation-ID")
+        if not correlation_id:
+            correlation_id = f"req_{uuid.uuid4().hex[:12]}"
+        correlation_id_context.set(correlation_id)
+        logger.info(
+            "request.start",
+            method=request.method,
+            path=request.url.path,
+            query_params=dict(request.query_params),
+            correlation_id=correlation_id,
+            user_agent=request.headers.get("User-Agent", ""),
+            client_ip=request.client.host if request.client else None,
+        )
+        response = await call_next(request)
+        response.headers["X-Correlation-ID"] = correlation_id
+        logger.info(
+            "request.end",
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            correlation_id=correlation_id,
+        )
+        return response
+
+
+def build_app(middleware_class: type) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_class)
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def load(url: str, requests: int, concurrency: int) -> float:
+    async def worker(client: httpx.AsyncClient, count: int) -> None:
+        for _ in range(count):
+            (await client.get(url)).raise_for_status()
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits) as client:
+        await client.get(url)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(client, requests // concurrency) for _ in range(concurrency))
+        )
+        return requests / (time.perf_counter() - start)
+
+
+def bench(middleware_class: type, requests: int, concurrency: int) -> float:
+    port = free_port()
+    config = uvicorn.Config(
+        build_app(middleware_class), port=port, log_level="error", access_log=False
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        return asyncio.run(load(f"http://127.0.0.1:{port}/ping", requests, concurrency))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'middleware':<32}{'req/s':>10}")
+    for middleware_class in (LegacyCorrelationIdMiddleware, CorrelationIdMiddleware):
+        rps = bench(middleware_class, args.requests, args.concurrency)
+        print(f"{middleware_class.__name__:<32}{rps:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
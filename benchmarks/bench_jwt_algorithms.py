@@ -0,0 +1,96 @@
+"""
+JWT verification cost per algorithm
+
+Compares JWTService.verify_token for HS256 (shared secret) with ES256,
+EdDSA and RS256 verified against cached JWKS key objects. The "uncached"
+column re-parses the JWK on every call, which is what verification costs
+without the key cache.
+
+Usage:
+    python -m benchmarks.bench_jwt_algorithms [--iterations 2000]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import jwt
+import structlog
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.shared.auth.jwks import JWKSKeyCache
+from src.shared.auth.jwt_service import JWTService
+
+KEY_FACTORIES = {
+    "ES256": (
+        lambda: ec.generate_private_key(ec.SECP256R1()),
+        jwt.algorithms.ECAlgorithm,
+    ),
+    "EdDSA": (ed25519.Ed25519PrivateKey.generate, jwt.algorithms.OKPAlgorithm),
+    "RS256": (
+        lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        jwt.algorithms.RSAAlgorithm,
+    ),
+}
+
+
+def per_call_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def asymmetric_service(algorithm: str, workdir: Path) -> tuple[JWTService, dict]:
+    generate, jwk_algorithm = KEY_FACTORIES[algorithm]
+    private_key = generate()
+    jwk = {**json.loads(jwk_algorithm.to_jwk(private_key.public_key())), "kid": "bench"}
+    jwks_file = workdir / f"{algorithm}.json"
+    jwks_file.write_text(json.dumps({"keys": [{**jwk, "alg": algorithm}]}))
+
+    key_cache = JWKSKeyCache(str(jwks_file))
+    key_cache.load()
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    service = JWTService(
+        "unused", algorithm, key_cache=key_cache, signing_key=pem, key_id="bench"
+    )
+    return service, jwk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'algorithm':<10}{'cached key (µs)':>17}{'uncached (µs)':>15}")
+
+    hs256 = JWTService("bench-secret-" + "x" * 32, "HS256")
+    token = hs256.create_access_token("bench", ["orders:read"])
+    cost = per_call_us(lambda: hs256.verify_token(token), args.iterations)
+    print(f"{'HS256':<10}{cost:>17.1f}{'-':>15}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for algorithm in KEY_FACTORIES:
+            service, jwk = asymmetric_service(algorithm, Path(workdir))
+            token = service.create_access_token("bench", ["orders:read"])
+            cached = per_call_us(lambda: service.verify_token(token), args.iterations)
+            uncached = per_call_us(
+                lambda: jwt.decode(
+                    token, jwt.PyJWK(jwk, algorithm).key, algorithms=[algorithm]
+                ),
+                args.iterations,
+            )
+            print(f"{algorithm:<10}{cached:>17.1f}{uncached:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Logging latency benchmark
+
+Measures the latency of authenticated GET /orders/{order_id} requests on the
+in-process app with logging off, with the synchronous stdlib JSON pipeline
+and with the queue-based background writer. Logs go to /dev/null through a
+stream that waits --write-latency-us per write, to model a slow log
+destination (pipe to a collector, saturated disk); use 0 for a free sink.
+
+Usage:
+    python -m benchmarks.bench_logging [--requests 2000] [--write-latency-us 200]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from src.api.middleware.correlation_id import configure_structlog
+from src.main import app
+from src.shared.log.queue_sink import QueueLogSink
+
+MODES = ("off", "sync", "async")
+
+
+class SlowStream(io.TextIOBase):
+    """Text stream to /dev/null whose writes take a fixed time"""
+
+    def __init__(self, write_latency: float):
+        self.write_latency = write_latency
+        self.devnull = open(os.devnull, "w")
+
+    def write(self, text: str) -> int:
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        return self.devnull.write(text)
+
+
+async def latencies_us(requests: int) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        token = (await client.post("/auth/token/orders-write")).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        order = {"nom_client": "bench", "montant": 1.0, "devise": "EUR"}
+        created = await client.post("/orders", headers=headers, json=order)
+        url = f"/orders/{created.json()['order']}"
+
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get(url, headers=headers)
+            samples.append((time.perf_counter() - start) * 1_000_000)
+        return samples
+
+
+def run_mode(mode: str, requests: int, write_latency: float) -> None:
+    """Measure one mode; structlog caches loggers, so each mode runs in its own process"""
+    stream = SlowStream(write_latency)
+    root = logging.getLogger()
+    root.addHandler(logging.StreamHandler(stream))
+    root.setLevel(logging.CRITICAL if mode == "off" else logging.INFO)
+
+    sink = None
+    if mode == "async":
+        sink = QueueLogSink(stream=stream)
+        sink.start()
+    configure_structlog(sink)
+
+    samples = asyncio.run(latencies_us(requests))
+    if sink is not None:
+        sink.close()
+
+    p99 = statistics.quantiles(samples, n=100)[98]
+    print(f"{mode:<8}{statistics.fmean(samples):>11.0f}{p99:>11.0f}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--write-latency-us", type=float, default=200.0)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.requests, args.write_latency_us / 1_000_000)
+        return
+
+    print(f"{'logging':<8}{'mean (µs)':>11}{'p99 (µs)':>11}", flush=True)
+    for mode in MODES:
+        subprocess.run(
+            [sys.executable, "-W", "ignore", "-m", __spec__.name]
+            + ["--mode", mode, "--requests", str(args.requests)]
+            + ["--write-latency-us", str(args.write_latency_us)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
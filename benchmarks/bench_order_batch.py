@@ -0,0 +1,53 @@
+"""
+Batch order creation benchmark
+
+Compares orders/second when creating orders one by one through POST /orders
+with a single POST /orders:batch request, through the full middleware and
+authentication stack of the in-process app.
+
+Usage:
+    python -m benchmarks.bench_order_batch [--orders 500]
+"""
+
+import argparse
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    payload = [
+        {"nom_client": f"client-{i}", "montant": 10.0, "devise": "EUR"}
+        for i in range(args.orders)
+    ]
+
+    with TestClient(app) as client:
+        token = client.post("/auth/token/orders-write").json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        for order in payload:
+            client.post("/orders", headers=headers, json=order)
+        single = args.orders / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = client.post("/orders:batch", headers=headers, json=payload)
+        batch = args.orders / (time.perf_counter() - start)
+        assert response.json()["created"] == args.orders
+
+    print(f"{'mode':<16}{'orders/s':>12}")
+    print(f"{'POST /orders':<16}{single:>12.0f}")
+    print(f"{'POST :batch':<16}{batch:>12.0f}")
+    print(f"speed-up: {batch / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
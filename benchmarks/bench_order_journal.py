@@ -0,0 +1,125 @@
+"""
+Order journal benchmark
+
+Measures order write throughput for each fsync policy (concurrent writers
+each adding an order and awaiting flush(), as POST /orders does), and the
+startup replay time against the number of stored orders, from journal
+segments and from a compacted snapshot.
+
+Usage:
+    python -m benchmarks.bench_order_journal [--writes 5000] [--writers 64]
+        [--counts 10000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import uuid
+
+import structlog
+
+from src.domain.repositories.columnar_order_repository import ColumnarOrderRepository
+from src.domain.repositories.journaled_order_repository import (
+    JournaledOrderRepository,
+    encode_order,
+)
+from src.domain.repositories.order_repository import InMemoryOrderRepository
+from src.domain.schemas.order import OrderOut
+from src.shared.storage.journal import Journal
+
+
+def make_order(i: int) -> OrderOut:
+    return OrderOut.model_construct(
+        order_id=uuid.uuid4(),
+        customer_name=f"client-{i % 1000}",
+        total_amount=float(i % 500),
+        currency=("EUR", "USD", "GBP")[i % 3],
+        created_by=None,
+    )
+
+
+async def write_throughput(policy: str, writes: int, writers: int) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as directory:
+        repository = JournaledOrderRepository(
+            InMemoryOrderRepository(),
+            directory,
+            fsync_policy=policy,
+            snapshot_interval=0,
+        )
+        await repository.open()
+
+        async def writer(count: int) -> None:
+            for i in range(count):
+                repository.add(make_order(i))
+                await repository.flush()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer(writes // writers) for _ in range(writers)))
+        elapsed = time.perf_counter() - start
+        fsyncs = repository.stats()["fsyncs"]
+        await repository.close()
+    return (writes // writers * writers) / elapsed, fsyncs
+
+
+async def replay_seconds(count: int, snapshot: bool, columnar: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        writer = JournaledOrderRepository(
+            InMemoryOrderRepository(), directory, snapshot_interval=0
+        )
+        await writer.open()
+        await writer.close()
+        journal = Journal(writer._segment_path(0), fsync_policy="never")
+        for start in range(0, count, 10_000):
+            journal.append_many(
+                encode_order(make_order(i))
+                for i in range(start, min(count, start + 10_000))
+            )
+        await journal.close()
+        if snapshot:
+            loaded = JournaledOrderRepository(
+                InMemoryOrderRepository(), directory, snapshot_interval=0
+            )
+            await loaded.open()
+            await loaded.snapshot()
+            await loaded.close()
+
+        inner = ColumnarOrderRepository() if columnar else InMemoryOrderRepository()
+        repository = JournaledOrderRepository(inner, directory, snapshot_interval=0)
+        start = time.perf_counter()
+        await repository.open()
+        elapsed = time.perf_counter() - start
+        assert len(repository) == count
+        await repository.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=5_000)
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'fsync policy':<14}{'orders/s':>10}{'fsyncs':>9}")
+    for policy in ("always", "group", "periodic", "never"):
+        rate, fsyncs = asyncio.run(write_throughput(policy, args.writes, args.writers))
+        print(f"{policy:<14}{rate:>10.0f}{fsyncs:>9}")
+
+    print()
+    print(f"{'orders':>10}{'journal s':>11}{'snapshot s':>12}{'columnar s':>12}")
+    for count in args.counts:
+        journal = asyncio.run(replay_seconds(count, snapshot=False, columnar=False))
+        snapshot = asyncio.run(replay_seconds(count, snapshot=True, columnar=False))
+        columnar = asyncio.run(replay_seconds(count, snapshot=True, columnar=True))
+        print(f"{count:>10}{journal:>11.2f}{snapshot:>12.2f}{columnar:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Order lookup micro-benchmark
+
+Measures OrderService.get_order latency against the in-memory repository for
+growing order counts. Lookups are O(1), so the latency should stay flat from
+1k to 1M orders.
+
+Usage:
+    python -m benchmarks.bench_order_lookup [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+import structlog
+
+from src.domain.repositories.order_repository import InMemoryOrderRepository
+from src.domain.schemas.order import OrderOut
+from src.domain.services.order_service import OrderService
+
+CURRENCIES = ["EUR", "USD", "GBP", "MAD", "JPY"]
+
+
+def build_repository(size: int) -> tuple[InMemoryOrderRepository, list[uuid.UUID]]:
+    """Fill a repository with `size` orders (validation skipped for speed)"""
+    repository = InMemoryOrderRepository()
+    ids = []
+    for i in range(size):
+        order_id = uuid.uuid4()
+        repository.add(
+            OrderOut.model_construct(
+                order_id=order_id,
+                customer_name=f"customer-{i % 10_000}",
+                total_amount=float(i % 1_000),
+                currency=CURRENCIES[i % len(CURRENCIES)],
+            )
+        )
+        ids.append(order_id)
+    return repository, ids
+
+
+def bench_lookup(size: int, lookups: int) -> float:
+    """Return the mean get_order latency in microseconds"""
+    repository, all_ids = build_repository(size)
+    service = OrderService(repository)
+    ids = random.sample(all_ids, k=lookups)
+
+    start = time.perf_counter()
+    for order_id in ids:
+        service.get_order(order_id)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / lookups * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--lookups", type=int, default=1_000)
+    args = parser.parse_args()
+
+    # Keep the logger out of the measurement
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'orders':>10}  {'get_order (µs)':>15}")
+    for size in args.sizes:
+        latency = bench_lookup(size, min(args.lookups, size))
+        print(f"{size:>10}  {latency:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Order storage memory benchmark
+
+Compares the bytes used per stored order by a plain list of OrderOut models
+(the original storage), InMemoryOrderRepository and ColumnarOrderRepository.
+
+Usage:
+    python -m benchmarks.bench_order_memory [--orders 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+import uuid
+from typing import Callable
+
+from src.domain.repositories.columnar_order_repository import ColumnarOrderRepository
+from src.domain.repositories.order_repository import InMemoryOrderRepository
+from src.domain.schemas.order import OrderOut
+
+CURRENCIES = ["EUR", "USD", "GBP", "MAD", "JPY"]
+
+
+def make_order(i: int) -> OrderOut:
+    return OrderOut(
+        order_id=uuid.uuid4(),
+        customer_name=f"customer-{i % 10_000}",
+        total_amount=float(i % 1_000) + 0.99,
+        currency=CURRENCIES[i % len(CURRENCIES)],
+    )
+
+
+def fill_list(count: int) -> list[OrderOut]:
+    return [make_order(i) for i in range(count)]
+
+
+def fill_repository(factory: Callable) -> Callable[[int], object]:
+    def fill(count: int) -> object:
+        repository = factory()
+        for i in range(count):
+            repository.add(make_order(i))
+        return repository
+
+    return fill
+
+
+def bytes_per_order(fill: Callable[[int], object], count: int) -> float:
+    """Memory retained by the storage once filled, divided by the order count"""
+    gc.collect()
+    tracemalloc.start()
+    storage = fill(count)
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del storage
+    return retained / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    storages = {
+        "list[OrderOut]": fill_list,
+        "InMemoryOrderRepository": fill_repository(InMemoryOrderRepository),
+        "ColumnarOrderRepository": fill_repository(ColumnarOrderRepository),
+    }
+
+    print(f"{args.orders} orders")
+    print(f"{'storage':<26}{'bytes/order':>12}")
+    for name, fill in storages.items():
+        print(f"{name:<26}{bytes_per_order(fill, args.orders):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+SQLite order repository benchmark
+
+Compares the SQLite repository (synchronous=FULL and NORMAL) with the
+in-memory one through OrderService, as the routes use it:
+
+- create: concurrent callers each creating an order and awaiting flush(),
+  like POST /orders;
+- fetch: concurrent fetch_order() calls on a prefilled store, like
+  GET /orders/{order_id} without the response cache.
+
+Usage:
+    python -m benchmarks.bench_order_sqlite [--orders 100000] [--creates 5000]
+        [--fetches 20000] [--concurrency 64]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+import uuid
+
+import structlog
+
+from src.domain.repositories.order_repository import (
+    InMemoryOrderRepository,
+    OrderRepository,
+)
+from src.domain.repositories.sqlite_order_repository import SqliteOrderRepository
+from src.domain.schemas.order import OrderIn, OrderOut
+from src.domain.services.order_service import OrderService
+
+CURRENCIES = ["EUR", "USD", "GBP", "MAD", "JPY"]
+
+
+def make_order(i: int) -> OrderOut:
+    return OrderOut.model_construct(
+        order_id=uuid.uuid4(),
+        customer_name=f"customer-{i % 10_000}",
+        total_amount=float(i % 1_000),
+        currency=CURRENCIES[i % len(CURRENCIES)],
+        created_by=None,
+    )
+
+
+async def run_concurrently(calls: list, concurrency: int) -> float:
+    """Run the coroutine factories with `concurrency` workers, return ops/s"""
+    queue = iter(calls)
+
+    async def worker() -> None:
+        for call in queue:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(calls) / (time.perf_counter() - start)
+
+
+async def bench(
+    repository: OrderRepository, orders: int, creates: int, fetches: int, workers: int
+) -> tuple[float, float, float]:
+    await repository.open()
+    service = OrderService(repository)
+
+    order_in = OrderIn(customer_name="bench", total_amount=10.0, currency="EUR")
+
+    async def create() -> None:
+        service.create_order(order_in)
+        await service.flush()
+
+    create_rate = await run_concurrently([create] * creates, workers)
+
+    stored = [make_order(i) for i in range(orders)]
+    for start in range(0, orders, 10_000):
+        end = start + 10_000
+        repository.add_many(stored[start:end])
+        await repository.flush()
+    ids = [order.order_id for order in random.sample(stored, k=fetches)]
+
+    fetch_rate = await run_concurrently(
+        [lambda order_id=order_id: service.fetch_order(order_id) for order_id in ids],
+        workers,
+    )
+
+    start = time.perf_counter()
+    for order_id in ids[:1000]:
+        service.get_order(order_id)
+    get_latency = (time.perf_counter() - start) / len(ids[:1000]) * 1_000_000
+
+    await repository.close()
+    return create_rate, fetch_rate, get_latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--creates", type=int, default=5_000)
+    parser.add_argument("--fetches", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'repository':<16}{'creates/s':>11}{'fetches/s':>11}{'sync get µs':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        candidates = {
+            "memory": InMemoryOrderRepository(),
+            "sqlite FULL": SqliteOrderRepository(f"{directory}/full.db"),
+            "sqlite NORMAL": SqliteOrderRepository(
+                f"{directory}/normal.db", synchronous="NORMAL"
+            ),
+        }
+        for name, repository in candidates.items():
+            create_rate, fetch_rate, get_latency = asyncio.run(
+                bench(
+                    repository,
+                    args.orders,
+                    args.creates,
+                    args.fetches,
+                    args.concurrency,
+                )
+            )
+            print(
+                f"{name:<16}{create_rate:>11.0f}{fetch_rate:>11.0f}"
+                f"{get_latency:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Order streaming time-to-first-byte benchmark
+
+Measures the time until the first NDJSON chunk of GET /orders is produced,
+and the time to stream everything, for growing order counts. The first chunk
+only depends on the chunk size, not on the number of stored orders.
+
+Usage:
+    python -m benchmarks.bench_order_stream [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import asyncio
+import time
+
+import structlog
+
+from benchmarks.bench_order_lookup import build_repository
+from src.api.routes.orders import _ndjson_lines
+from src.domain.services.order_service import OrderService
+
+
+async def bench_stream(size: int) -> tuple[float, float]:
+    """Return (time to first chunk, total time) in milliseconds"""
+    repository, _ids = build_repository(size)
+    service = OrderService(repository)
+
+    start = time.perf_counter()
+    first_chunk = None
+    async for _chunk in _ndjson_lines(service.stream_orders()):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    return first_chunk * 1000, total * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    args = parser.parse_args()
+
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'orders':>10}  {'first chunk (ms)':>17}  {'total (ms)':>11}")
+    for size in args.sizes:
+        first_chunk, total = asyncio.run(bench_stream(size))
+        print(f"{size:>10}  {first_chunk:>17.3f}  {total:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+OrderOut response serialisation benchmark
+
+Compares the cost per order of FastAPI's response_model path (re-validation,
+serialisation to a dict, JSONResponse rendering) with PydanticJSONResponse,
+and end-to-end POST /orders requests/second of two otherwise identical apps.
+
+Usage:
+    python -m benchmarks.bench_serialization [--iterations 20000] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.api.responses.pydantic_response import PydanticJSONResponse
+from src.domain.schemas.order import OrderIn, OrderOut
+
+ORDER = OrderOut(
+    order_id=uuid.uuid4(),
+    customer_name="hasna",
+    total_amount=99.99,
+    currency="EUR",
+    created_by="admin",
+)
+
+
+def per_order_us(render, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def build_app(fast: bool) -> FastAPI:
+    app = FastAPI()
+
+    def to_order(order: OrderIn) -> OrderOut:
+        return OrderOut(
+            order_id=uuid.uuid4(),
+            customer_name=order.customer_name,
+            total_amount=order.total_amount,
+            currency=order.currency,
+        )
+
+    if fast:
+
+        @app.post("/orders", status_code=201, response_model=OrderOut)
+        async def create_fast(order: OrderIn) -> PydanticJSONResponse:
+            return PydanticJSONResponse(to_order(order), status_code=201)
+
+    else:
+
+        @app.post("/orders", status_code=201, response_model=OrderOut)
+        async def create_default(order: OrderIn) -> OrderOut:
+            return to_order(order)
+
+    return app
+
+
+async def requests_per_second(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    payload = {"nom_client": "hasna", "montant": 99.99, "devise": "EUR"}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.post("/orders", json=payload)
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+
+    field = create_model_field("OrderOut", OrderOut, mode="serialization")
+
+    async def response_model_path() -> bytes:
+        content = await serialize_response(field=field, response_content=ORDER)
+        return JSONResponse(content).body
+
+    loop = asyncio.new_event_loop()
+    default_cost = per_order_us(
+        lambda: loop.run_until_complete(response_model_path()), args.iterations
+    )
+    baseline = per_order_us(
+        lambda: loop.run_until_complete(asyncio.sleep(0)), args.iterations
+    )
+    fast_cost = per_order_us(lambda: PydanticJSONResponse(ORDER).body, args.iterations)
+
+    print(f"{'path':<22}{'µs/order':>10}{'POST req/s':>12}")
+    for label, cost, fast in (
+        ("response_model", default_cost - baseline, False),
+        ("PydanticJSONResponse", fast_cost, True),
+    ):
+        rps = asyncio.run(requests_per_second(build_app(fast), args.requests))
+        print(f"{label:<22}{cost:>10.2f}{rps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Upstream proxying memory benchmark
+
+Measures the peak memory allocated while relaying an upstream body of
+growing size, buffered (client.get, then response.content) versus streamed
+through safe_stream. The upstream is an in-process httpx.MockTransport
+producing the body in 64 KiB chunks.
+
+Usage:
+    python -m benchmarks.bench_stream_proxy [--sizes-mb 1 10 50]
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import tracemalloc
+
+import httpx
+import structlog
+
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import safe_stream
+from src.shared.http.resilience import UpstreamGuards
+
+CHUNK = b"x" * 65_536
+URL = "http://upstream.bench/bytes"
+
+
+def make_client(size: int) -> httpx.AsyncClient:
+    async def body():
+        for _ in range(size // len(CHUNK)):
+            yield CHUNK
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def relay_buffered(client: httpx.AsyncClient) -> int:
+    response = await client.get(URL)
+    return len(response.content)
+
+
+async def relay_streamed(client: httpx.AsyncClient) -> int:
+    guards = UpstreamGuards(HTTPClientSettings())
+    stream = await safe_stream(client, URL, guards=guards, max_bytes=None)
+    relayed = 0
+    async for chunk in stream:
+        relayed += len(chunk)
+    return relayed
+
+
+def peak_mb(relay, size: int) -> float:
+    async def run() -> int:
+        async with make_client(size) as client:
+            return await relay(client)
+
+    gc.collect()
+    tracemalloc.start()
+    relayed = asyncio.run(run())
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert relayed == size // len(CHUNK) * len(CHUNK)
+    return peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    print(f"{'body':>8}{'buffered peak MB':>20}{'streamed peak MB':>20}")
+    for size_mb in args.sizes_mb:
+        size = size_mb * 1024 * 1024
+        print(
+            f"{size_mb:>6}MB"
+            f"{peak_mb(relay_buffered, size):>20.1f}"
+            f"{peak_mb(relay_streamed, size):>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Multi-worker benchmark
+
+Starts uvicorn with WEB_CONCURRENCY=1, 2, 4... workers sharing the SQLite
+order store (and the in-memory store with a single worker, for reference),
+then drives POST /orders and GET /orders/{order_id} from several load
+generator processes, so the client side is not the bottleneck. Reports
+requests/s against the number of workers.
+
+Usage:
+    python -m benchmarks.bench_workers [--workers 1 2 4] [--requests 4000]
+        [--concurrency 16] [--load-processes 2]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+
+from benchmarks.harness import Scenario, run_load
+
+ORDER = {"nom_client": "bench", "montant": 42.5, "devise": "EUR"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def uvicorn_server(workers: int, backend: str, directory: str) -> Iterator[str]:
+    """Run uvicorn in a subprocess until the block exits, yield its URL"""
+    port = free_port()
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "ORDER_STORE_BACKEND": backend,
+        "ORDER_STORE_SQLITE_PATH": os.path.join(directory, f"orders-{port}.db"),
+        "METRICS_MULTIPROCESS_DIR": directory,
+        "LOG_LEVEL": "WARNING",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{url}/health").raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.1)
+        # Let every worker finish its startup
+        time.sleep(0.5 * workers)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def load(url: str, scenario: Scenario, requests: int, concurrency: int) -> float:
+    """Load generator process: send the scenario, return its requests/s"""
+
+    async def main() -> float:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            await run_load(client, scenario, concurrency, concurrency)
+            result = await run_load(client, scenario, requests, concurrency)
+        if result.errors:
+            raise RuntimeError(f"{scenario.name}: {result.errors} errors")
+        return result.rps
+
+    return asyncio.run(main())
+
+
+def measure(
+    pool: ProcessPoolExecutor,
+    url: str,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    processes: int,
+) -> float:
+    per_process = requests // processes
+    futures = [
+        pool.submit(load, url, scenario, per_process, concurrency)
+        for _ in range(processes)
+    ]
+    return sum(future.result() for future in futures)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=4_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--load-processes", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'store':<8}{'workers':>8}{'create req/s':>14}{'read req/s':>12}")
+    runs = [("memory", 1)] + [("sqlite", workers) for workers in args.workers]
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        ProcessPoolExecutor(args.load_processes) as pool,
+    ):
+        for backend, workers in runs:
+            with uvicorn_server(workers, backend, directory) as url:
+                token = httpx.post(f"{url}/auth/token/orders-write?user_id=bench")
+                auth = {"Authorization": f"Bearer {token.json()['access_token']}"}
+                created = httpx.post(f"{url}/orders", json=ORDER, headers=auth)
+                order_id = created.json()["order"]
+
+                create = Scenario("order_create", "POST", "/orders", 201, auth, ORDER)
+                read = Scenario("order_read", "GET", f"/orders/{order_id}", 200, auth)
+                create_rps, read_rps = (
+                    measure(
+                        pool,
+                        url,
+                        scenario,
+                        args.requests,
+                        args.concurrency,
+                        args.load_processes,
+                    )
+                    for scenario in (create, read)
+                )
+            print(f"{backend:<8}{workers:>8}{create_rps:>14.0f}{read_rps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Load generation and reporting for the benchmark suite
+
+A scenario is a request template sent repeatedly by `concurrency` workers
+sharing one httpx client. The timed pass reports throughput and latency
+percentiles; a separate, shorter pass under tracemalloc reports allocations,
+so tracing does not distort the timings.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    expected_status: int
+    headers: dict[str, str] = field(default_factory=dict)
+    json: Any = None
+
+    async def send(self, client: httpx.AsyncClient) -> httpx.Response:
+        return await client.request(
+            self.method, self.path, headers=self.headers, json=self.json
+        )
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    alloc_peak_kib: Optional[float] = None
+    retained_kib: Optional[float] = None
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> Result:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(count: int) -> None:
+        nonlocal errors
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await scenario.send(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+
+    per_worker, extra = divmod(requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(worker(per_worker + (i < extra)) for i in range(concurrency))
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return Result(
+        requests=requests,
+        errors=errors,
+        rps=round(requests / elapsed, 1),
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+        max_ms=round(latencies[-1] * 1000, 3),
+    )
+
+
+async def measure_allocations(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int
+) -> tuple[float, float]:
+    """
+    Median per-request peak of traced memory and memory retained per request
+
+    Both include the in-process client side of the request.
+    """
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for _ in range(requests):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await scenario.send(client)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (
+        round(statistics.median(peaks) / 1024, 1),
+        round((current - baseline) / requests / 1024, 2),
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    allocation_requests: int,
+) -> Result:
+    await run_load(client, scenario, warmup, concurrency)
+    result = await run_load(client, scenario, requests, concurrency)
+    if allocation_requests:
+        result.alloc_peak_kib, result.retained_kib = await measure_allocations(
+            client, scenario, allocation_requests
+        )
+    return result
+
+
+# Baselines
+
+
+def environment(mode: str, requests: int, concurrency: int) -> dict[str, Any]:
+    return {
+        "mode": mode,
+        "requests": requests,
+        "concurrency": concurrency,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def save_baseline(path: Path, env: dict[str, Any], results: dict[str, Result]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "environment": env,
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path) -> Optional[dict[str, Any]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def change(current: float, previous: Optional[float]) -> Optional[float]:
+    if not previous:
+        return None
+    return (current - previous) / previous * 100
+
+
+def report(
+    results: dict[str, Result],
+    baseline: Optional[dict[str, Any]],
+    tolerance_percent: float,
+) -> list[str]:
+    """
+    Print the results table and return the scenarios that regressed
+
+    A scenario regresses when its throughput drops, or its p95 latency rises,
+    by more than `tolerance_percent` against the baseline.
+    """
+    previous = (baseline or {}).get("results", {})
+    header = (
+        f"{'scenario':<18}{'req/s':>9}{'Δ%':>7}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'Δ%':>7}{'p99 ms':>9}{'alloc KiB':>11}{'kept KiB':>10}{'errors':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    regressions = []
+    for name, result in results.items():
+        before = previous.get(name, {})
+        rps_change = change(result.rps, before.get("rps"))
+        p95_change = change(result.p95_ms, before.get("p95_ms"))
+        if (rps_change is not None and rps_change < -tolerance_percent) or (
+            p95_change is not None and p95_change > tolerance_percent
+        ):
+            regressions.append(name)
+        print(
+            f"{name:<18}{result.rps:>9.0f}{_delta(rps_change):>7}"
+            f"{result.p50_ms:>9.2f}{result.p95_ms:>9.2f}{_delta(p95_change):>7}"
+            f"{result.p99_ms:>9.2f}{_optional(result.alloc_peak_kib):>11}"
+            f"{_optional(result.retained_kib):>10}{result.errors:>8}"
+        )
+    return regressions
+
+
+def _delta(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:+.0f}"
+
+
+def _optional(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:.1f}"
@@ -0,0 +1,145 @@
+"""
+PosHub API benchmark suite
+
+Drives the real application (src.main:app) in-process through
+httpx.ASGITransport, or over TCP under uvicorn with --uvicorn, through
+token issue, authenticated order create/read, error paths and
+/external-demo against a local stand-in upstream. Reports throughput,
+p50/p95/p99 latency and allocations, and compares them with the stored
+baseline of the same mode (benchmarks/baselines/<mode>.json).
+
+Usage:
+    python -m benchmarks.run_suite [--requests 2000] [--concurrency 10]
+        [--scenarios order_create order_read] [--uvicorn]
+        [--save-baseline] [--fail-on-regression] [--tolerance 15]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+import structlog
+import uvicorn
+
+from benchmarks.harness import (
+    Result,
+    environment,
+    load_baseline,
+    report,
+    run_scenario,
+    save_baseline,
+)
+from benchmarks.scenarios import build_scenarios, stand_in_upstream, use_stand_in
+from src.main import app
+
+BASELINES = Path(__file__).parent / "baselines"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def asgi_client(concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    port = free_port()
+    config = uvicorn.Config(app, port=port, log_level="error", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits
+        ) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await asyncio.to_thread(thread.join)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Result]:
+    results = {}
+    async with stand_in_upstream() as upstream_url:
+        use_stand_in(upstream_url)
+        connect = uvicorn_client if args.uvicorn else asgi_client
+        async with connect(args.concurrency) as client:
+            for scenario in await build_scenarios(client):
+                if args.scenarios and scenario.name not in args.scenarios:
+                    continue
+                results[scenario.name] = await run_scenario(
+                    client,
+                    scenario,
+                    requests=args.requests,
+                    concurrency=args.concurrency,
+                    warmup=args.warmup,
+                    allocation_requests=args.allocation_requests,
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--allocation-requests", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="*")
+    parser.add_argument("--uvicorn", action="store_true")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=15.0, help="regression threshold in %%"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    structlog.configure(processors=[], logger_factory=structlog.ReturnLoggerFactory())
+
+    mode = "uvicorn" if args.uvicorn else "asgi"
+    baseline_path = BASELINES / f"{mode}.json"
+    env = environment(mode, args.requests, args.concurrency)
+
+    started = time.perf_counter()
+    results = asyncio.run(run(args))
+    baseline = load_baseline(baseline_path)
+    print(
+        f"mode={mode} requests={args.requests} concurrency={args.concurrency} "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+    if baseline is not None and baseline["environment"] != env:
+        print(f"note: baseline recorded with {baseline['environment']}")
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        save_baseline(baseline_path, env, results)
+        print(f"baseline saved to {baseline_path}")
+    elif regressions:
+        print(f"regressions (> {args.tolerance:.0f}%): {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
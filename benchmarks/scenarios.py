@@ -0,0 +1,102 @@
+"""
+Benchmark scenarios against the real PosHub application
+
+/external-demo calls are redirected to a local stand-in upstream (a minimal
+keep-alive HTTP/1.1 server answering like httpbin's /get), so the outbound
+path, connection pool and resilience layers run without network access.
+"""
+
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from benchmarks.harness import Scenario
+from src.shared.http import pool
+
+STAND_IN_BODY = json.dumps(
+    {"args": {"demo": "SMCP"}, "headers": {}, "url": "https://httpbin.org/get"}
+).encode()
+
+
+@asynccontextmanager
+async def stand_in_upstream() -> AsyncIterator[str]:
+    """Local upstream answering every request with a fixed JSON body"""
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+        b"Content-Length: " + str(len(STAND_IN_BODY)).encode() + b"\r\n\r\n"
+    ) + STAND_IN_BODY
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.close()
+
+
+def use_stand_in(upstream_url: str) -> None:
+    """
+    Redirect the outbound clients built from now on to the stand-in upstream
+
+    The pooled transports are kept (pool statistics, limits); only the
+    scheme, host and port of each request are replaced.
+    """
+    upstream = httpx.URL(upstream_url)
+    build_transport = pool.build_transport
+
+    def build_stand_in_transport(*args, **kwargs) -> httpx.AsyncBaseTransport:
+        transport = build_transport(*args, **kwargs)
+        handle = transport.handle_async_request
+
+        async def redirected(request: httpx.Request) -> httpx.Response:
+            request.url = request.url.copy_with(
+                scheme=upstream.scheme, host=upstream.host, port=upstream.port
+            )
+            return await handle(request)
+
+        transport.handle_async_request = redirected
+        return transport
+
+    pool.build_transport = build_stand_in_transport
+
+
+async def build_scenarios(client: httpx.AsyncClient) -> list[Scenario]:
+    """Scenarios of the suite; issues a token and creates an order to read"""
+    token = (await client.post("/auth/token/orders-write?user_id=bench")).json()
+    auth = {"Authorization": f"Bearer {token['access_token']}"}
+    order = {"nom_client": "bench", "montant": 42.5, "devise": "EUR"}
+    created = await client.post("/orders", json=order, headers=auth)
+    created.raise_for_status()
+    order_id = created.json()["order"]
+
+    return [
+        Scenario("token_issue", "POST", "/auth/token/orders-write?user_id=bench", 200),
+        Scenario("order_create", "POST", "/orders", 201, auth, order),
+        Scenario("order_read", "GET", f"/orders/{order_id}", 200, auth),
+        Scenario("order_not_found", "GET", f"/orders/{uuid.uuid4()}", 404, auth),
+        Scenario(
+            "invalid_token",
+            "GET",
+            f"/orders/{order_id}",
+            401,
+            {"Authorization": "Bearer not-a-token"},
+        ),
+        Scenario(
+            "validation_error", "POST", "/orders", 422, auth, {**order, "devise": "e"}
+        ),
+        Scenario("external_demo", "GET", "/external-demo", 200),
+    ]
@@ -1,11 +1,18 @@
-from typing import Annotated, List
+import time
+from pathlib import Path
+from typing import Annotated, List, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from src.shared.auth.jwks import JWKSKeyCache
 from src.shared.auth.jwt_service import JWTService
+from src.shared.auth.scopes import ScopeRegistry, scope_registry
+from src.shared.auth.token_cache import VerifiedTokenCache
 from src.shared.config.jwt_config import jwt_settings
+from src.shared.metrics.instruments import jwt_verify_duration_seconds
+from src.shared.profiling.request_profile import span
 
 
 class AuthenticatedUser(BaseModel):
@@ -13,11 +20,23 @@ class AuthenticatedUser(BaseModel):
 
     user_id: str
     scopes: List[str]
+    # Scopes convertis en masque une seule fois, à l'authentification
+    scope_mask: int = Field(default=0, exclude=True)
+
+    # Partagé entre les requêtes via le cache des tokens
+    model_config = {"frozen": True}
 
 
 class AuthDependencies:
-    def __init__(self, jwt_service: JWTService):
+    def __init__(
+        self,
+        jwt_service: JWTService,
+        token_cache: Optional[VerifiedTokenCache] = None,
+        scopes: ScopeRegistry = scope_registry,
+    ):
         self.jwt_service = jwt_service
+        self.token_cache = token_cache
+        self.scopes = scopes
         self.bearer_scheme = HTTPBearer()
 
     def get_current_user(
@@ -36,26 +55,58 @@ class AuthDependencies:
         Raises:
             HTTPException: Si le token est invalide
         """
+        with span("auth"):
+            return self._authenticate(credentials.credentials)
+
+    def _authenticate(self, token: str) -> AuthenticatedUser:
+        # Token déjà vérifié et pas encore expiré
+        if self.token_cache is not None:
+            cached_user = self.token_cache.get(token)
+            if cached_user is not None:
+                return cached_user
+
         # Vérifier et décoder le token
-        payload = self.jwt_service.verify_token(credentials.credentials)
+        started = time.perf_counter()
+        try:
+            payload = self.jwt_service.verify_token(token)
+        except HTTPException:
+            jwt_verify_duration_seconds.labels("invalid").observe(
+                time.perf_counter() - started
+            )
+            raise
+        jwt_verify_duration_seconds.labels("valid").observe(
+            time.perf_counter() - started
+        )
 
         # Créer l'utilisateur authentifié
-        return AuthenticatedUser(
-            user_id=payload["user_id"], scopes=payload.get("scopes", [])
+        scopes = payload.get("scopes", [])
+        user = AuthenticatedUser(
+            user_id=payload["user_id"],
+            scopes=scopes,
+            scope_mask=self.scopes.to_mask(scopes),
         )
 
+        if self.token_cache is not None:
+            self.token_cache.put(token, user, expires_at=payload.get("exp"))
+
+        return user
+
     def require_scopes(self, required_scopes: List[str]):
         """
         Crée une dépendance qui vérifie que l'utilisateur a les scopes requis
 
+        Les scopes requis sont compilés en masque dès la création de la
+        dépendance ; la vérification par requête est un ET binaire.
+
         Args:
-            required_scopes: Liste des scopes requis
+            required_scopes: Liste des scopes requis (wildcards acceptés)
 
         Returns:
             Fonction de dépendance FastAPI
         """
+        required_mask = self.scopes.compile(required_scopes)
 
-        def _verify_scopes(
+        async def _verify_scopes(
             current_user: Annotated[AuthenticatedUser, Depends(self.get_current_user)],
         ) -> AuthenticatedUser:
             """
@@ -70,7 +121,7 @@ class AuthDependencies:
             Raises:
                 HTTPException: Si l'utilisateur n'a pas les scopes requis
             """
-            if not self.jwt_service.verify_scopes(current_user.scopes, required_scopes):
+            if not ScopeRegistry.has_scopes(current_user.scope_mask, required_mask):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Scopes insuffisants. Requis: {required_scopes}",
@@ -82,9 +133,32 @@ class AuthDependencies:
 
 # Configuration globale utilisant les paramètres JWT
 jwt_service = JWTService(
-    secret_key=jwt_settings.secret_key, algorithm=jwt_settings.algorithm
+    secret_key=jwt_settings.secret_key,
+    algorithm=jwt_settings.algorithm,
+    key_cache=(
+        JWKSKeyCache(
+            jwt_settings.jwks_source,
+            refresh_interval=jwt_settings.jwks_refresh_seconds,
+        )
+        if jwt_settings.jwks_source
+        else None
+    ),
+    signing_key=(
+        Path(jwt_settings.private_key_path).read_text(encoding="utf-8")
+        if jwt_settings.private_key_path
+        else None
+    ),
+    key_id=jwt_settings.key_id,
+)
+token_cache = (
+    VerifiedTokenCache(
+        max_size=jwt_settings.token_cache_size,
+        ttl_seconds=jwt_settings.token_cache_ttl_seconds,
+    )
+    if jwt_settings.token_cache_size > 0
+    else None
 )
-auth_deps = AuthDependencies(jwt_service)
+auth_deps = AuthDependencies(jwt_service, token_cache)
 
 # Dépendances prêtes à l'emploi
 GetCurrentUser = Depends(auth_deps.get_current_user)
@@ -1,10 +1,23 @@
+import logging
+import time
 import uuid
 from contextvars import ContextVar
-from typing import Callable
+from typing import Optional
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.shared.config.http_config import http_client_settings
+from src.shared.config.logging_config import logging_settings
+from src.shared.http.deadline import deadline_context, parse_deadline
+from src.shared.log.queue_sink import QueueLoggerFactory, QueueLogSink
+from src.shared.log.sampling import (
+    LogSampler,
+    is_log_enabled,
+    request_sampler,
+    set_level_check,
+)
 
 # Context variable to store correlation ID across request
 correlation_id_context: ContextVar[str] = ContextVar("correlation_id", default=None)
@@ -12,47 +25,113 @@ correlation_id_context: ContextVar[str] = ContextVar("correlation_id", default=N
 logger = structlog.get_logger()
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+class CorrelationIdMiddleware:
     """
     Middleware to handle X-Correlation-ID header and logging context
+
+    Pure ASGI implementation: the request runs in the caller's task and
+    response messages are passed through as they come, so streaming
+    responses are not buffered.
+
+    Successful requests are logged according to `sampler`; errors (status
+    >= 400) and requests slower than `slow_request_threshold_ms` are always
+    logged, with the request details on request.end when request.start was
+    not sampled.
+
+    The request budget (X-Request-Timeout / X-Request-Deadline, capped by
+    `max_budget_ms`) is stored next to the correlation ID, for outbound calls.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampler: LogSampler = request_sampler,
+        slow_request_threshold_ms: float = logging_settings.slow_request_threshold_ms,
+        max_budget_ms: Optional[float] = http_client_settings.max_request_budget_ms,
+    ) -> None:
+        self.app = app
+        self.sampler = sampler
+        self.slow_request_threshold_ms = slow_request_threshold_ms
+        self.max_budget = None if max_budget_ms is None else max_budget_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Extract correlation ID from headers or generate a new one
-        correlation_id = request.headers.get("X-Correlation-ID")
+        headers = Headers(scope=scope)
+        correlation_id = headers.get("X-Correlation-ID")
         if not correlation_id:
             correlation_id = f"req_{uuid.uuid4().hex[:12]}"
 
-        # Store correlation ID in context
+        # Store correlation ID and request deadline in context
         correlation_id_context.set(correlation_id)
+        deadline_context.set(parse_deadline(headers, self.max_budget))
+
+        # Skip the log arguments entirely when INFO is disabled
+        log_enabled = is_log_enabled(logging.INFO)
+        sampled = log_enabled and self.sampler.sample()
 
         # Log request start
-        logger.info(
-            "request.start",
-            method=request.method,
-            path=request.url.path,
-            query_params=dict(request.query_params),
-            correlation_id=correlation_id,
-            user_agent=request.headers.get("User-Agent", ""),
-            client_ip=request.client.host if request.client else None,
-        )
+        if sampled:
+            logger.info(
+                "request.start",
+                correlation_id=correlation_id,
+                **self._request_details(scope, headers),
+            )
+
+        start = time.perf_counter()
+        status_code = None
+
+        async def send_with_correlation_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add correlation ID to response headers
+                MutableHeaders(scope=message)["X-Correlation-ID"] = correlation_id
+            await send(message)
 
         # Process request
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_correlation_id)
 
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
+        if not log_enabled:
+            return
 
-        # Log request end
-        logger.info(
-            "request.end",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            correlation_id=correlation_id,
-        )
+        duration_ms = (time.perf_counter() - start) * 1000
+        failed = status_code is None or status_code >= 400
+        slow = duration_ms >= self.slow_request_threshold_ms
 
-        return response
+        # Log request end
+        if sampled:
+            logger.info(
+                "request.end",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                correlation_id=correlation_id,
+                duration_ms=round(duration_ms, 3),
+            )
+        elif failed or slow:
+            logger.info(
+                "request.end",
+                status_code=status_code,
+                correlation_id=correlation_id,
+                duration_ms=round(duration_ms, 3),
+                slow=slow,
+                **self._request_details(scope, headers),
+            )
+
+    @staticmethod
+    def _request_details(scope: Scope, headers: Headers) -> dict:
+        client = scope.get("client")
+        return {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_params": dict(QueryParams(scope["query_string"])),
+            "user_agent": headers.get("User-Agent", ""),
+            "client_ip": client[0] if client else None,
+        }
 
 
 def get_correlation_id() -> str:
@@ -60,8 +139,17 @@ def get_correlation_id() -> str:
     return correlation_id_context.get()
 
 
-def configure_structlog():
-    """Configure structlog with correlation ID processor"""
+def configure_structlog(sink: Optional[QueueLogSink] = None, level: str = "INFO"):
+    """
+    Configure structlog with correlation ID processor
+
+    Without a sink, events are rendered to JSON and emitted through the
+    stdlib logger on the calling thread. With a QueueLogSink, events are
+    only enriched on the calling thread and handed over to the sink, which
+    renders and writes them in the background; `level` then filters
+    events before any processor runs. The stdlib pipeline follows the stdlib
+    logger levels.
+    """
 
     def add_correlation_id(logger, method_name, event_dict):
         """Add correlation ID to all log entries"""
@@ -70,10 +158,32 @@ def configure_structlog():
             event_dict["correlation_id"] = correlation_id
         return event_dict
 
+    if sink is not None:
+        min_level = logging.getLevelName(level.upper())
+        set_level_check(lambda event_level: event_level >= min_level)
+        structlog.configure(
+            processors=[
+                add_correlation_id,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+            ],
+            context_class=dict,
+            logger_factory=QueueLoggerFactory(sink),
+            wrapper_class=structlog.make_filtering_bound_logger(min_level),
+            cache_logger_on_first_use=True,
+        )
+        return
+
+    set_level_check(logging.getLogger().isEnabledFor)
     structlog.configure(
         processors=[
-            add_correlation_id,
+            # Drop filtered events before any other processor runs
             structlog.stdlib.filter_by_level,
+            add_correlation_id,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
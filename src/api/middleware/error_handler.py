@@ -42,6 +42,7 @@ async def http_exception_handler(
         403: "AUTHORIZATION_ERROR",
         404: "NOT_FOUND",
         409: "CONFLICT",
+        413: "PAYLOAD_TOO_LARGE",
         422: "VALIDATION_ERROR",
         500: "INTERNAL_SERVER_ERROR",
         502: "EXTERNAL_SERVICE_ERROR",
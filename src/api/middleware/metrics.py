@@ -0,0 +1,59 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.shared.metrics.instruments import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+)
+from src.shared.metrics.registry import Gauge, Histogram
+
+# Label des requêtes qui ne correspondent à aucune route (évite une
+# cardinalité non bornée avec les chemins inconnus)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Mesure la durée des requêtes HTTP et le nombre de requêtes en cours
+
+    Pure ASGI : la route est le modèle de chemin (ex: /orders/{order_id}),
+    connu une fois la requête routée. Une requête sans réponse (exception)
+    est comptée avec le statut 500.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        duration: Histogram = http_request_duration_seconds,
+        in_flight: Gauge = http_requests_in_flight,
+    ) -> None:
+        self.app = app
+        self.duration = duration
+        self.in_flight = in_flight
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            self.duration.labels(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,254 @@
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import pstats
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import structlog
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.middleware.correlation_id import get_correlation_id
+from src.shared.config.profiling_config import ProfilingSettings, profiling_settings
+from src.shared.log.sampling import LogSampler
+from src.shared.profiling.request_profile import (
+    PROFILE_HEADER,
+    PROFILE_OUTPUT_HEADER,
+    RequestProfile,
+    profile_context,
+    verify_profile_request,
+)
+
+logger = structlog.get_logger()
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests with cProfile and timing spans
+
+    A request is profiled when it carries a valid signed X-Profile header
+    (see sign_profile_request) or is picked by the `sample_rate` sampler.
+    The profile is written to `output_dir` as `<time>-<correlation id>.prof`
+    (pstats / snakeviz) and `.json` (spans and top functions), and logged as
+    request.profile with the correlation ID of request.start / request.end.
+    Signed requests sending `X-Profile-Output: response` get the profile as
+    the response body instead; the original status is in X-Profiled-Status.
+
+    Must run inside CorrelationIdMiddleware. cProfile sees the whole event
+    loop thread, so requests running concurrently show up in the profile;
+    only one request is profiled with cProfile at a time, others overlapping
+    it only record spans.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings: ProfilingSettings = profiling_settings,
+        sampler: Optional[LogSampler] = None,
+    ) -> None:
+        self.app = app
+        self.settings = settings
+        self.sampler = sampler or LogSampler(settings.sample_rate)
+        self._profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        signed = self._is_signed(headers)
+        if not signed and not self.sampler.sample():
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(get_correlation_id(), scope["method"], scope["path"])
+        to_response = signed and headers.get(PROFILE_OUTPUT_HEADER) == "response"
+        status_code = None
+        start_message: Optional[Message] = None
+
+        async def send_profiled(message: Message) -> None:
+            nonlocal status_code, start_message
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if to_response:
+                    start_message = message
+            if not to_response:
+                await send(message)
+
+        profiler = None
+        if not self._profiling:
+            profiler = cProfile.Profile()
+            self._profiling = True
+        token = profile_context.set(profile)
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_profiled)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+            profile_context.reset(token)
+            profile.finish(status_code)
+
+        stats = self._top_functions(profiler)
+        if to_response:
+            await self._send_profile(send, profile, stats, start_message)
+            return
+
+        path = await asyncio.to_thread(self._dump, profile, profiler, stats)
+        logger.info(
+            "request.profile",
+            correlation_id=profile.correlation_id,
+            method=profile.method,
+            path=profile.path,
+            status_code=status_code,
+            duration_ms=profile.duration_ms,
+            spans=[(s.name, s.duration_ms) for s in profile.spans],
+            profile_path=str(path),
+        )
+
+    def _is_signed(self, headers: Headers) -> bool:
+        value = headers.get(PROFILE_HEADER)
+        if not value or not self.settings.secret:
+            return False
+        return verify_profile_request(
+            value, self.settings.secret, self.settings.max_signature_ttl_seconds
+        )
+
+    def _top_functions(self, profiler: Optional[cProfile.Profile]) -> Optional[str]:
+        if profiler is None:
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            self.settings.top_functions
+        )
+        return output.getvalue()
+
+    def _dump(
+        self,
+        profile: RequestProfile,
+        profiler: Optional[cProfile.Profile],
+        stats: Optional[str],
+    ) -> Path:
+        directory = Path(self.settings.output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        # The correlation ID comes from the client: keep it filename-safe
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", profile.correlation_id or "")[:64]
+        base = directory / f"{time.time_ns()}-{safe_id}"
+
+        if profiler is not None:
+            profiler.dump_stats(base.with_suffix(".prof"))
+        summary = {**profile.to_dict(), "top_functions": stats}
+        path = base.with_suffix(".json")
+        path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        return path
+
+    @staticmethod
+    async def _send_profile(
+        send: Send,
+        profile: RequestProfile,
+        stats: Optional[str],
+        start_message: Optional[Message],
+    ) -> None:
+        body = json.dumps({**profile.to_dict(), "top_functions": stats}).encode()
+        status = start_message["status"] if start_message else 500
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profiled-status", str(status).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route recording the validation, service and serialisation spans
+
+    - validation: from the route handler start to the endpoint call (body
+      parsing, parameter validation and dependencies, auth included);
+    - service: the endpoint itself;
+    - serialisation: response_model serialisation after the endpoint
+      (endpoints returning a PydanticJSONResponse record it while rendering).
+
+    Nothing is recorded for requests that are not profiled.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # The request handler reads dependant.call on every request
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            profile = profile_context.get()
+            if profile is None:
+                return await handler(request)
+
+            profile.marks["handler"] = time.perf_counter()
+            response = await handler(request)
+            endpoint_end = profile.marks.pop("serialize_from", None)
+            if endpoint_end is not None:
+                profile.add_span("serialisation", endpoint_end, time.perf_counter())
+            return response
+
+        return profiled_handler
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    def before(profile: RequestProfile) -> float:
+        now = time.perf_counter()
+        handler_start = profile.marks.pop("handler", None)
+        if handler_start is not None:
+            profile.add_span("validation", handler_start, now)
+        return now
+
+    def after(profile: RequestProfile, started: float, result: Any) -> None:
+        now = time.perf_counter()
+        profile.add_span("service", started, now)
+        if not isinstance(result, Response):
+            profile.marks["serialize_from"] = now
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            profile = profile_context.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            started = before(profile)
+            result = await endpoint(*args, **kwargs)
+            after(profile, started, result)
+            return result
+
+    else:
+
+        @functools.wraps(endpoint)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            profile = profile_context.get()
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            started = before(profile)
+            result = endpoint(*args, **kwargs)
+            after(profile, started, result)
+            return result
+
+    return timed
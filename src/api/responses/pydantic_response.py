@@ -0,0 +1,21 @@
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+from src.shared.profiling.request_profile import span
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response serialised directly by pydantic-core
+
+    Models are written to bytes by their compiled serializer (using field
+    aliases, like FastAPI's response_model) with no intermediate dict and no
+    jsonable_encoder pass. Routes that return an instance of this class also
+    skip FastAPI's re-validation of the response model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialisation"):
+            return to_json(content, by_alias=True)
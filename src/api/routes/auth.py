@@ -1,10 +1,10 @@
 from datetime import timedelta
-from typing import List
+from typing import Any, List
 
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from src.api.dependencies.auth import jwt_service
+from src.api.dependencies.auth import auth_deps, jwt_service
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -76,3 +76,16 @@ async def generate_orders_write_token(user_id: str = "test-user") -> TokenRespon
     return TokenResponse(
         access_token=token, expires_in=3600, scopes=scopes  # 1 heure en secondes
     )
+
+
+@router.get("/token-cache/stats")
+async def token_cache_stats() -> dict[str, Any]:
+    """
+    Compteurs du cache des tokens vérifiés (hits, misses, évictions)
+
+    Returns:
+        Statistiques du cache, ou `enabled: false` s'il est désactivé
+    """
+    if auth_deps.token_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **auth_deps.token_cache.stats()}
@@ -1,20 +1,173 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal, Optional
 
-from fastapi import APIRouter, Depends
-from httpx import AsyncClient
+from fastapi import APIRouter, Depends, Query, Request
+from httpx import AsyncClient, HTTPStatusError
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
 
-from src.shared.http.client import get_http_client, safe_get
+from src.api.middleware.profiling import ProfiledRoute
+from src.shared.http.client import (
+    external_response_cache,
+    external_single_flight,
+    gather_get,
+    get_upstream_client,
+    safe_get,
+    safe_stream,
+)
+from src.shared.http.exceptions import NetworkError, ServerError, TimeoutError
+from src.shared.http.resilience import upstream_guards
+from src.shared.schemas.error import ErrorDetail
 
-router = APIRouter(tags=["external"])
+router = APIRouter(tags=["external"], route_class=ProfiledRoute)
+
+HTTPBIN_URL = "https://httpbin.org/get"
+
+
+class FanOutItem(BaseModel):
+    """Résultat d'un appel d'un fan-out"""
+
+    url: str
+    params: Optional[dict[str, Any]] = None
+    status: Literal["ok", "error"]
+    data: Optional[dict[str, Any]] = None
+    error: Optional[ErrorDetail] = None
+
+
+class FanOutResponse(BaseModel):
+    """Résultats partiels d'un fan-out"""
+
+    succeeded: int
+    failed: int
+    results: list[FanOutItem]
+
+
+def _error_detail(error: Exception) -> ErrorDetail:
+    """Code d'erreur aligné sur les handlers globaux"""
+    if isinstance(error, TimeoutError):
+        code = "REQUEST_TIMEOUT"
+    elif isinstance(error, NetworkError):
+        code = "NETWORK_FAILURE"
+    elif isinstance(error, ServerError):
+        code = "SERVER_ERROR"
+    elif isinstance(error, HTTPStatusError):
+        code = f"HTTP_{error.response.status_code}"
+    else:
+        code = "EXTERNAL_SERVICE_ERROR"
+    return ErrorDetail(code=code, message=str(error))
 
 
 @router.get("/external-demo")
 async def external_demo(
-    client: Annotated[AsyncClient, Depends(get_http_client)],
+    client: Annotated[AsyncClient, Depends(get_upstream_client("httpbin"))],
 ) -> dict[str, Any]:
     """
     Demo endpoint that calls httpbin.org
     """
     # Quand une exception n'est pas capturée dans une route
     # Elle "remonte" automatiquement vers FastAPI
-    return await safe_get(client, "https://httpbin.org/get", params={"demo": "SMCP"})
+    return await safe_get(client, HTTPBIN_URL, params={"demo": "SMCP"})
+
+
+@router.get("/external-demo/fan-out", response_model=FanOutResponse)
+async def external_demo_fan_out(
+    client: Annotated[AsyncClient, Depends(get_upstream_client("httpbin"))],
+    count: Annotated[int, Query(ge=1, le=50)] = 5,
+    concurrency: Annotated[int, Query(ge=1, le=20)] = 5,
+    timeout_ms: Annotated[int, Query(ge=1, le=30_000)] = 2_000,
+) -> FanOutResponse:
+    """
+    Variante de /external-demo qui appelle httpbin.org `count` fois en parallèle
+
+    Les appels sont limités à `concurrency` simultanés et à `timeout_ms`
+    chacun. Les échecs n'interrompent pas les autres appels : la réponse
+    contient les résultats partiels, avec le code d'erreur de chaque échec.
+    """
+    results = await gather_get(
+        client,
+        [(HTTPBIN_URL, {"demo": "SMCP", "call": i}) for i in range(count)],
+        max_concurrency=concurrency,
+        timeout=timeout_ms / 1000,
+    )
+    items = [
+        FanOutItem(
+            url=result.url,
+            params=result.params,
+            status="ok" if result.ok else "error",
+            data=result.data,
+            error=None if result.ok else _error_detail(result.error),
+        )
+        for result in results
+    ]
+    failed = sum(1 for item in items if item.status == "error")
+    return FanOutResponse(succeeded=len(items) - failed, failed=failed, results=items)
+
+
+@router.get("/external-demo/stream", response_class=StreamingResponse)
+async def external_demo_stream(
+    client: Annotated[AsyncClient, Depends(get_upstream_client("httpbin"))],
+    size: Annotated[int, Query(ge=1, le=100 * 1024)] = 10 * 1024,
+) -> StreamingResponse:
+    """
+    Relaie en streaming `size` octets aléatoires produits par httpbin.org
+
+    Le corps amont est transmis morceau par morceau, sans être chargé en
+    mémoire : la mémoire utilisée par requête ne dépend pas de sa taille.
+    """
+    stream = await safe_stream(client, f"https://httpbin.org/stream-bytes/{size}")
+    return StreamingResponse(
+        stream,
+        status_code=stream.status_code,
+        media_type=stream.media_type,
+        background=BackgroundTask(stream.aclose),
+    )
+
+
+@router.get("/external/pool-stats")
+async def pool_stats(request: Request) -> dict[str, Any]:
+    """
+    Utilisation des pools de connexions sortants, par service externe
+
+    Returns:
+        Connexions utilisées / au repos, requêtes en attente d'une connexion
+        et temps d'attente moyen / maximal dans le pool
+    """
+    registry = getattr(request.app.state, "http_clients", None)
+    if registry is None:
+        return {}
+    return registry.stats()
+
+
+@router.get("/external/circuit-breakers")
+async def circuit_breakers() -> dict[str, Any]:
+    """
+    État des disjoncteurs et bulkheads, par hôte
+
+    Returns:
+        État du disjoncteur (closed / open / half_open), appels et échecs de la
+        fenêtre courante, appels en cours et appels rejetés
+    """
+    return upstream_guards.stats()
+
+
+@router.get("/external/cache/stats")
+async def external_cache_stats() -> dict[str, Any]:
+    """
+    Compteurs du regroupement des appels identiques et du cache des réponses
+
+    Returns:
+        Appels réellement envoyés / partagés, et hits / stale hits / misses du
+        cache (`enabled: false` pour une fonctionnalité désactivée)
+    """
+    return {
+        "coalescing": (
+            {"enabled": True, **external_single_flight.stats()}
+            if external_single_flight is not None
+            else {"enabled": False}
+        ),
+        "cache": (
+            {"enabled": True, **external_response_cache.stats()}
+            if external_response_cache is not None
+            else {"enabled": False}
+        ),
+    }
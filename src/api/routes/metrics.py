@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.shared.metrics.instruments import metrics_registry
+from src.shared.metrics.registry import CONTENT_TYPE
+
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", response_class=Response, include_in_schema=False)
+async def metrics() -> Response:
+    """
+    Métriques au format texte de Prometheus
+
+    En mode multiprocess, les métriques de tous les workers sont additionnées.
+    """
+    return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -1,7 +1,21 @@
-from typing import Annotated
+import base64
+import binascii
+import hashlib
+from typing import Annotated, AsyncIterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import Field, TypeAdapter, ValidationError, WrapValidator
+from pydantic_core import to_json
 from starlette import status
 
 from src.api.dependencies.auth import (
@@ -9,16 +23,77 @@ from src.api.dependencies.auth import (
     RequireOrdersRead,
     RequireOrdersWrite,
 )
+from src.api.middleware.profiling import ProfiledRoute
+from src.api.responses.pydantic_response import PydanticJSONResponse
 from src.domain.exceptions.order_exceptions import (
     OrderAlreadyExistsException,
     OrderNotFoundException,
 )
-from src.domain.schemas.order import OrderIn, OrderOut
+from src.domain.repositories.factory import build_order_repository
+from src.domain.schemas.order import (
+    OrderBatchItemResult,
+    OrderBatchResponse,
+    OrderIn,
+    OrderOut,
+    OrderPage,
+)
 from src.domain.services.order_service import OrderService
+from src.shared.cache.idempotency_cache import IdempotencyCache, IdempotentResponse
+from src.shared.cache.response_cache import ResponseCache, etag_matches
+from src.shared.config.order_config import order_store_settings
+from src.shared.schemas.error import ErrorDetail
+from src.shared.storage.idempotency_store import SqliteIdempotencyStore
+
+router = APIRouter(prefix="/orders", tags=["orders"], route_class=ProfiledRoute)
+
+order_repository = build_order_repository(order_store_settings)
+order_service = OrderService(order_repository)
+
+# Serialised GET /orders/{order_id} bodies; orders are immutable once created
+order_response_cache = ResponseCache(order_store_settings.response_cache_size)
+
+# POST /orders responses by (user, Idempotency-Key), shared by the workers
+# through the database with the SQLite backend
+order_idempotency_cache = IdempotencyCache(
+    order_store_settings.idempotency_cache_size,
+    order_store_settings.idempotency_ttl_seconds,
+    store=(
+        SqliteIdempotencyStore(order_store_settings.sqlite_path)
+        if order_store_settings.backend == "sqlite"
+        else None
+    ),
+)
+
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
+
+# Maximum number of orders accepted by POST /orders:batch
+MAX_BATCH_SIZE = 1000
 
-router = APIRouter(prefix="/orders", tags=["orders"])
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-order_service = OrderService()
+# Largest position a cursor may hold (SQLite INTEGER)
+MAX_CURSOR_POSITION = 2**63 - 1
+
+# Number of NDJSON lines sent per chunk when streaming orders
+NDJSON_LINES_PER_CHUNK = 100
+
+
+def _capture_item_errors(value, handler):
+    """Return the ValidationError of an invalid item instead of raising it"""
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return e
+
+
+# Validation stops at the first order past MAX_BATCH_SIZE (too_long error);
+# invalid items come back as their ValidationError
+order_list_adapter = TypeAdapter(
+    Annotated[
+        list[Annotated[OrderIn, WrapValidator(_capture_item_errors)]],
+        Field(max_length=MAX_BATCH_SIZE),
+    ]
+)
 
 
 def get_order_service() -> OrderService:
@@ -30,24 +105,315 @@ async def create_order(
     order: OrderIn,
     service: Annotated[OrderService, Depends(get_order_service)],
     current_user: Annotated[AuthenticatedUser, RequireOrdersWrite],
-) -> OrderOut:
+    idempotency_key: Annotated[Optional[str], Header(max_length=255)] = None,
+) -> Response:
+    """
+    Create an order
+
+    With an `Idempotency-Key` header, retries of the same order with the
+    same key get the first response again (with `Idempotent-Replayed: true`)
+    instead of creating a duplicate; concurrent retries wait for the first
+    request to finish. Reusing a key for a different order is a 409.
+    """
     try:
-        return service.create_order(order)
+        if idempotency_key is None:
+            return await _create_order(order, service)
+        return await _create_order_once(order, service, current_user, idempotency_key)
     except OrderAlreadyExistsException as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
-@router.get("/{order_id}", response_model=OrderOut)
-async def get_order(
-    order_id: UUID,
+async def _create_order(order: OrderIn, service: OrderService) -> Response:
+    created = service.create_order(order)
+    await service.flush()
+    return PydanticJSONResponse(created, status_code=status.HTTP_201_CREATED)
+
+
+async def _create_order_once(
+    order: OrderIn,
+    service: OrderService,
+    current_user: AuthenticatedUser,
+    idempotency_key: str,
+) -> Response:
+    fingerprint = hashlib.blake2b(
+        order.model_dump_json().encode(), digest_size=16
+    ).digest()
+
+    async def produce() -> IdempotentResponse:
+        response = await _create_order(order, service)
+        return IdempotentResponse(fingerprint, response.status_code, response.body)
+
+    stored, replayed = await order_idempotency_cache.run(
+        (current_user.user_id, idempotency_key), produce
+    )
+    if stored.fingerprint != fingerprint:
+        raise OrderAlreadyExistsException(
+            f"Idempotency-Key {idempotency_key} was already used for another order"
+        )
+    headers = {IDEMPOTENT_REPLAY_HEADER: "true"} if replayed else None
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(str(position).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    """Position encoded by _encode_cursor; anything else is a 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        text = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        text = ""
+    # Canonical ASCII digits only (no sign, spaces, "_" or leading zeros),
+    # within SQLite's INTEGER range
+    if text.isascii() and text.isdigit() and str(int(text)) == text:
+        position = int(text)
+        if position <= MAX_CURSOR_POSITION:
+            return position
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+    )
+
+
+async def _ndjson_lines(orders: AsyncIterator[OrderOut]) -> AsyncIterator[bytes]:
+    """Encode orders as NDJSON, grouping lines into chunks"""
+    lines: list[bytes] = []
+    async for order in orders:
+        lines.append(to_json(order, by_alias=True) + b"\n")
+        if len(lines) >= NDJSON_LINES_PER_CHUNK:
+            yield b"".join(lines)
+            lines = []
+    if lines:
+        yield b"".join(lines)
+
+
+@router.get(
+    "",
+    response_model=OrderPage,
+    responses={
+        200: {
+            "content": {
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/OrderOut"}}
+            }
+        }
+    },
+)
+async def list_orders(
+    request: Request,
     service: Annotated[OrderService, Depends(get_order_service)],
     current_user: Annotated[AuthenticatedUser, RequireOrdersRead],
-) -> OrderOut:
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    cursor: Optional[str] = None,
+    currency: Annotated[
+        Optional[str], Query(alias="devise", pattern="^[A-Z]{3}$")
+    ] = None,
+    customer_name: Annotated[Optional[str], Query(alias="nom_client")] = None,
+    min_amount: Annotated[Optional[float], Query(alias="montant_min", ge=0)] = None,
+    max_amount: Annotated[Optional[float], Query(alias="montant_max", ge=0)] = None,
+):
+    """
+    List orders with keyset (cursor) pagination
+
+    With `Accept: application/x-ndjson`, every matching order after the
+    cursor is streamed as NDJSON instead and `limit` is ignored.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    filters = {
+        "currency": currency,
+        "customer_name": customer_name,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+    }
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _ndjson_lines(service.stream_orders(after, **filters)),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    items, next_position = await service.list_orders(after, limit, **filters)
+    return PydanticJSONResponse(
+        OrderPage(
+            items=items,
+            next_cursor=(
+                _encode_cursor(next_position) if next_position is not None else None
+            ),
+        )
+    )
+
+
+def _batch_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Batch too large (max {MAX_BATCH_SIZE} orders)",
+    )
+
+
+def _parse_batch_body(body: bytes, content_type: str) -> bytes:
+    """Return the batch as a JSON array, converting NDJSON if needed"""
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        lines = [line for line in body.splitlines() if line.strip()]
+        if len(lines) > MAX_BATCH_SIZE:
+            raise _batch_too_large()
+        return b"[" + b",".join(lines) + b"]"
+    return body
+
+
+def _validate_batch(
+    body: bytes,
+) -> tuple[list[tuple[int, OrderIn]], dict[int, list[ErrorDetail]]]:
+    """
+    Validate a batch in a single TypeAdapter pass
+
+    Returns the valid orders with their index and the errors of the invalid
+    items. A batch of more than MAX_BATCH_SIZE orders is rejected as soon as
+    the limit is reached.
+    """
     try:
-        return service.get_order(order_id)
-    except OrderNotFoundException as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except ValueError:
+        items = order_list_adapter.validate_json(body)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        if any(error["type"] == "too_long" for error in errors):
+            raise _batch_too_large()
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid UUID format"
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Request body must be a JSON array or NDJSON of orders",
+        )
+
+    valid: list[tuple[int, OrderIn]] = []
+    item_errors: dict[int, list[ErrorDetail]] = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, ValidationError):
+            valid.append((index, item))
+            continue
+        item_errors[index] = [
+            ErrorDetail(
+                code=error["type"],
+                message=error["msg"],
+                field=".".join(str(part) for part in error["loc"]) or None,
+            )
+            for error in item.errors(include_url=False)
+        ]
+    return valid, item_errors
+
+
+@router.post(
+    ":batch",
+    response_model=OrderBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        207: {"model": OrderBatchResponse, "description": "Partially created"},
+        422: {"model": OrderBatchResponse, "description": "Nothing created"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/OrderIn"},
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/OrderIn"}},
+            },
+        }
+    },
+)
+async def create_orders_batch(
+    request: Request,
+    service: Annotated[OrderService, Depends(get_order_service)],
+    current_user: Annotated[AuthenticatedUser, RequireOrdersWrite],
+    all_or_nothing: bool = False,
+) -> PydanticJSONResponse:
+    """
+    Create several orders in one request (JSON array or NDJSON body)
+
+    Valid orders are inserted atomically; invalid ones are reported per item.
+    With `all_or_nothing=true`, a single invalid item rejects the whole batch.
+    """
+    body = _parse_batch_body(
+        await request.body(), request.headers.get("content-type", "")
+    )
+    valid, item_errors = _validate_batch(body)
+
+    results = [
+        OrderBatchItemResult(index=index, status="error", errors=errors)
+        for index, errors in item_errors.items()
+    ]
+    if item_errors and all_or_nothing:
+        results.extend(
+            OrderBatchItemResult(index=index, status="rejected") for index, _ in valid
+        )
+        valid = []
+
+    created = service.create_orders([order for _, order in valid])
+    await service.flush()
+    results.extend(
+        OrderBatchItemResult(index=index, status="created", order=order)
+        for (index, _), order in zip(valid, created)
+    )
+    results.sort(key=lambda result: result.index)
+
+    status_code = status.HTTP_201_CREATED
+    if item_errors:
+        status_code = (
+            status.HTTP_207_MULTI_STATUS
+            if created
+            else status.HTTP_422_UNPROCESSABLE_CONTENT
+        )
+
+    return PydanticJSONResponse(
+        OrderBatchResponse(
+            created=len(created), failed=len(item_errors), results=results
+        ),
+        status_code=status_code,
+    )
+
+
+@router.get(
+    "/{order_id}",
+    response_model=OrderOut,
+    responses={304: {"description": "Not modified (If-None-Match)"}},
+)
+async def get_order(
+    order_id: UUID,
+    service: Annotated[OrderService, Depends(get_order_service)],
+    current_user: Annotated[AuthenticatedUser, RequireOrdersRead],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """
+    Get an order by ID
+
+    The serialised body is cached with a strong ETag; a matching
+    If-None-Match gets a 304 without a body.
+    """
+    generation = service.repository.generation
+    cached = order_response_cache.get(order_id, generation)
+    if cached is None:
+        try:
+            order = await service.fetch_order(order_id)
+        except OrderNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid UUID format"
+            )
+        body = to_json(order, by_alias=True)
+        cached = order_response_cache.put(order_id, body, generation)
+
+    if etag_matches(if_none_match, cached.etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": cached.etag}
         )
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag},
+    )
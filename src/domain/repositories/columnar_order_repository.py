@@ -0,0 +1,182 @@
+from array import array
+from typing import Iterator, Optional
+from uuid import UUID
+
+from src.domain.repositories.order_repository import OrderRepository, positions_after
+from src.domain.schemas.order import OrderOut
+
+# Code reserved in the string table for a missing created_by
+_NO_STRING = 0
+
+_INITIAL_TABLE_SIZE = 1024
+
+
+class ColumnarOrderRepository(OrderRepository):
+    """
+    Array-backed repository storing one column per OrderOut field
+
+    - order_id: 16-byte blobs packed in a single bytearray
+    - total_amount: float64 array
+    - currency: small-int code into an interned currency table
+    - customer_name / created_by: int codes into a shared string table
+
+    The primary index is an open-addressing hash table (linear probing) held
+    in an int64 array, so no Python object is kept per order. OrderOut
+    instances are only materialised when an order is read.
+    """
+
+    def __init__(self) -> None:
+        self._init_storage()
+
+    def _init_storage(self) -> None:
+        self._ids = bytearray()
+        self._amounts = array("d")
+        self._currency_codes = array("H")
+        self._customer_codes = array("I")
+        self._created_by_codes = array("I")
+
+        self._currencies: list[str] = []
+        self._currency_index: dict[str, int] = {}
+        self._strings: list[Optional[str]] = [None]
+        self._string_index: dict[str, int] = {}
+
+        self._by_customer: dict[int, array] = {}
+        self._by_currency: dict[int, array] = {}
+
+        # Slots hold row + 1 so that 0 means "empty"
+        self._table = array("q", bytes(8 * _INITIAL_TABLE_SIZE))
+        self._mask = _INITIAL_TABLE_SIZE - 1
+
+    def _intern_string(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        code = self._string_index.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = code
+        return code
+
+    def _intern_currency(self, currency: str) -> int:
+        code = self._currency_index.get(currency)
+        if code is None:
+            code = len(self._currencies)
+            self._currencies.append(currency)
+            self._currency_index[currency] = code
+        return code
+
+    def _id_at(self, row: int) -> bytes:
+        start = row * 16
+        end = start + 16
+        return bytes(self._ids[start:end])
+
+    def _insert_slot(self, key: int, row: int) -> None:
+        slot = key & self._mask
+        while self._table[slot]:
+            slot = (slot + 1) & self._mask
+        self._table[slot] = row + 1
+
+    def _grow_table(self) -> None:
+        size = len(self._table) * 2
+        self._table = array("q", bytes(8 * size))
+        self._mask = size - 1
+        for row in range(len(self._amounts)):
+            self._insert_slot(int.from_bytes(self._id_at(row), "big"), row)
+
+    def _find_row(self, order_id: UUID) -> Optional[int]:
+        blob = order_id.bytes
+        slot = order_id.int & self._mask
+        while True:
+            entry = self._table[slot]
+            if not entry:
+                return None
+            if self._id_at(entry - 1) == blob:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def _materialise(self, row: int) -> OrderOut:
+        # Values were validated when the order was created
+        return OrderOut.model_construct(
+            order_id=UUID(bytes=self._id_at(row)),
+            customer_name=self._strings[self._customer_codes[row]],
+            total_amount=self._amounts[row],
+            currency=self._currencies[self._currency_codes[row]],
+            created_by=self._strings[self._created_by_codes[row]],
+        )
+
+    def add(self, order: OrderOut) -> None:
+        row = len(self._amounts)
+        if (row + 1) * 2 > len(self._table):
+            self._grow_table()
+
+        customer_code = self._intern_string(order.customer_name)
+        currency_code = self._intern_currency(order.currency)
+
+        self._ids += order.order_id.bytes
+        self._amounts.append(order.total_amount)
+        self._currency_codes.append(currency_code)
+        self._customer_codes.append(customer_code)
+        self._created_by_codes.append(self._intern_string(order.created_by))
+        self._insert_slot(order.order_id.int, row)
+
+        self._by_customer.setdefault(customer_code, array("I")).append(row)
+        self._by_currency.setdefault(currency_code, array("I")).append(row)
+
+    def get(self, order_id: UUID) -> Optional[OrderOut]:
+        row = self._find_row(order_id)
+        if row is None:
+            return None
+        return self._materialise(row)
+
+    def find_by_customer(self, customer_name: str) -> list[OrderOut]:
+        code = self._string_index.get(customer_name)
+        rows = self._by_customer.get(code, ()) if code is not None else ()
+        return [self._materialise(row) for row in rows]
+
+    def find_by_currency(self, currency: str) -> list[OrderOut]:
+        code = self._currency_index.get(currency)
+        rows = self._by_currency.get(code, ()) if code is not None else ()
+        return [self._materialise(row) for row in rows]
+
+    def scan(
+        self,
+        after: Optional[int] = None,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Iterator[tuple[int, OrderOut]]:
+        currency_code = None
+        if currency is not None:
+            currency_code = self._currency_index.get(currency)
+            if currency_code is None:
+                return
+
+        if customer_name is not None:
+            customer_code = self._string_index.get(customer_name)
+            if customer_code is None:
+                return
+            rows = self._by_customer.get(customer_code, array("I"))
+        elif currency_code is not None:
+            rows = self._by_currency[currency_code]
+        else:
+            rows = None
+
+        # Filter on the columns so that only matching orders are materialised
+        for row in positions_after(rows, after, self._amounts):
+            if currency_code is not None and self._currency_codes[row] != currency_code:
+                continue
+            amount = self._amounts[row]
+            if min_amount is not None and amount < min_amount:
+                continue
+            if max_amount is not None and amount > max_amount:
+                continue
+            yield row, self._materialise(row)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._init_storage()
+
+    def __len__(self) -> int:
+        return len(self._amounts)
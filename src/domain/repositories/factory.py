@@ -0,0 +1,46 @@
+from src.domain.repositories.columnar_order_repository import ColumnarOrderRepository
+from src.domain.repositories.journaled_order_repository import (
+    JournaledOrderRepository,
+)
+from src.domain.repositories.order_repository import (
+    InMemoryOrderRepository,
+    OrderRepository,
+)
+from src.domain.repositories.sqlite_order_repository import SqliteOrderRepository
+from src.shared.config.order_config import OrderStoreSettings
+
+
+def build_order_repository(settings: OrderStoreSettings) -> OrderRepository:
+    """Create the order repository selected by the settings"""
+    if settings.backend == "sqlite":
+        # Already durable: no journal on top of it
+        return SqliteOrderRepository(
+            settings.sqlite_path,
+            readers=settings.sqlite_readers,
+            synchronous=settings.sqlite_synchronous,
+        )
+    if settings.backend == "columnar":
+        repository: OrderRepository = ColumnarOrderRepository()
+    else:
+        repository = InMemoryOrderRepository()
+
+    if settings.journal_dir is None:
+        return repository
+    return JournaledOrderRepository(
+        repository,
+        settings.journal_dir,
+        fsync_policy=settings.journal_fsync,
+        group_commit_delay=settings.journal_group_commit_delay_ms / 1000,
+        fsync_interval=settings.journal_fsync_interval_seconds,
+        snapshot_interval=settings.snapshot_interval_seconds,
+        snapshot_min_records=settings.snapshot_min_records,
+    )
+
+
+def check_workers(settings: OrderStoreSettings, workers: int) -> None:
+    """Refuse a storage private to each process when several workers run"""
+    if workers > 1 and settings.backend != "sqlite":
+        raise RuntimeError(
+            f"{workers} workers need ORDER_STORE_BACKEND=sqlite: the "
+            f"{settings.backend} order store is private to each process"
+        )
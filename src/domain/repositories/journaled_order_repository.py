@@ -0,0 +1,408 @@
+import asyncio
+import fcntl
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+from uuid import UUID
+
+import structlog
+
+from src.domain.repositories.order_repository import OrderRepository
+from src.domain.schemas.order import OrderOut
+from src.shared.storage.journal import (
+    FsyncPolicy,
+    Journal,
+    JournalCorruptedError,
+    RecordReader,
+    encode_record,
+    fsync_directory,
+)
+
+logger = structlog.get_logger()
+
+# Record types
+_ORDER = b"O"
+_CLEAR = b"C"
+
+# Order record: type, order_id, total_amount, then the byte lengths of
+# customer_name, currency and created_by (_NONE for a missing created_by),
+# followed by the three UTF-8 strings
+_ORDER_HEADER = struct.Struct("<c16sdHHH")
+_NONE = 0xFFFF
+
+_SNAPSHOT_MAGIC = b"POSHSNP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQ")
+
+_SEGMENT = re.compile(r"journal-(\d{8})\.log")
+_SNAPSHOT = re.compile(r"snapshot-(\d{8})\.bin")
+
+# Orders handed to the wrapped repository at once during replay
+_REPLAY_BATCH = 10_000
+
+
+def encode_order(order: OrderOut) -> bytes:
+    customer = order.customer_name.encode()
+    currency = order.currency.encode()
+    created_by = b"" if order.created_by is None else order.created_by.encode()
+    return (
+        _ORDER_HEADER.pack(
+            _ORDER,
+            order.order_id.bytes,
+            order.total_amount,
+            len(customer),
+            len(currency),
+            _NONE if order.created_by is None else len(created_by),
+        )
+        + customer
+        + currency
+        + created_by
+    )
+
+
+def decode_order(buffer, offset: int) -> OrderOut:
+    _, order_id, amount, customer_len, currency_len, created_by_len = (
+        _ORDER_HEADER.unpack_from(buffer, offset)
+    )
+    start = offset + _ORDER_HEADER.size
+    end = start + customer_len
+    customer = buffer[start:end].decode()
+    start, end = end, end + currency_len
+    currency = buffer[start:end].decode()
+    created_by = None
+    if created_by_len != _NONE:
+        start, end = end, end + created_by_len
+        created_by = buffer[start:end].decode()
+
+    # Values were validated when the order was created
+    return OrderOut.model_construct(
+        order_id=UUID(bytes=order_id),
+        customer_name=customer,
+        total_amount=amount,
+        currency=currency,
+        created_by=created_by,
+    )
+
+
+class JournaledOrderRepository(OrderRepository):
+    """
+    Persist another repository's orders in an append-only journal
+
+    Reads are served by the wrapped repository; every add / add_many /
+    clear is also appended to the current journal segment
+    (`journal-<n>.log`). Orders are acknowledged once flush() returns (see
+    Journal for the fsync policies).
+
+    A snapshot (`snapshot-<n>.bin`) holds every order present before
+    segment n; writing one starts segment n, then removes older segments and
+    snapshots. At startup, open() replays the latest snapshot and the
+    segments after it through mmap, truncating a torn last record.
+    """
+
+    def __init__(
+        self,
+        inner: OrderRepository,
+        directory: str,
+        fsync_policy: FsyncPolicy = "group",
+        group_commit_delay: float = 0.0,
+        fsync_interval: float = 1.0,
+        snapshot_interval: float = 60.0,
+        snapshot_min_records: int = 100_000,
+    ):
+        self.inner = inner
+        self.directory = Path(directory)
+        self.fsync_policy = fsync_policy
+        self.group_commit_delay = group_commit_delay
+        self.fsync_interval = fsync_interval
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_min_records = snapshot_min_records
+        self._journal: Optional[Journal] = None
+        self._segment = 0
+        self._records_since_snapshot = 0
+        self._tasks: list[asyncio.Task] = []
+        self._snapshot_lock = asyncio.Lock()
+        self._lock_file: Optional[TextIO] = None
+
+    @property
+    def generation(self) -> int:
+        return self.inner.generation
+
+    # Startup and shutdown
+
+    async def open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_directory()
+        started = time.perf_counter()
+        replayed = await asyncio.to_thread(self._replay)
+        self._journal = self._open_segment(self._segment)
+        logger.info(
+            "order_journal.replayed",
+            directory=str(self.directory),
+            orders=len(self.inner),
+            records=replayed,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+        if self.fsync_policy == "periodic":
+            self._tasks.append(asyncio.create_task(self._run_periodic_fsync()))
+        if self.snapshot_interval > 0:
+            self._tasks.append(asyncio.create_task(self._run_snapshots()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._journal is not None:
+            await self._journal.close()
+            self._journal = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _lock_directory(self) -> None:
+        """Make sure no other process (another worker) uses the journal"""
+        self._lock_file = open(self.directory / "LOCK", "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            raise RuntimeError(
+                f"Order journal {self.directory} is used by another process; "
+                "several workers need ORDER_STORE_BACKEND=sqlite"
+            )
+
+    def _open_segment(self, segment: int) -> Journal:
+        return Journal(
+            self._segment_path(segment),
+            fsync_policy=self.fsync_policy,
+            group_commit_delay=self.group_commit_delay,
+        )
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"journal-{segment:08d}.log"
+
+    def _snapshot_path(self, segment: int) -> Path:
+        return self.directory / f"snapshot-{segment:08d}.bin"
+
+    def _files(self, pattern: re.Pattern) -> list[tuple[int, Path]]:
+        found = []
+        for path in self.directory.iterdir():
+            match = pattern.fullmatch(path.name)
+            if match:
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    def _replay(self) -> int:
+        """Load the latest snapshot and the segments written after it"""
+        records = 0
+        snapshots = self._files(_SNAPSHOT)
+        first_segment = 0
+        if snapshots:
+            first_segment, path = snapshots[-1]
+            records += self._replay_snapshot(path)
+        snapshot_records = records
+
+        segments = [item for item in self._files(_SEGMENT) if item[0] >= first_segment]
+        for i, (segment, path) in enumerate(segments):
+            reader = RecordReader(path)
+            records += self._replay_records(reader)
+            if reader.truncated:
+                if i != len(segments) - 1:
+                    raise JournalCorruptedError(
+                        f"{path} is damaged at {reader.valid_end}"
+                    )
+                logger.warning(
+                    "order_journal.torn_tail_truncated",
+                    path=str(path),
+                    dropped_bytes=reader.size - reader.valid_end,
+                )
+                os.truncate(path, reader.valid_end)
+        self._segment = segments[-1][0] if segments else first_segment
+        self._records_since_snapshot = records - snapshot_records
+        return records
+
+    def _replay_snapshot(self, path: Path) -> int:
+        with open(path, "rb") as file:
+            magic, count = _SNAPSHOT_HEADER.unpack(file.read(_SNAPSHOT_HEADER.size))
+        if magic != _SNAPSHOT_MAGIC:
+            raise JournalCorruptedError(f"{path} is not an order snapshot")
+        reader = RecordReader(path, start=_SNAPSHOT_HEADER.size)
+        replayed = self._replay_records(reader)
+        if replayed != count or reader.truncated:
+            raise JournalCorruptedError(f"{path} holds {replayed} of {count} orders")
+        return replayed
+
+    def _replay_records(self, reader: RecordReader) -> int:
+        batch: list[OrderOut] = []
+        records = 0
+        for buffer, offset, length in reader:
+            records += 1
+            kind = buffer[offset] if length else None
+            if kind == _ORDER[0]:
+                batch.append(decode_order(buffer, offset))
+                if len(batch) >= _REPLAY_BATCH:
+                    self.inner.add_many(batch)
+                    batch = []
+            elif kind == _CLEAR[0]:
+                self.inner.add_many(batch)
+                batch = []
+                self.inner.clear()
+            else:
+                raise JournalCorruptedError(f"Unknown record in {reader.path}")
+        self.inner.add_many(batch)
+        return records
+
+    # Writes
+
+    def _require_journal(self) -> Journal:
+        if self._journal is None:
+            raise RuntimeError("JournaledOrderRepository used before open()")
+        return self._journal
+
+    def add(self, order: OrderOut) -> None:
+        journal = self._require_journal()
+        self.inner.add(order)
+        journal.append(encode_order(order))
+        self._records_since_snapshot += 1
+
+    def add_many(self, orders: list[OrderOut]) -> None:
+        journal = self._require_journal()
+        self.inner.add_many(orders)
+        journal.append_many(encode_order(order) for order in orders)
+        self._records_since_snapshot += len(orders)
+
+    def clear(self) -> None:
+        journal = self._require_journal()
+        self.inner.clear()
+        journal.append(_CLEAR)
+        self._records_since_snapshot += 1
+
+    async def flush(self) -> None:
+        await self._require_journal().flush()
+
+    # Snapshots
+
+    async def snapshot(self) -> Path:
+        """
+        Write a compacted snapshot and drop the journal segments it covers
+
+        New writes go to a fresh segment while the snapshot is written in a
+        worker thread from the orders stored at that point.
+        """
+        async with self._snapshot_lock:
+            previous = self._require_journal()
+            self._segment += 1
+            segment = self._segment
+            self._journal = self._open_segment(segment)
+            count = len(self.inner)
+            self._records_since_snapshot = 0
+            await previous.close()
+
+            path = await asyncio.to_thread(self._write_snapshot, segment, count)
+            for number, old in self._files(_SEGMENT) + self._files(_SNAPSHOT):
+                if number < segment:
+                    old.unlink()
+            logger.info("order_journal.snapshot", path=str(path), orders=count)
+            return path
+
+    def _write_snapshot(self, segment: int, count: int) -> Path:
+        # Orders are immutable and appended in order: the first `count`
+        # positions are the state before `segment`. A clear() racing with the
+        # snapshot is safe, its record is in `segment` and replays after it.
+        path = self._snapshot_path(segment)
+        tmp = path.with_suffix(".tmp")
+        written = 0
+        with open(tmp, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, count))
+            chunk = bytearray()
+            for position, order in self.inner.scan():
+                if position >= count:
+                    break
+                chunk += encode_record(encode_order(order))
+                written += 1
+                if len(chunk) >= 1 << 20:
+                    file.write(chunk)
+                    chunk = bytearray()
+            file.write(chunk)
+            if written != count:
+                file.seek(0)
+                file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, written))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, path)
+        fsync_directory(self.directory)
+        return path
+
+    async def _run_snapshots(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self._records_since_snapshot < self.snapshot_min_records:
+                continue
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.error("order_journal.snapshot_failed", error=str(e))
+
+    async def _run_periodic_fsync(self) -> None:
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            journal = self._journal
+            if journal is None:
+                continue
+            try:
+                await asyncio.to_thread(journal.sync)
+            except Exception as e:
+                # A snapshot may have closed the segment meanwhile: closing
+                # made it durable, and the next round syncs the new segment
+                if journal is self._journal:
+                    logger.error("order_journal.fsync_failed", error=str(e))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "segment": self._segment,
+            "records_since_snapshot": self._records_since_snapshot,
+            **self._require_journal().stats(),
+        }
+
+    # Reads
+
+    def get(self, order_id: UUID) -> Optional[OrderOut]:
+        return self.inner.get(order_id)
+
+    async def get_async(self, order_id: UUID) -> Optional[OrderOut]:
+        return await self.inner.get_async(order_id)
+
+    def find_by_customer(self, customer_name: str) -> list[OrderOut]:
+        return self.inner.find_by_customer(customer_name)
+
+    def find_by_currency(self, currency: str) -> list[OrderOut]:
+        return self.inner.find_by_currency(currency)
+
+    def scan(
+        self,
+        after: Optional[int] = None,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Iterator[tuple[int, OrderOut]]:
+        return self.inner.scan(
+            after,
+            currency=currency,
+            customer_name=customer_name,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
+
+    async def scan_page_async(
+        self, after: Optional[int] = None, limit: int = 100, **filters
+    ) -> list[tuple[int, OrderOut]]:
+        return await self.inner.scan_page_async(after, limit, **filters)
+
+    def __len__(self) -> int:
+        return len(self.inner)
@@ -0,0 +1,199 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from itertools import islice
+from typing import Iterator, Optional, Sequence, Sized
+from uuid import UUID
+
+from src.domain.schemas.order import OrderOut
+
+
+class OrderRepository(ABC):
+    """
+    Storage abstraction used by OrderService
+
+    Orders are immutable once stored. `generation` is bumped by every
+    operation that changes or removes stored orders, so caches built from
+    the repository can detect that they are stale.
+    """
+
+    generation: int = 0
+
+    @abstractmethod
+    def add(self, order: OrderOut) -> None:
+        """Store a new order"""
+
+    def add_many(self, orders: list[OrderOut]) -> None:
+        """
+        Store several orders at once
+
+        Either every order is stored or none is. The default implementation
+        relies on add() never failing for already validated orders.
+        """
+        for order in orders:
+            self.add(order)
+
+    @abstractmethod
+    def get(self, order_id: UUID) -> Optional[OrderOut]:
+        """Return the order with the given ID, or None if it does not exist"""
+
+    async def get_async(self, order_id: UUID) -> Optional[OrderOut]:
+        """get() for async callers; storages doing I/O run it off the event loop"""
+        return self.get(order_id)
+
+    @abstractmethod
+    def find_by_customer(self, customer_name: str) -> list[OrderOut]:
+        """Return the orders of a customer, in insertion order"""
+
+    @abstractmethod
+    def find_by_currency(self, currency: str) -> list[OrderOut]:
+        """Return the orders in a currency, in insertion order"""
+
+    @abstractmethod
+    def scan(
+        self,
+        after: Optional[int] = None,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Iterator[tuple[int, OrderOut]]:
+        """
+        Iterate lazily over the orders matching the filters, in insertion order
+
+        Yields (position, order) pairs where position is the insertion
+        sequence of the order. Only positions strictly greater than `after`
+        are returned, which makes `position` usable as a keyset cursor.
+        """
+
+    async def scan_page_async(
+        self, after: Optional[int] = None, limit: int = 100, **filters
+    ) -> list[tuple[int, OrderOut]]:
+        """
+        First `limit` pairs of scan() for async callers
+
+        Storages doing I/O fetch the page off the event loop.
+        """
+        return list(islice(self.scan(after, **filters), limit))
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored order"""
+
+    async def open(self) -> None:
+        """Load persisted orders; called once at application startup"""
+
+    async def flush(self) -> None:
+        """Wait until the orders stored so far are durable"""
+
+    async def close(self) -> None:
+        """Release the storage; called at application shutdown"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored orders"""
+
+
+class InMemoryOrderRepository(OrderRepository):
+    """
+    In-memory repository keyed by order_id
+
+    Orders are appended to a list; the primary index maps order_id to the
+    position in that list and the secondary indexes map customer_name and
+    currency to the (ascending) positions of their orders.
+    """
+
+    def __init__(self) -> None:
+        self._orders: list[OrderOut] = []
+        self._by_id: dict[UUID, int] = {}
+        self._by_customer: dict[str, list[int]] = {}
+        self._by_currency: dict[str, list[int]] = {}
+
+    def add(self, order: OrderOut) -> None:
+        position = len(self._orders)
+        self._orders.append(order)
+        self._by_id[order.order_id] = position
+        self._by_customer.setdefault(order.customer_name, []).append(position)
+        self._by_currency.setdefault(order.currency, []).append(position)
+
+    def add_many(self, orders: list[OrderOut]) -> None:
+        start = len(self._orders)
+        self._orders.extend(orders)
+        for position, order in enumerate(orders, start):
+            self._by_id[order.order_id] = position
+            self._by_customer.setdefault(order.customer_name, []).append(position)
+            self._by_currency.setdefault(order.currency, []).append(position)
+
+    def get(self, order_id: UUID) -> Optional[OrderOut]:
+        position = self._by_id.get(order_id)
+        if position is None:
+            return None
+        return self._orders[position]
+
+    def find_by_customer(self, customer_name: str) -> list[OrderOut]:
+        return [self._orders[i] for i in self._by_customer.get(customer_name, ())]
+
+    def find_by_currency(self, currency: str) -> list[OrderOut]:
+        return [self._orders[i] for i in self._by_currency.get(currency, ())]
+
+    def scan(
+        self,
+        after: Optional[int] = None,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Iterator[tuple[int, OrderOut]]:
+        if customer_name is not None:
+            positions = self._by_customer.get(customer_name, [])
+        elif currency is not None:
+            positions = self._by_currency.get(currency, [])
+        else:
+            positions = None
+
+        for position in positions_after(positions, after, self._orders):
+            order = self._orders[position]
+            if currency is not None and order.currency != currency:
+                continue
+            if min_amount is not None and order.total_amount < min_amount:
+                continue
+            if max_amount is not None and order.total_amount > max_amount:
+                continue
+            yield position, order
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._orders.clear()
+        self._by_id.clear()
+        self._by_customer.clear()
+        self._by_currency.clear()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+
+def positions_after(
+    positions: Optional[Sequence[int]], after: Optional[int], rows: Sized
+) -> Iterator[int]:
+    """
+    Iterate over the positions greater than `after`
+
+    `positions` is an ascending index list, or None to walk every row of
+    `rows`. Lengths are re-read on each step so orders appended while
+    iterating are picked up, and nothing is copied up front.
+    """
+    if after is not None and after < -1:
+        # Negative list indexes would wrap around to the last rows
+        after = -1
+    if positions is None:
+        position = 0 if after is None else after + 1
+        while position < len(rows):
+            yield position
+            position += 1
+        return
+
+    i = 0 if after is None else bisect_right(positions, after)
+    while i < len(positions):
+        yield positions[i]
+        i += 1
@@ -0,0 +1,440 @@
+import asyncio
+import sqlite3
+from typing import Iterator, Optional
+from uuid import UUID
+
+import structlog
+
+from src.domain.repositories.order_repository import OrderRepository
+from src.domain.schemas.order import OrderOut
+from src.shared.storage.sqlite_pool import SqlitePool, SynchronousMode
+
+logger = structlog.get_logger()
+
+# position is the insertion sequence (keyset cursor of scan()) and the rowid
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS orders (
+        position INTEGER PRIMARY KEY,
+        order_id BLOB NOT NULL,
+        customer_name TEXT NOT NULL,
+        total_amount REAL NOT NULL,
+        currency TEXT NOT NULL,
+        created_by TEXT
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS orders_order_id ON orders (order_id)",
+    "CREATE INDEX IF NOT EXISTS orders_created_by ON orders (created_by)",
+    "CREATE INDEX IF NOT EXISTS orders_customer_name ON orders (customer_name)",
+    "CREATE INDEX IF NOT EXISTS orders_currency ON orders (currency)",
+)
+
+_COLUMNS = "position, order_id, customer_name, total_amount, currency, created_by"
+_INSERT = f"INSERT INTO orders ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM orders WHERE order_id = ?"
+_SELECT_BY_CUSTOMER = (
+    f"SELECT {_COLUMNS} FROM orders WHERE customer_name = ? ORDER BY position"
+)
+_SELECT_BY_CURRENCY = (
+    f"SELECT {_COLUMNS} FROM orders WHERE currency = ? ORDER BY position"
+)
+_COUNT = "SELECT COUNT(*), MAX(position) FROM orders"
+
+# Rows fetched per query while scanning
+_SCAN_CHUNK = 500
+
+
+def _row(position: int, order: OrderOut) -> tuple:
+    return (
+        position,
+        order.order_id.bytes,
+        order.customer_name,
+        order.total_amount,
+        order.currency,
+        order.created_by,
+    )
+
+
+def _order(row: tuple) -> OrderOut:
+    # Values were validated when the order was created
+    return OrderOut.model_construct(
+        order_id=UUID(bytes=row[1]),
+        customer_name=row[2],
+        total_amount=row[3],
+        currency=row[4],
+        created_by=row[5],
+    )
+
+
+def _matches(
+    order: OrderOut,
+    currency: Optional[str],
+    customer_name: Optional[str],
+    min_amount: Optional[float],
+    max_amount: Optional[float],
+) -> bool:
+    return (
+        (currency is None or order.currency == currency)
+        and (customer_name is None or order.customer_name == customer_name)
+        and (min_amount is None or order.total_amount >= min_amount)
+        and (max_amount is None or order.total_amount <= max_amount)
+    )
+
+
+def _create_schema(connection: sqlite3.Connection) -> int:
+    """Create the table and indexes if needed, return the next position"""
+    with connection:
+        for statement in _SCHEMA:
+            connection.execute(statement)
+    (last,) = connection.execute("SELECT MAX(position) FROM orders").fetchone()
+    return 0 if last is None else last + 1
+
+
+def _insert(connection: sqlite3.Connection, rows: list[tuple]) -> int:
+    """
+    Insert the rows in one transaction, return the next free position
+
+    Positions are allocated by the process that queued the orders; when
+    other processes share the database, the batch is moved after the last
+    stored position, under the write lock.
+    """
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        (last,) = connection.execute("SELECT MAX(position) FROM orders").fetchone()
+        shift = (-1 if last is None else last) + 1 - rows[0][0]
+        if shift > 0:
+            rows = [(row[0] + shift, *row[1:]) for row in rows]
+        connection.executemany(_INSERT, rows)
+    return rows[-1][0] + 1
+
+
+def _scan_query(
+    currency: Optional[str],
+    customer_name: Optional[str],
+    min_amount: Optional[float],
+    max_amount: Optional[float],
+) -> tuple[str, list]:
+    """
+    Query of a scan() chunk and its filter values
+
+    The query takes (after, *values, limit); there is one SQL text per
+    combination of filters, so each is prepared once.
+    """
+    conditions = ["position > ?"]
+    values = []
+    for condition, value in (
+        ("currency = ?", currency),
+        ("customer_name = ?", customer_name),
+        ("total_amount >= ?", min_amount),
+        ("total_amount <= ?", max_amount),
+    ):
+        if value is not None:
+            conditions.append(condition)
+            values.append(value)
+    query = (
+        f"SELECT {_COLUMNS} FROM orders WHERE {' AND '.join(conditions)} "
+        "ORDER BY position LIMIT ?"
+    )
+    return query, values
+
+
+def _select_page(
+    connection: sqlite3.Connection, query: str, parameters: tuple
+) -> list[tuple]:
+    return connection.execute(query, parameters).fetchall()
+
+
+def _delete_all(connection: sqlite3.Connection) -> None:
+    with connection:
+        connection.execute("DELETE FROM orders")
+
+
+def _select_by_id(connection: sqlite3.Connection, order_id: bytes) -> Optional[tuple]:
+    return connection.execute(_SELECT_BY_ID, (order_id,)).fetchone()
+
+
+def _select_by_ids(
+    connection: sqlite3.Connection, order_ids: list[bytes]
+) -> list[Optional[tuple]]:
+    # Same prepared statement for every ID (an IN list would be another
+    # statement for each batch size)
+    return [_select_by_id(connection, order_id) for order_id in order_ids]
+
+
+class SqliteOrderRepository(OrderRepository):
+    """
+    Orders stored in a SQLite database (WAL mode)
+
+    add() and add_many() only queue the orders; flush() inserts everything
+    queued in one transaction on the writer thread, and concurrent callers
+    share that commit (group commit), as POST /orders awaits flush() before
+    answering. Queued orders are already visible to reads.
+
+    get_async() runs on the reader threads: the lookups requested during one
+    event loop iteration are sent to a reader thread together, so the cost
+    of the thread handoff is shared. scan_page_async() (listing and
+    streaming) fetches each page on a reader thread as well. The synchronous
+    reads (get, scan, secondary lookups, len) query on the calling thread and
+    are meant for callers outside the event loop.
+
+    Several processes (uvicorn workers) can share the database: each one
+    reads the orders committed by the others. The position of a queued
+    order is provisional until it is committed, as another process may have
+    stored orders at that position in the meantime.
+
+    A failed commit (e.g. SQLITE_BUSY past the busy timeout) rolls back
+    and drops the orders of its batch: the callers waiting for that batch
+    get the error, later writes are committed normally.
+
+    clear() and len() also query synchronously; they are maintenance and
+    test helpers, not used by the routes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        readers: int = 4,
+        synchronous: SynchronousMode = "FULL",
+    ):
+        self.path = path
+        self._pool = SqlitePool(path, readers=readers, synchronous=synchronous)
+        self._opened = False
+        self._next_position = 0
+        self._durable = 0
+        # Queued orders (order_id -> (position, order)), in position order
+        self._unflushed: dict[UUID, tuple[int, OrderOut]] = {}
+        self._commit_task: Optional[asyncio.Task] = None
+        # Position after the last order of the batch being committed
+        self._commit_upto = 0
+        self.commits = 0
+        # get_async() calls waiting for the next read batch
+        self._reads: list[tuple[bytes, asyncio.Future]] = []
+        self._read_tasks: set[asyncio.Task] = set()
+
+    # Startup and shutdown
+
+    async def open(self) -> None:
+        self._next_position = await self._pool.write(_create_schema)
+        self._durable = self._next_position
+        self._opened = True
+        logger.info(
+            "order_sqlite.opened", path=self.path, next_position=self._next_position
+        )
+
+    async def close(self) -> None:
+        try:
+            if self._opened:
+                await self.flush()
+        finally:
+            self._opened = False
+            await asyncio.to_thread(self._pool.close)
+
+    def _require_open(self) -> None:
+        if not self._opened:
+            raise RuntimeError("SqliteOrderRepository.open() has not been called")
+
+    def _connection(self) -> sqlite3.Connection:
+        self._require_open()
+        return self._pool.connection()
+
+    # Writes
+
+    def add(self, order: OrderOut) -> None:
+        self.add_many([order])
+
+    def add_many(self, orders: list[OrderOut]) -> None:
+        self._require_open()
+        for order in orders:
+            self._unflushed[order.order_id] = (self._next_position, order)
+            self._next_position += 1
+
+    async def flush(self) -> None:
+        target = self._next_position
+        while self._durable < target:
+            if self._commit_task is None:
+                self._commit_upto = self._next_position
+                self._commit_task = asyncio.ensure_future(
+                    self._commit(list(self._unflushed.values()), self._commit_upto)
+                )
+            task, upto = self._commit_task, self._commit_upto
+            try:
+                await asyncio.shield(task)
+            except Exception:
+                # Only the callers whose orders were in the failed batch fail
+                if upto >= target:
+                    raise
+
+    async def _commit(self, batch: list[tuple[int, OrderOut]], upto: int) -> None:
+        try:
+            if batch:
+                next_position = await self._pool.write(
+                    _insert, [_row(position, order) for position, order in batch]
+                )
+                self._next_position = max(self._next_position, next_position)
+                self.commits += 1
+            self._durable = max(self._durable, upto)
+        except Exception as e:
+            logger.error("order_sqlite.commit_failed", path=self.path, error=str(e))
+            raise
+        finally:
+            self._commit_task = None
+            # Stored, or lost with the failed transaction
+            for _, order in batch:
+                self._unflushed.pop(order.order_id, None)
+
+    def clear(self) -> None:
+        self._require_open()
+        self.generation += 1
+        self._unflushed.clear()
+        self._durable = self._next_position
+        # Queued on the writer thread after any insert already submitted
+        self._pool.write_sync(_delete_all)
+
+    # Reads
+
+    async def get_async(self, order_id: UUID) -> Optional[OrderOut]:
+        queued = self._unflushed.get(order_id)
+        if queued is not None:
+            return queued[1]
+        self._require_open()
+        future = asyncio.get_running_loop().create_future()
+        self._reads.append((order_id.bytes, future))
+        if len(self._reads) == 1:
+            asyncio.get_running_loop().call_soon(self._dispatch_reads)
+        row = await future
+        return None if row is None else _order(row)
+
+    def _dispatch_reads(self) -> None:
+        batch, self._reads = self._reads, []
+        task = asyncio.ensure_future(self._read_batch(batch))
+        self._read_tasks.add(task)
+        task.add_done_callback(self._read_tasks.discard)
+
+    async def _read_batch(self, batch: list[tuple[bytes, asyncio.Future]]) -> None:
+        try:
+            rows = await self._pool.read(_select_by_ids, [key for key, _ in batch])
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+    def get(self, order_id: UUID) -> Optional[OrderOut]:
+        queued = self._unflushed.get(order_id)
+        if queued is not None:
+            return queued[1]
+        row = _select_by_id(self._connection(), order_id.bytes)
+        return None if row is None else _order(row)
+
+    def _find(self, query: str, value: str, **filters) -> list[OrderOut]:
+        rows = self._connection().execute(query, (value,)).fetchall()
+        found = [_order(row) for row in rows]
+        # Orders of a batch being committed can be both stored and queued
+        stored = {row[1] for row in rows}
+        found.extend(
+            order
+            for _, order in self._unflushed.values()
+            if order.order_id.bytes not in stored
+            and _matches(order, min_amount=None, max_amount=None, **filters)
+        )
+        return found
+
+    def find_by_customer(self, customer_name: str) -> list[OrderOut]:
+        return self._find(
+            _SELECT_BY_CUSTOMER,
+            customer_name,
+            customer_name=customer_name,
+            currency=None,
+        )
+
+    def find_by_currency(self, currency: str) -> list[OrderOut]:
+        return self._find(
+            _SELECT_BY_CURRENCY, currency, currency=currency, customer_name=None
+        )
+
+    def scan(
+        self,
+        after: Optional[int] = None,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Iterator[tuple[int, OrderOut]]:
+        connection = self._connection()
+        filters = {
+            "currency": currency,
+            "customer_name": customer_name,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+        }
+        query, values = _scan_query(**filters)
+
+        position = -1 if after is None else after
+        while True:
+            rows = _select_page(connection, query, (position, *values, _SCAN_CHUNK))
+            if rows:
+                for row in rows:
+                    position = row[0]
+                    yield position, _order(row)
+                continue
+
+            queued = self._queued_after(position, filters)
+            if not queued:
+                return
+            for position, order in queued:
+                yield position, order
+
+    async def scan_page_async(
+        self,
+        after: Optional[int] = None,
+        limit: int = 100,
+        *,
+        currency: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> list[tuple[int, OrderOut]]:
+        self._require_open()
+        filters = {
+            "currency": currency,
+            "customer_name": customer_name,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+        }
+        query, values = _scan_query(**filters)
+        position = -1 if after is None else after
+        rows = await self._pool.read(_select_page, query, (position, *values, limit))
+        page = [(row[0], _order(row)) for row in rows]
+        missing = limit - len(page)
+        if missing > 0:
+            last = page[-1][0] if page else position
+            page.extend(self._queued_after(last, filters)[:missing])
+        return page
+
+    def _queued_after(self, position: int, filters: dict) -> list[tuple[int, OrderOut]]:
+        """Queued orders matching the filters; they come after every stored one"""
+        return [
+            (queued_position, order)
+            for queued_position, order in list(self._unflushed.values())
+            if queued_position > position and _matches(order, **filters)
+        ]
+
+    def __len__(self) -> int:
+        count, last = self._connection().execute(_COUNT).fetchone()
+        last = -1 if last is None else last
+        # Queued orders beyond the last stored position are not in the table yet
+        return count + sum(
+            1 for position, _ in self._unflushed.values() if position > last
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "next_position": self._next_position,
+            "durable": self._durable,
+            "queued": len(self._unflushed),
+            "commits": self.commits,
+        }
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, StrictFloat, StrictStr
 
+from src.shared.schemas.error import ErrorDetail
+
 
 class OrderIn(BaseModel):
     customer_name: StrictStr = Field(alias="nom_client", max_length=128)
@@ -38,3 +40,29 @@ class OrderOut(BaseModel):
             }
         },
     }
+
+
+class OrderBatchItemResult(BaseModel):
+    """Result of one item of a batch creation"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    status: Literal["created", "error", "rejected"]
+    order: Optional[OrderOut] = None
+    errors: list[ErrorDetail] = Field(default_factory=list)
+
+
+class OrderBatchResponse(BaseModel):
+    """Per-item results of a batch creation"""
+
+    created: int
+    failed: int
+    results: list[OrderBatchItemResult]
+
+
+class OrderPage(BaseModel):
+    """One page of a keyset-paginated order listing"""
+
+    items: list[OrderOut]
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page"
+    )
@@ -1,25 +1,46 @@
-from typing import List
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
 from uuid import UUID, uuid4
 
 import structlog
 
 from src.domain.exceptions.order_exceptions import OrderNotFoundException
+from src.domain.repositories.order_repository import (
+    InMemoryOrderRepository,
+    OrderRepository,
+)
 from src.domain.schemas.order import OrderIn, OrderOut
+from src.shared.log.sampling import is_log_enabled, order_log_sampler
+from src.shared.metrics.instruments import orders_created_total
 
-# Global list to store orders
-orders: List[OrderOut] = []
+# Default repository shared by OrderService instances
+orders: OrderRepository = InMemoryOrderRepository()
 
 logger = structlog.get_logger()
 
+# Number of orders streamed before yielding control to the event loop
+STREAM_CHUNK_SIZE = 500
+
+
+def _log_sampled() -> bool:
+    """Whether the start/success logs of an order operation are emitted"""
+    return is_log_enabled(logging.INFO) and order_log_sampler.sample()
+
 
 class OrderService:
+    def __init__(self, repository: Optional[OrderRepository] = None):
+        self.repository = repository if repository is not None else orders
+
     def create_order(self, order: OrderIn) -> OrderOut:
-        logger.info(
-            "order.create.start",
-            customer_name=order.customer_name,
-            amount=order.total_amount,
-            currency=order.currency,
-        )
+        log = _log_sampled()
+        if log:
+            logger.info(
+                "order.create.start",
+                customer_name=order.customer_name,
+                amount=order.total_amount,
+                currency=order.currency,
+            )
 
         order_id = uuid4()
         order_out = OrderOut(
@@ -28,29 +49,109 @@ class OrderService:
             total_amount=order.total_amount,
             currency=order.currency,
         )
-        orders.append(order_out)
+        self.repository.add(order_out)
+        orders_created_total.labels("single").inc()
 
-        logger.info(
-            "order.create.success",
-            order_id=str(order_id),
-            customer_name=order.customer_name,
-            amount=order.total_amount,
-            currency=order.currency,
-        )
+        if log:
+            logger.info(
+                "order.create.success",
+                order_id=str(order_id),
+                customer_name=order.customer_name,
+                amount=order.total_amount,
+                currency=order.currency,
+            )
 
         return order_out
 
+    def create_orders(self, orders_in: list[OrderIn]) -> list[OrderOut]:
+        """Create several orders and store them in a single atomic insert"""
+        log = _log_sampled()
+        if log:
+            logger.info("order.batch.start", count=len(orders_in))
+
+        # Fields come from already validated OrderIn instances
+        created = [
+            OrderOut.model_construct(
+                order_id=uuid4(),
+                customer_name=order.customer_name,
+                total_amount=order.total_amount,
+                currency=order.currency,
+                created_by=None,
+            )
+            for order in orders_in
+        ]
+        self.repository.add_many(created)
+        orders_created_total.labels("batch").inc(len(created))
+
+        if log:
+            logger.info("order.batch.success", count=len(created))
+
+        return created
+
+    async def flush(self) -> None:
+        """Wait until the orders created so far are durably stored"""
+        await self.repository.flush()
+
     def get_order(self, order_id: UUID) -> OrderOut:
-        logger.info("order.get.start", order_id=str(order_id))
+        log = _log_sampled()
+        if log:
+            logger.info("order.get.start", order_id=str(order_id))
+        return self._found(order_id, self.repository.get(order_id), log)
+
+    async def fetch_order(self, order_id: UUID) -> OrderOut:
+        """get_order() for async callers: storage I/O runs off the event loop"""
+        log = _log_sampled()
+        if log:
+            logger.info("order.get.start", order_id=str(order_id))
+        return self._found(order_id, await self.repository.get_async(order_id), log)
 
-        for order in orders:
-            if order.order_id == order_id:
+    def _found(self, order_id: UUID, order: Optional[OrderOut], log: bool) -> OrderOut:
+        if order is not None:
+            if log:
                 logger.info(
                     "order.get.success",
                     order_id=str(order_id),
                     customer_name=order.customer_name,
                 )
-                return order
+            return order
 
         logger.warning("order.get.not_found", order_id=str(order_id))
         raise OrderNotFoundException(f"Order {order_id} not found")
+
+    def get_orders_by_customer(self, customer_name: str) -> list[OrderOut]:
+        return self.repository.find_by_customer(customer_name)
+
+    def get_orders_by_currency(self, currency: str) -> list[OrderOut]:
+        return self.repository.find_by_currency(currency)
+
+    async def list_orders(
+        self, after: Optional[int] = None, limit: int = 100, **filters
+    ) -> tuple[list[OrderOut], Optional[int]]:
+        """
+        Return a page of orders after the `after` position
+
+        Returns the orders and the position to resume from, or None when
+        this is the last page.
+        """
+        page = await self.repository.scan_page_async(after, limit + 1, **filters)
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        next_position = page[-1][0] if has_more else None
+        return [order for _, order in page], next_position
+
+    async def stream_orders(
+        self, after: Optional[int] = None, **filters
+    ) -> AsyncIterator[OrderOut]:
+        """Stream every matching order without materialising the whole result"""
+        while True:
+            page = await self.repository.scan_page_async(
+                after, STREAM_CHUNK_SIZE, **filters
+            )
+            for _, order in page:
+                yield order
+            if len(page) < STREAM_CHUNK_SIZE:
+                return
+            after = page[-1][0]
+            # In-memory pages do not yield control to the event loop
+            await asyncio.sleep(0)
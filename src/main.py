@@ -1,10 +1,12 @@
+import asyncio
+import gc
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-import httpx
 from fastapi import FastAPI
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from src.api.dependencies.auth import jwt_service
 from src.api.middleware.correlation_id import (
     CorrelationIdMiddleware,
     configure_structlog,
@@ -15,21 +17,94 @@ from src.api.middleware.error_handler import (
     server_exception_handler,
     timeout_exception_handler,
 )
+from src.api.middleware.metrics import MetricsMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
+from src.api.responses.pydantic_response import PydanticJSONResponse
 from src.api.routes.auth import router as auth_router
 from src.api.routes.external import router as external_router
+from src.api.routes.metrics import router as metrics_router
+from src.api.routes.orders import order_idempotency_cache, order_repository
 from src.api.routes.orders import router as orders_router
+from src.domain.repositories.factory import check_workers
+from src.shared.config.http_config import http_client_settings
+from src.shared.config.logging_config import logging_settings
+from src.shared.config.metrics_config import metrics_settings
+from src.shared.config.order_config import order_store_settings
+from src.shared.config.profiling_config import profiling_settings
+from src.shared.config.server_config import server_settings
 from src.shared.http.exceptions import NetworkError, ServerError, TimeoutError
+from src.shared.http.pool import HTTPClientRegistry
+from src.shared.log.queue_sink import QueueLogSink
+from src.shared.metrics.instruments import metrics_registry
+from src.shared.server.workers import worker_processes
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    # Configure structured logging
-    configure_structlog()
+    # Configure structured logging (optionally through the background writer)
+    log_sink = None
+    if logging_settings.async_enabled:
+        log_sink = QueueLogSink(
+            maxsize=logging_settings.queue_size,
+            batch_size=logging_settings.batch_size,
+            overflow_policy=logging_settings.overflow_policy,
+        )
+        log_sink.start()
+    configure_structlog(log_sink, level=logging_settings.level)
+
+    http_clients = None
+    metrics_task = None
+    try:
+        # Load JWKS keys and keep them refreshed in the background
+        if jwt_service.key_cache is not None:
+            await jwt_service.key_cache.start()
+
+        # Replay the order journal (persistent storage) before serving
+        # requests; with several workers, orders must live in shared storage
+        workers = max(server_settings.web_concurrency, worker_processes())
+        check_workers(order_store_settings, workers)
+        # Loading stored orders creates many long-lived objects: pause the
+        # cyclic GC meanwhile (it would rescan them over and over), then move
+        # them out of the generations scanned by later collections
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            await order_repository.open()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        gc.freeze()
+        await order_idempotency_cache.open()
+
+        # One pooled HTTP client per upstream service
+        http_clients = HTTPClientRegistry(http_client_settings)
+        app.state.http_clients = http_clients
+        app.state.http = http_clients.get()
+
+        # Multi-worker mode: publish this worker's metrics for /metrics
+        if metrics_settings.enabled and metrics_registry.multiprocess_dir:
+            metrics_task = asyncio.create_task(
+                metrics_registry.run_snapshots(metrics_settings.flush_interval_seconds)
+            )
 
-    # Create HTTP client
-    async with httpx.AsyncClient() as client:
-        app.state.http = client
         yield
+    finally:
+        if metrics_task is not None:
+            metrics_task.cancel()
+            try:
+                await metrics_task
+            except asyncio.CancelledError:
+                pass
+            metrics_registry.write_snapshot()
+        if http_clients is not None:
+            await http_clients.aclose()
+        await order_idempotency_cache.close()
+        await order_repository.close()
+        if jwt_service.key_cache is not None:
+            await jwt_service.key_cache.stop()
+        # Write the queued log events before exiting
+        if log_sink is not None:
+            log_sink.close()
 
 
 app = FastAPI(
@@ -37,11 +112,20 @@ app = FastAPI(
     description="API for PosHub application",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=PydanticJSONResponse,
 )
 
+# Profile selected requests; added first so it runs inside the correlation ID
+if profiling_settings.enabled:
+    app.add_middleware(ProfilingMiddleware)
+
 # Add correlation ID middleware (must be added before other middlewares)
 app.add_middleware(CorrelationIdMiddleware)
 
+# Measure every request, including the correlation ID handling
+if metrics_settings.enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Register exception handlers
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(TimeoutError, timeout_exception_handler)
@@ -52,6 +136,8 @@ app.add_exception_handler(ServerError, server_exception_handler)
 app.include_router(auth_router)
 app.include_router(orders_router)
 app.include_router(external_router)
+if metrics_settings.enabled:
+    app.include_router(metrics_router)
 
 
 @app.get("/health")
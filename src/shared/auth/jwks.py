@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import jwt
+import structlog
+
+logger = structlog.get_logger()
+
+
+class JWKSKeyCache:
+    """
+    Cache des clés publiques d'un document JWKS, indexées par `kid`
+
+    Le document est chargé depuis un fichier ou une URL locale. Les clés sont
+    parsées une seule fois (objets `cryptography` prêts à l'emploi) puis
+    remplacées en bloc à chaque rafraîchissement : une rotation publiée dans
+    le JWKS est prise en compte sans interruption.
+
+    Le rafraîchissement a lieu en tâche de fond ; la vérification d'un token
+    ne fait qu'une recherche dans un dict et ne bloque jamais sur un
+    chargement. Un `kid` inconnu déclenche un rafraîchissement anticipé
+    (limité par `min_refresh_interval`).
+    """
+
+    def __init__(
+        self,
+        source: str,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+    ):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._last_refresh = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_requested: Optional[asyncio.Event] = None
+
+    def _read_document(self) -> dict:
+        if self.source.startswith(("http://", "https://")):
+            response = httpx.get(self.source, timeout=5.0)
+            response.raise_for_status()
+            return response.json()
+        return json.loads(Path(self.source).read_text(encoding="utf-8"))
+
+    def load(self) -> None:
+        """
+        Charge le JWKS et remplace les clés en cache
+
+        Raises:
+            jwt.PyJWKSetError, OSError, httpx.HTTPError: Si le document est invalide
+                ou inaccessible ; les clés précédentes sont alors conservées
+        """
+        self._last_refresh = time.monotonic()
+        key_set = jwt.PyJWKSet.from_dict(self._read_document())
+        keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        # Remplacement atomique : les requêtes en cours voient l'ancien ou le nouveau dict
+        self._keys = keys
+        logger.info("jwks.refresh.success", source=self.source, kids=sorted(keys))
+
+    async def refresh(self) -> None:
+        """Recharge le JWKS hors de la boucle d'événements, sans lever d'erreur"""
+        try:
+            await asyncio.to_thread(self.load)
+        except Exception as e:
+            logger.error("jwks.refresh.failed", source=self.source, error=str(e))
+
+    def get_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """
+        Retourne la clé publique associée à un `kid`
+
+        Args:
+            kid: Identifiant de clé présent dans l'en-tête du token
+
+        Returns:
+            Clé parsée, ou None si le `kid` est inconnu
+        """
+        key = self._keys.get(kid) if kid else None
+        if key is None:
+            self.request_refresh()
+        return key
+
+    def request_refresh(self) -> None:
+        """Demande un rafraîchissement anticipé (appelable depuis n'importe quel thread)"""
+        if self._loop is None or self._refresh_requested is None:
+            return
+        if time.monotonic() - self._last_refresh < self.min_refresh_interval:
+            return
+        self._loop.call_soon_threadsafe(self._refresh_requested.set)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._refresh_requested.wait(), timeout=self.refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+            await self.refresh()
+
+    async def start(self) -> None:
+        """Charge les clés puis lance le rafraîchissement en tâche de fond"""
+        self._loop = asyncio.get_running_loop()
+        self._refresh_requested = asyncio.Event()
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Arrête la tâche de rafraîchissement"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
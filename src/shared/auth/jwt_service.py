@@ -4,13 +4,38 @@ from typing import List, Optional
 import jwt
 from fastapi import HTTPException, status
 
+from src.shared.auth.jwks import JWKSKeyCache
 from src.shared.config.jwt_config import jwt_settings
 
+# Algorithmes vérifiés avec une clé publique issue du JWKS
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
 
 class JWTService:
-    def __init__(self, secret_key: str, algorithm: str = "HS256"):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        key_cache: Optional[JWKSKeyCache] = None,
+        signing_key: Optional[str] = None,
+        key_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            secret_key: Secret partagé (HS256)
+            algorithm: Algorithme de signature et de vérification
+            key_cache: Clés publiques JWKS, requis pour RS256/ES256/EdDSA
+            signing_key: Clé privée PEM pour émettre des tokens asymétriques
+            key_id: `kid` ajouté à l'en-tête des tokens émis
+        """
+        if algorithm in ASYMMETRIC_ALGORITHMS and key_cache is None:
+            raise ValueError(f"{algorithm} requiert un JWKS (key_cache)")
+
         self.secret_key = secret_key
         self.algorithm = algorithm
+        self.key_cache = key_cache
+        self.signing_key = signing_key
+        self.key_id = key_id
         self.access_token_expire_minutes = jwt_settings.access_token_expire_minutes
 
     def create_access_token(
@@ -42,7 +67,28 @@ class JWTService:
             "type": "access",
         }
 
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        if self.key_cache is None:
+            return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+        if self.signing_key is None:
+            raise RuntimeError("Aucune clé privée configurée pour signer les tokens")
+        return jwt.encode(
+            payload,
+            self.signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.key_id} if self.key_id else None,
+        )
+
+    def _decode(self, token: str) -> dict:
+        """Vérifie la signature avec le secret partagé ou la clé JWKS du `kid`"""
+        if self.key_cache is None:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = self.key_cache.get_key(kid)
+        if public_key is None:
+            raise jwt.InvalidKeyError(f"Clé inconnue: {kid}")
+        return jwt.decode(token, public_key.key, algorithms=[self.algorithm])
 
     def verify_token(self, token: str) -> dict:
         """
@@ -58,7 +104,7 @@ class JWTService:
             HTTPException: Si le token est invalide ou expiré
         """
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._decode(token)
 
             # Vérifier que c'est bien un token d'accès
             if payload.get("type") != "access":
@@ -76,7 +122,7 @@ class JWTService:
                 detail="Token expiré",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, jwt.InvalidKeyError):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token invalide",
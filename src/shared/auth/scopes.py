@@ -0,0 +1,122 @@
+from typing import Iterable
+
+# Scopes connus au démarrage (d'autres peuvent être enregistrés ensuite)
+KNOWN_SCOPES = ("orders:read", "orders:write")
+
+WILDCARD = "*"
+
+
+class ScopeRegistry:
+    """
+    Registre associant chaque scope connu à un bit
+
+    Les scopes d'un token sont convertis une seule fois en masque d'entiers,
+    et les scopes requis par une route sont compilés en masque au démarrage :
+    la vérification devient un simple ET binaire.
+
+    Les wildcards (`orders:*`, `*`) sont résolus à partir des scopes
+    enregistrés : `orders:*` couvre tous les scopes `orders:...`.
+    """
+
+    def __init__(self, scopes: Iterable[str] = ()):
+        self._bits: dict[str, int] = {}
+        self._namespace_masks: dict[str, int] = {}
+        self._all_mask = 0
+        for scope in scopes:
+            self.register(scope)
+
+    @staticmethod
+    def _namespace(scope: str) -> str:
+        return scope.split(":", 1)[0]
+
+    @staticmethod
+    def is_wildcard(scope: str) -> bool:
+        return scope == WILDCARD or scope.endswith(":" + WILDCARD)
+
+    def register(self, scope: str) -> int:
+        """
+        Enregistre un scope et retourne son bit
+
+        Args:
+            scope: Scope à enregistrer (ex: "orders:read")
+
+        Returns:
+            Masque ne contenant que le bit du scope
+        """
+        if self.is_wildcard(scope):
+            raise ValueError(f"Un wildcard ne peut pas être enregistré: {scope}")
+
+        bit = self._bits.get(scope)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[scope] = bit
+            namespace = self._namespace(scope)
+            self._namespace_masks[namespace] = (
+                self._namespace_masks.get(namespace, 0) | bit
+            )
+            self._all_mask |= bit
+        return bit
+
+    def _resolve_wildcard(self, scope: str) -> int:
+        if scope == WILDCARD:
+            return self._all_mask
+        return self._namespace_masks.get(self._namespace(scope), 0)
+
+    def compile(self, required_scopes: Iterable[str]) -> int:
+        """
+        Compile des scopes requis en masque
+
+        Les scopes inconnus sont enregistrés ; un wildcard requiert tous les
+        scopes qu'il couvre au moment de la compilation.
+
+        Args:
+            required_scopes: Scopes requis par une route
+
+        Returns:
+            Masque des scopes requis
+
+        Raises:
+            ValueError: Si un wildcard ne couvre aucun scope enregistré, ou si
+                aucun scope n'est requis (un masque vide accepterait tout token)
+        """
+        mask = 0
+        for scope in required_scopes:
+            if self.is_wildcard(scope):
+                wildcard_mask = self._resolve_wildcard(scope)
+                if not wildcard_mask:
+                    raise ValueError(f"Wildcard sans scope enregistré: {scope}")
+                mask |= wildcard_mask
+            else:
+                mask |= self.register(scope)
+        if not mask:
+            raise ValueError("Aucun scope requis")
+        return mask
+
+    def to_mask(self, token_scopes: Iterable[str]) -> int:
+        """
+        Convertit les scopes d'un token en masque
+
+        Les scopes inconnus sont ignorés : aucune route ne peut les requérir.
+
+        Args:
+            token_scopes: Scopes présents dans le token
+
+        Returns:
+            Masque des scopes accordés
+        """
+        mask = 0
+        for scope in token_scopes:
+            if self.is_wildcard(scope):
+                mask |= self._resolve_wildcard(scope)
+            else:
+                mask |= self._bits.get(scope, 0)
+        return mask
+
+    @staticmethod
+    def has_scopes(granted_mask: int, required_mask: int) -> bool:
+        """True si le masque accordé contient tous les bits requis"""
+        return granted_mask & required_mask == required_mask
+
+
+# Registre global des scopes
+scope_registry = ScopeRegistry(KNOWN_SCOPES)
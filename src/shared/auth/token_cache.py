@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class VerifiedTokenCache:
+    """
+    Cache LRU borné des tokens déjà vérifiés
+
+    Les entrées sont indexées par le SHA-256 du token (le token lui-même
+    n'est pas conservé) et expirent au plus tard à l'`exp` du token.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        # Les dépendances synchrones s'exécutent dans le threadpool
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Retourne la valeur associée au token, ou None si absente ou expirée
+
+        Args:
+            token: Token JWT brut
+
+        Returns:
+            Valeur mise en cache lors de la vérification du token
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, token: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Met en cache la valeur d'un token vérifié
+
+        Un token sans `exp` n'est gardé que pendant `ttl_seconds` ; sans TTL
+        configuré, il n'est pas mis en cache.
+
+        Args:
+            token: Token JWT brut
+            value: Valeur à retourner lors des prochains accès
+            expires_at: Timestamp (claim `exp`) à partir duquel l'entrée est
+                invalide, ou None si le token n'en a pas
+        """
+        if self.ttl_seconds is not None:
+            ttl_expiry = self._clock() + self.ttl_seconds
+            expires_at = (
+                ttl_expiry if expires_at is None else min(expires_at, ttl_expiry)
+            )
+        if expires_at is None:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Compteurs du cache"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,148 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Literal, Optional
+
+Freshness = Literal["fresh", "stale"]
+
+
+@dataclass(frozen=True)
+class CacheControl:
+    """Cache-Control directives relevant to a shared cache"""
+
+    max_age: Optional[float] = None
+    stale_while_revalidate: float = 0.0
+    no_store: bool = False
+
+
+def parse_cache_control(header: Optional[str]) -> CacheControl:
+    """
+    Parse a Cache-Control response header
+
+    `s-maxage` takes precedence over `max-age`; `no-store`, `no-cache` and
+    `private` all make the response uncacheable here.
+    """
+    if not header:
+        return CacheControl()
+
+    directives: dict[str, Optional[str]] = {}
+    for part in header.split(","):
+        name, _, value = part.strip().partition("=")
+        directives[name.strip().lower()] = value.strip().strip('"') or None
+
+    if directives.keys() & {"no-store", "no-cache", "private"}:
+        return CacheControl(no_store=True)
+
+    def seconds(name: str) -> Optional[float]:
+        try:
+            return max(float(directives[name]), 0.0)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    max_age = seconds("s-maxage")
+    if max_age is None:
+        max_age = seconds("max-age")
+    return CacheControl(
+        max_age=max_age,
+        stale_while_revalidate=seconds("stale-while-revalidate") or 0.0,
+    )
+
+
+@dataclass(frozen=True)
+class CachedValue:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class HTTPResponseCache:
+    """
+    Bounded LRU cache of upstream responses driven by Cache-Control
+
+    An entry is fresh for `max-age` seconds (or `default_ttl` when the
+    upstream sends none), then stale for `stale-while-revalidate` more
+    seconds: stale values may be served while a refresh happens in the
+    background.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, CachedValue] = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> tuple[Any, Optional[Freshness]]:
+        """
+        Look up a cached value
+
+        Returns:
+            (value, "fresh" | "stale"), or (None, None) on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+
+        now = self._clock()
+        if now >= entry.stale_until:
+            del self._entries[key]
+            self.misses += 1
+            return None, None
+
+        self._entries.move_to_end(key)
+        if now < entry.fresh_until:
+            self.hits += 1
+            return entry.value, "fresh"
+        self.stale_hits += 1
+        return entry.value, "stale"
+
+    def put(self, key: Hashable, value: Any, cache_control: CacheControl) -> bool:
+        """
+        Store a value according to the upstream Cache-Control
+
+        Returns:
+            True if the value was cached
+        """
+        if cache_control.no_store:
+            self._entries.pop(key, None)
+            return False
+
+        ttl = cache_control.max_age
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl <= 0 and cache_control.stale_while_revalidate <= 0:
+            return False
+
+        fresh_until = self._clock() + ttl
+        self._entries[key] = CachedValue(
+            value=value,
+            fresh_until=fresh_until,
+            stale_until=fresh_until + cache_control.stale_while_revalidate,
+        )
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
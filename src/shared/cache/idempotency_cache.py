@@ -0,0 +1,147 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Optional
+
+from src.shared.http.single_flight import SingleFlight
+from src.shared.storage.idempotency_store import SqliteIdempotencyStore
+
+
+@dataclass(frozen=True)
+class IdempotentResponse:
+    """Response of the first request made with an idempotency key"""
+
+    # Digest of the request the key was first used for
+    fingerprint: bytes
+    status_code: int
+    body: bytes
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU cache of responses by idempotency key, with a TTL
+
+    run() returns the stored response of a key, or produces it once: while
+    the first request of a key is in flight, duplicates await its result
+    instead of executing again. Only produced responses are stored; if the
+    first request fails, its waiters get the same error and a later retry
+    executes again.
+
+    With a `store`, keys are also shared with the other processes using it
+    (uvicorn workers): a key executed by another process is replayed, and a
+    key in flight there is awaited. Keys must then be JSON-serialisable.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl_seconds: float = 86_400.0,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[SqliteIdempotencyStore] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, IdempotentResponse]] = (
+            OrderedDict()
+        )
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[IdempotentResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: Hashable, response: IdempotentResponse) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def run(
+        self, key: Hashable, produce: Callable[[], Awaitable[IdempotentResponse]]
+    ) -> tuple[IdempotentResponse, bool]:
+        """
+        Return the response for `key`, producing it if it is not stored yet
+
+        Returns:
+            The response and whether it comes from an earlier or concurrent
+            request (a replay) rather than from this call's own `produce`
+        """
+        stored = self.get(key)
+        if stored is not None:
+            return stored, True
+
+        joined = self._flights.in_flight(key)
+        response, shared = await self._flights.do(
+            key, lambda: self._produce(key, produce)
+        )
+        return response, joined or shared
+
+    async def _produce(
+        self, key: Hashable, produce: Callable[[], Awaitable[IdempotentResponse]]
+    ) -> tuple[IdempotentResponse, bool]:
+        """Produce and store the response; True if another process produced it"""
+        if self.store is None:
+            response = await produce()
+            self.put(key, response)
+            return response, False
+
+        store_key = json.dumps(key)
+        stored = await self.store.claim(store_key)
+        if stored is not None:
+            response = IdempotentResponse(*stored)
+            self.put(key, response)
+            return response, True
+        try:
+            response = await produce()
+        except BaseException:
+            await self.store.release(store_key)
+            raise
+        await self.store.complete(
+            store_key,
+            (response.fingerprint, response.status_code, response.body),
+            self.ttl_seconds,
+        )
+        self.put(key, response)
+        return response, False
+
+    async def open(self) -> None:
+        if self.store is not None:
+            await self.store.open()
+
+    async def close(self) -> None:
+        if self.store is not None:
+            await self.store.close()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "in_flight": self._flights.stats()["in_flight"],
+            "shared": self._flights.shared,
+        }
@@ -0,0 +1,77 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Pre-serialised response body with its strong ETag"""
+
+    body: bytes
+    etag: str
+    generation: int
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response bytes"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag
+
+    Uses the weak comparison required for If-None-Match (RFC 9110 13.1.2).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialised responses
+
+    Each entry records the generation of the data it was built from; a
+    lookup with a newer generation is a miss, so bumping the generation of
+    the source invalidates every entry at once.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, generation: int = 0) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.generation != generation:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, body: bytes, generation: int = 0) -> CachedResponse:
+        entry = CachedResponse(body=body, etag=make_etag(body), generation=generation)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
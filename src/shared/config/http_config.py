@@ -0,0 +1,100 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+from pydantic_settings import BaseSettings
+
+
+class UpstreamSettings(BaseModel):
+    """Configuration du pool de connexions vers un service externe"""
+
+    # URL de base optionnelle (les requêtes peuvent alors utiliser des chemins relatifs)
+    base_url: str = ""
+
+    # Nombre maximal de connexions ouvertes et de connexions gardées au repos
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+
+    # Durée (en secondes) pendant laquelle une connexion au repos est conservée
+    keepalive_expiry: float = 5.0
+
+    # Multiplexage HTTP/2 (nécessite le paquet optionnel `h2`)
+    http2: bool = False
+
+    # Timeouts (en secondes) : établissement de la connexion, lecture, écriture
+    # et attente d'une connexion libre dans le pool
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+
+
+class HTTPClientSettings(BaseSettings):
+    """
+    Configuration des clients HTTP sortants
+
+    `default` s'applique à tout service externe non déclaré dans `upstreams`.
+    Exemples de variables d'environnement :
+
+        HTTP_CLIENT_DEFAULT__MAX_CONNECTIONS=50
+        HTTP_CLIENT_UPSTREAMS='{"httpbin": {"http2": true, "read_timeout": 2}}'
+    """
+
+    default: UpstreamSettings = UpstreamSettings()
+    upstreams: dict[str, UpstreamSettings] = {}
+
+    # Disjoncteur par hôte : il s'ouvre quand la part d'échecs (timeouts,
+    # erreurs réseau, 5XX) sur la fenêtre glissante dépasse le seuil, à partir
+    # d'un nombre minimal d'appels. Après `breaker_open_seconds`, un appel
+    # d'essai est autorisé (half-open) : un succès le referme.
+    breaker_failure_rate: float = Field(default=0.5, gt=0.0, le=1.0)
+    breaker_window_seconds: float = 30.0
+    breaker_minimum_calls: int = 10
+    breaker_open_seconds: float = 30.0
+
+    # Bulkhead : nombre maximal d'appels simultanés par hôte, et attente
+    # maximale (en secondes) d'une place libre avant d'échouer
+    bulkhead_max_concurrent: int = 50
+    bulkhead_max_wait: float = 0.0
+
+    # Nouvelles tentatives après un timeout ou une erreur réseau, avec un délai
+    # exponentiel ; une tentative n'est faite que si le délai tient dans le
+    # budget restant de la requête entrante
+    retry_attempts: int = Field(default=2, ge=1)
+    retry_backoff_seconds: float = 0.1
+    retry_backoff_max_seconds: float = 2.0
+
+    # Budget maximal (en millisecondes) d'une requête entrante, appliqué aussi
+    # aux requêtes sans en-tête X-Request-Timeout / X-Request-Deadline
+    max_request_budget_ms: Optional[float] = None
+
+    # Requêtes "hedged" : une seconde tentative est envoyée quand la première
+    # dépasse le p95 de l'hôte (au moins `hedge_min_delay_ms`), une fois
+    # `hedge_min_samples` latences mesurées
+    hedge_enabled: bool = False
+    hedge_min_delay_ms: float = 10.0
+    hedge_min_samples: int = 20
+
+    # Relais en streaming des grosses réponses : taille maximale (en octets,
+    # None pour ne pas limiter) et taille des morceaux transmis
+    stream_max_bytes: Optional[int] = 100 * 1024 * 1024
+    stream_chunk_size: int = 64 * 1024
+
+    # Regroupe les GET identiques (même URL et paramètres) en cours en un seul appel
+    coalesce_requests: bool = True
+
+    # Cache des réponses GET selon leur Cache-Control (max-age,
+    # stale-while-revalidate) ; 0 pour le désactiver. `response_cache_default_ttl`
+    # s'applique aux réponses sans max-age (0 : elles ne sont pas mises en cache).
+    response_cache_size: int = 0
+    response_cache_default_ttl: float = 0.0
+
+    class Config:
+        env_prefix = "HTTP_CLIENT_"
+        env_nested_delimiter = "__"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres des clients HTTP
+http_client_settings = HTTPClientSettings()
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from pydantic_settings import BaseSettings
 
@@ -12,12 +13,28 @@ class JWTSettings(BaseSettings):
         "JWT_SECRET_KEY", "your-very-secure-secret-key-change-in-production"
     )
 
-    # Algorithme de signature
+    # Algorithme de signature : HS256 (secret partagé) ou RS256/ES256/EdDSA (JWKS)
     algorithm: str = "HS256"
 
+    # Document JWKS (chemin de fichier ou URL locale) pour les algorithmes asymétriques
+    jwks_source: Optional[str] = None
+
+    # Intervalle de rafraîchissement du JWKS (en secondes)
+    jwks_refresh_seconds: int = 300
+
+    # Clé privée PEM et `kid` utilisés pour émettre des tokens asymétriques
+    private_key_path: Optional[str] = None
+    key_id: Optional[str] = None
+
     # Durée de validité du token d'accès (en minutes)
     access_token_expire_minutes: int = 30
 
+    # Cache des tokens vérifiés (0 pour le désactiver)
+    token_cache_size: int = 10_000
+
+    # Durée maximale (en secondes) d'une entrée du cache, même si `exp` est plus loin
+    token_cache_ttl_seconds: int = 300
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,42 @@
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class LoggingSettings(BaseSettings):
+    """Configuration des logs"""
+
+    # Niveau minimal des logs structurés
+    level: str = "INFO"
+
+    # Active le pipeline asynchrone : les événements sont mis en file sur le
+    # chemin critique puis rendus en JSON et écrits par un thread dédié
+    async_enabled: bool = False
+
+    # Taille maximale de la file et nombre d'événements écrits par lot
+    queue_size: int = 10_000
+    batch_size: int = 256
+
+    # Comportement quand la file est pleine
+    overflow_policy: Literal["drop_newest", "drop_oldest", "block"] = "drop_newest"
+
+    # Part des requêtes réussies journalisées (request.start / request.end),
+    # ex: 0.01 pour 1 %. Les erreurs et les requêtes lentes le sont toujours.
+    request_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+
+    # Au-delà de cette durée (en millisecondes), une requête est toujours journalisée
+    slow_request_threshold_ms: float = 1000.0
+
+    # Part des opérations sur les commandes journalisées (order.*.start / success)
+    order_log_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+
+    class Config:
+        env_prefix = "LOG_"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres de logs
+logging_settings = LoggingSettings()
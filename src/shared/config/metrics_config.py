@@ -0,0 +1,25 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class MetricsSettings(BaseSettings):
+    """Configuration des métriques Prometheus"""
+
+    # Expose GET /metrics et mesure les requêtes HTTP
+    enabled: bool = True
+
+    # Mode multiprocess (plusieurs workers uvicorn) : répertoire partagé où
+    # chaque worker écrit ses métriques toutes les `flush_interval_seconds`
+    multiprocess_dir: Optional[str] = None
+    flush_interval_seconds: float = 1.0
+
+    class Config:
+        env_prefix = "METRICS_"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres des métriques
+metrics_settings = MetricsSettings()
@@ -0,0 +1,57 @@
+from typing import Literal, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class OrderStoreSettings(BaseSettings):
+    """Configuration du stockage des commandes"""
+
+    # Implémentation du repository : "memory" (modèles pydantic indexés),
+    # "columnar" (stockage compact en tableaux, pour de gros volumes) ou
+    # "sqlite" (base SQLite embarquée, persistante sans journal)
+    backend: Literal["memory", "columnar", "sqlite"] = "memory"
+
+    # Base SQLite (backend "sqlite") : fichier, nombre de threads de lecture et
+    # mode PRAGMA synchronous ("FULL" : commit durable avant la réponse 201,
+    # "NORMAL" : durable au prochain checkpoint WAL, plus rapide)
+    sqlite_path: str = "orders.db"
+    sqlite_readers: int = 4
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = "FULL"
+
+    # Répertoire du journal des commandes : active la persistance (journal
+    # append-only rejoué au démarrage) ; sans répertoire, tout reste en mémoire.
+    # Ignoré avec le backend "sqlite"
+    journal_dir: Optional[str] = None
+
+    # Politique de fsync du journal : "always" (à chaque écriture), "group"
+    # (écritures concurrentes regroupées dans un même fsync), "periodic"
+    # (toutes les `journal_fsync_interval_seconds`) ou "never" (laissé à l'OS)
+    journal_fsync: Literal["always", "group", "periodic", "never"] = "group"
+
+    # Attente (en millisecondes) avant un fsync groupé, pour regrouper davantage
+    journal_group_commit_delay_ms: float = 0.0
+
+    journal_fsync_interval_seconds: float = 1.0
+
+    # Snapshot compacté (et suppression des anciens segments) vérifié toutes
+    # les `snapshot_interval_seconds`, dès `snapshot_min_records` écritures
+    snapshot_interval_seconds: float = 60.0
+    snapshot_min_records: int = 100_000
+
+    # Nombre de réponses GET /orders/{order_id} pré-sérialisées gardées en cache
+    response_cache_size: int = 10_000
+
+    # Réponses de POST /orders conservées par clé Idempotency-Key (nombre
+    # maximal et durée de conservation) pour rejouer les requêtes répétées
+    idempotency_cache_size: int = 10_000
+    idempotency_ttl_seconds: float = 86_400.0
+
+    class Config:
+        env_prefix = "ORDER_STORE_"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres de stockage
+order_store_settings = OrderStoreSettings()
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class ProfilingSettings(BaseSettings):
+    """Configuration du profilage des requêtes"""
+
+    # Active le middleware de profilage (désactivé par défaut)
+    enabled: bool = False
+
+    # Secret HMAC des en-têtes X-Profile ; sans secret, seul l'échantillonnage
+    # déclenche un profil
+    secret: Optional[str] = None
+
+    # Durée de validité maximale (en secondes) d'un en-tête X-Profile signé
+    max_signature_ttl_seconds: int = 3600
+
+    # Part des requêtes profilées sans en-tête, ex: 0.001 pour 0,1 %
+    sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+
+    # Répertoire où sont écrits les profils (.prof pour pstats / snakeviz et
+    # résumé .json)
+    output_dir: str = "profiles"
+
+    # Nombre de fonctions listées dans le résumé (tri par temps cumulé)
+    top_functions: int = 30
+
+    class Config:
+        env_prefix = "PROFILING_"
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres de profilage
+profiling_settings = ProfilingSettings()
@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings
+
+
+class ServerSettings(BaseSettings):
+    """Configuration du serveur"""
+
+    # Nombre de processus workers servant l'application (variable
+    # WEB_CONCURRENCY, lue aussi par uvicorn et gunicorn comme nombre de
+    # workers par défaut). À déclarer quel que soit le superviseur : au-delà
+    # de 1, le démarrage exige un stockage partagé (backend "sqlite")
+    web_concurrency: int = 1
+
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore"
+
+
+# Instance globale des paramètres du serveur
+server_settings = ServerSettings()
@@ -1,75 +1,621 @@
-from typing import Any, Optional
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Sequence, Union
 
 import httpx
 import structlog
 from starlette.requests import Request
-from tenacity import retry, stop_after_attempt, wait_exponential
-from tenacity.retry import retry_if_exception_type
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    stop_after_attempt,
+    stop_any,
+    wait_exponential,
+)
+from tenacity.retry import retry_if_exception_type, retry_if_not_exception_type
 
-from src.shared.http.exceptions import NetworkError, ServerError, TimeoutError
+from src.shared.cache.http_cache import HTTPResponseCache, parse_cache_control
+from src.shared.config.http_config import HTTPClientSettings, http_client_settings
+from src.shared.http.deadline import TIMEOUT_HEADER, deadline_context, remaining_budget
+from src.shared.http.exceptions import (
+    DeadlineExceededError,
+    NetworkError,
+    ResponseTooLargeError,
+    ServerError,
+    TimeoutError,
+)
+from src.shared.http.resilience import UpstreamGuard, UpstreamGuards, upstream_guards
+from src.shared.http.single_flight import SingleFlight
+from src.shared.metrics.instruments import outbound_request_duration_seconds
 
 logger = structlog.get_logger()
 
-
-@retry(
-    stop=stop_after_attempt(2),
-    wait=wait_exponential(multiplier=1, min=4, max=10),
-    retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
-    reraise=True,
+# Coalescing of identical in-flight GETs and optional cache of their responses
+external_single_flight = (
+    SingleFlight() if http_client_settings.coalesce_requests else None
+)
+external_response_cache = (
+    HTTPResponseCache(
+        max_size=http_client_settings.response_cache_size,
+        default_ttl=http_client_settings.response_cache_default_ttl,
+    )
+    if http_client_settings.response_cache_size > 0
+    else None
 )
+
+# Background revalidations when coalescing is disabled, and their tasks
+_revalidations = SingleFlight()
+_background_tasks: set[asyncio.Task] = set()
+
+
 async def safe_get(
-    client: httpx.AsyncClient, url: str, *, params: Optional[dict[str, Any]] = None
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: Optional[dict[str, Any]] = None,
+    guards: UpstreamGuards = upstream_guards,
+    cache: Optional[HTTPResponseCache] = external_response_cache,
+    single_flight: Optional[SingleFlight] = external_single_flight,
+    settings: HTTPClientSettings = http_client_settings,
 ) -> dict[str, Any]:
     """
     Safe GET request with retries and logging
+
+    Each upstream host has a circuit breaker and a bulkhead: when the host is
+    failing or saturated, the call fails fast with CircuitOpenError or
+    BulkheadFullError (both ServerError) instead of waiting on the upstream.
+
+    Concurrent identical GETs (same URL and params) share one upstream call.
+    With a cache, fresh responses are served without calling the upstream,
+    and stale ones (within stale-while-revalidate) are served while a single
+    refresh runs in the background. The returned dict may be shared between
+    callers and must not be mutated.
+
+    The inbound request deadline caps the outbound timeouts, forwarded as
+    X-Request-Timeout, and the retries: a retry is only attempted if its
+    backoff fits in the remaining budget. Past the deadline the call raises
+    DeadlineExceededError (a TimeoutError). A coalesced call is shared by
+    callers with different deadlines, so it runs with the service timeouts
+    only, and each caller stops waiting for it at its own deadline. With
+    hedging enabled, a second attempt is sent when the first one is slower
+    than the upstream's p95.
     """
+    request = client.build_request("GET", url, params=params)
+    key = str(request.url)
+
+    if cache is not None:
+        value, freshness = cache.get(key)
+        if freshness is not None:
+            logger.info("external_request.cache_hit", url=url, freshness=freshness)
+            if freshness == "stale":
+                _revalidate(
+                    key, client, request, guards, cache, single_flight, settings
+                )
+            return value
+
+    def fetch() -> Awaitable[dict[str, Any]]:
+        return _fetch_with_retries(client, request, guards, cache, settings)
+
+    async def shared_fetch() -> dict[str, Any]:
+        # Runs in its own task: the leader's deadline must not apply to the
+        # callers joining it
+        deadline_context.set(None)
+        return await fetch()
+
+    call = fetch() if single_flight is None else single_flight.do(key, shared_fetch)
+    return await _within_deadline(call, key)
+
+
+async def _within_deadline(call: Awaitable[Any], url: str) -> Any:
+    remaining = remaining_budget()
+    if remaining is None:
+        return await call
     try:
-        logger.info("external_request.start", url=url, params=params)
-        response = await client.get(url=url, params=params, timeout=10.0)
-        response.raise_for_status()
+        return await asyncio.wait_for(call, max(remaining, 0.0))
+    except asyncio.TimeoutError as e:
+        logger.error("external_request.deadline_exceeded", url=url)
+        raise DeadlineExceededError("Request deadline exceeded") from e
+
+
+def _revalidate(
+    key: str,
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    guards: UpstreamGuards,
+    cache: HTTPResponseCache,
+    single_flight: Optional[SingleFlight],
+    settings: HTTPClientSettings,
+) -> None:
+    """Refresh a stale cache entry in the background, once per key"""
+    flight = single_flight or _revalidations
+    if flight.in_flight(key):
+        return
+
+    async def refresh() -> None:
+        # The refresh outlives the request that triggered it
+        deadline_context.set(None)
+        try:
+            await flight.do(
+                key,
+                lambda: _fetch_with_retries(client, request, guards, cache, settings),
+            )
+        except Exception as e:
+            logger.warning(
+                "external_request.revalidation_failed", url=key, error=str(e)
+            )
+
+    task = asyncio.create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _fetch_with_retries(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    guards: UpstreamGuards,
+    cache: Optional[HTTPResponseCache],
+    settings: HTTPClientSettings,
+) -> dict[str, Any]:
+    """Retry timeouts and network errors while the backoff fits in the deadline"""
+    wait = wait_exponential(
+        multiplier=settings.retry_backoff_seconds,
+        max=settings.retry_backoff_max_seconds,
+    )
+
+    def deadline_reached(retry_state: RetryCallState) -> bool:
+        remaining = remaining_budget()
+        return remaining is not None and remaining <= wait(retry_state)
+
+    retrying = AsyncRetrying(
+        stop=stop_any(stop_after_attempt(settings.retry_attempts), deadline_reached),
+        wait=wait,
+        retry=(
+            retry_if_exception_type((TimeoutError, NetworkError))
+            & retry_if_not_exception_type(DeadlineExceededError)
+        ),
+        reraise=True,
+    )
+    guard = guards.get(request.url.netloc.decode("ascii"))
+    async for attempt in retrying:
+        with attempt:
+            return await _hedged_fetch(client, request, guard, cache, settings)
+
+
+def _hedge_delay(guard: UpstreamGuard, settings: HTTPClientSettings) -> Optional[float]:
+    if not settings.hedge_enabled:
+        return None
+    if len(guard.latency) < settings.hedge_min_samples:
+        return None
+    return max(guard.latency.percentile(0.95), settings.hedge_min_delay_ms / 1000)
+
+
+async def _hedged_fetch(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    guard: UpstreamGuard,
+    cache: Optional[HTTPResponseCache],
+    settings: HTTPClientSettings,
+) -> dict[str, Any]:
+    """
+    Send the GET, and a second copy if the first is slower than the p95
+
+    The first successful attempt wins and the other one is cancelled.
+    """
+    delay = _hedge_delay(guard, settings)
+    remaining = remaining_budget()
+    if delay is None or (remaining is not None and remaining <= delay):
+        return await _fetch(client, request, guard, cache)
+
+    tasks = {asyncio.create_task(_fetch(client, request, guard, cache))}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            guard.latency.hedges += 1
+            logger.info(
+                "external_request.hedged",
+                url=str(request.url),
+                delay_ms=round(delay * 1000, 3),
+            )
+            tasks.add(asyncio.create_task(_fetch(client, request, guard, cache)))
+
+        error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _prepare_attempt(request: httpx.Request) -> httpx.Request:
+    """Copy of the request for one attempt, with timeouts capped by the deadline"""
+    extensions = dict(request.extensions)
+    headers = request.headers.copy()
+    remaining = remaining_budget()
+    if remaining is not None:
+        if remaining <= 0:
+            raise DeadlineExceededError("Request deadline exceeded")
+        extensions["timeout"] = {
+            name: remaining if value is None else min(value, remaining)
+            for name, value in extensions.get("timeout", {}).items()
+        }
+        headers[TIMEOUT_HEADER] = str(int(remaining * 1000))
+    return httpx.Request(
+        request.method, request.url, headers=headers, extensions=extensions
+    )
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    request: httpx.Request,
+    guard: UpstreamGuard,
+    cache: Optional[HTTPResponseCache],
+) -> dict[str, Any]:
+    """Send one attempt through the upstream guard and cache its JSON body"""
+    url = str(request.url)
+    request = _prepare_attempt(request)
+
+    async with guard.bulkhead:
+        guard.check()
+        started = time.perf_counter()
+        try:
+            logger.info("external_request.start", url=url)
+            response = await client.send(request)
+            response.raise_for_status()
+            guard.breaker.record_success()
+            elapsed = time.perf_counter() - started
+            guard.latency.record(elapsed)
+            outbound_request_duration_seconds.labels(guard.name, "success").observe(
+                elapsed
+            )
+
+            logger.info(
+                "external_request.success",
+                url=url,
+                status_code=response.status_code,
+                response_size=len(response.content),
+            )
+            data = response.json()
+            if cache is not None:
+                cache.put(
+                    url,
+                    data,
+                    parse_cache_control(response.headers.get("cache-control")),
+                )
+            return data
+
+        except (httpx.TimeoutException, httpx.NetworkError, httpx.HTTPStatusError) as e:
+            outbound_request_duration_seconds.labels(guard.name, _outcome(e)).observe(
+                time.perf_counter() - started
+            )
+            mapped = _map_http_error(e, client, guard, url)
+            if mapped is e:
+                raise
+            raise mapped from e
+
+        except BaseException:
+            # Cancelled or unexpected error: no verdict on the upstream health
+            guard.breaker.record_ignored()
+            raise
+
+
+def _outcome(error: httpx.HTTPError) -> str:
+    """Outcome label of a failed attempt for the outbound latency histogram"""
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.HTTPStatusError):
+        if error.response.status_code < 500:
+            return "client_error"
+        return "server_error"
+    return "network_error"
 
-        logger.info(
-            "external_request.success",
-            url=url,
-            status_code=response.status_code,
-            response_size=len(response.content),
-        )
-        return response.json()
 
-    except httpx.TimeoutException as e:
+def _map_http_error(
+    error: httpx.HTTPError,
+    client: httpx.AsyncClient,
+    guard: UpstreamGuard,
+    url: str,
+    response_body: Optional[str] = None,
+) -> Exception:
+    """Record the outcome on the breaker, log it and return the exception to raise"""
+    if isinstance(error, httpx.TimeoutException):
+        guard.breaker.record_failure()
         logger.error(
-            "external_request.timeout", url=url, error=str(e), timeout_seconds=10.0
+            "external_request.timeout",
+            url=url,
+            error=str(error),
+            error_type=type(error).__name__,
+            timeout=client.timeout.as_dict(),
         )
-        raise TimeoutError("Request timed out") from e
+        return TimeoutError("Request timed out")
 
-    except httpx.NetworkError as e:
+    if isinstance(error, httpx.NetworkError):
+        guard.breaker.record_failure()
         logger.error(
             "external_request.network_error",
             url=url,
-            error=str(e),
-            error_type=type(e).__name__,
+            error=str(error),
+            error_type=type(error).__name__,
         )
-        raise NetworkError("Network error occurred") from e
-
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code >= 500:
-            logger.error(
-                "external_request.server_error",
-                url=url,
-                status_code=e.response.status_code,
-                response_body=e.response.text[:500],  # Limit response body size
-            )
-            raise ServerError(
-                f"External service error: {e.response.status_code}"
-            ) from e
+        return NetworkError("Network error occurred")
 
+    status_code = error.response.status_code
+    if response_body is None:
+        response_body = error.response.text[:500]  # Limit response body size
+    if status_code >= 500:
+        guard.breaker.record_failure()
         logger.error(
-            "external_request.client_error",
+            "external_request.server_error",
             url=url,
-            status_code=e.response.status_code,
-            response_body=e.response.text[:500],  # Limit response body size
+            status_code=status_code,
+            response_body=response_body,
         )
-        raise
+        return ServerError(f"External service error: {status_code}")
+
+    # The upstream is healthy: a 4XX is the caller's problem
+    guard.breaker.record_success()
+    logger.error(
+        "external_request.client_error",
+        url=url,
+        status_code=status_code,
+        response_body=response_body,
+    )
+    return error
+
+
+class UpstreamStream:
+    """
+    Upstream response relayed chunk by chunk
+
+    Iterating yields the body in chunks of at most `chunk_size` bytes
+    without ever holding the whole body; the bytes are counted as they go
+    and the stream is aborted with ResponseTooLargeError past `max_bytes`.
+    The upstream connection and the bulkhead slot are released when the
+    iteration ends or `aclose()` is called, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        response: httpx.Response,
+        guard: UpstreamGuard,
+        url: str,
+        max_bytes: Optional[int],
+        chunk_size: int,
+    ):
+        self.client = client
+        self.response = response
+        self.guard = guard
+        self.url = url
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.bytes_sent = 0
+        self.completed = False
+        self._started = time.perf_counter()
+        self._closed = False
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def media_type(self) -> Optional[str]:
+        return self.response.headers.get("content-type")
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.response.aiter_bytes(self.chunk_size):
+                self.bytes_sent += len(chunk)
+                if self.max_bytes is not None and self.bytes_sent > self.max_bytes:
+                    logger.error(
+                        "external_request.too_large",
+                        url=self.url,
+                        max_bytes=self.max_bytes,
+                        bytes_sent=self.bytes_sent - len(chunk),
+                    )
+                    raise ResponseTooLargeError(
+                        f"External response exceeds {self.max_bytes} bytes"
+                    )
+                yield chunk
+            self.completed = True
+        except (httpx.TimeoutException, httpx.NetworkError) as e:
+            mapped = _map_http_error(e, self.client, self.guard, self.url)
+            raise mapped from e
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.response.aclose()
+        finally:
+            await self.guard.bulkhead.__aexit__(None, None, None)
+
+        duration = time.perf_counter() - self._started
+        if self.completed:
+            self.guard.latency.record(duration)
+            logger.info(
+                "external_request.success",
+                url=self.url,
+                status_code=self.status_code,
+                response_size=self.bytes_sent,
+                streamed=True,
+            )
+        else:
+            logger.warning(
+                "external_request.stream_aborted",
+                url=self.url,
+                status_code=self.status_code,
+                bytes_sent=self.bytes_sent,
+                duration_ms=round(duration * 1000, 3),
+            )
+
+
+async def _read_prefix(response: httpx.Response, limit: int = 500) -> str:
+    """First bytes of a streamed body, for error logs"""
+    prefix = b""
+    async for chunk in response.aiter_raw():
+        prefix += chunk
+        if len(prefix) >= limit:
+            break
+    return prefix[:limit].decode("utf-8", errors="replace")
+
+
+async def safe_stream(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    params: Optional[dict[str, Any]] = None,
+    guards: UpstreamGuards = upstream_guards,
+    max_bytes: Optional[int] = http_client_settings.stream_max_bytes,
+    chunk_size: int = http_client_settings.stream_chunk_size,
+) -> UpstreamStream:
+    """
+    Safe streaming GET: opens the upstream response without reading its body
+
+    Goes through the same circuit breaker, bulkhead, deadline and error
+    mapping as safe_get, which are all decided on the status line and
+    headers. A Content-Length above `max_bytes` fails before any byte is
+    relayed; a body without Content-Length is cut once it exceeds it.
+    Neither retries, coalescing nor caching apply to streams.
+
+    Returns:
+        UpstreamStream to iterate (e.g. as a StreamingResponse body)
+    """
+    request = client.build_request("GET", url, params=params)
+    url = str(request.url)
+    guard = guards.get(request.url.netloc.decode("ascii"))
+    request = _prepare_attempt(request)
+
+    stream: Optional[UpstreamStream] = None
+    await guard.bulkhead.__aenter__()
+    try:
+        guard.check()
+        response_body = None
+        try:
+            logger.info("external_request.start", url=url, streamed=True)
+            response = await client.send(request, stream=True)
+            try:
+                if response.is_error:
+                    response_body = await _read_prefix(response)
+                response.raise_for_status()
+
+                length = response.headers.get("content-length")
+                if max_bytes is not None and length and int(length) > max_bytes:
+                    logger.error(
+                        "external_request.too_large",
+                        url=url,
+                        max_bytes=max_bytes,
+                        content_length=int(length),
+                    )
+                    raise ResponseTooLargeError(
+                        f"External response exceeds {max_bytes} bytes"
+                    )
+            except BaseException:
+                await response.aclose()
+                raise
+
+            guard.breaker.record_success()
+            stream = UpstreamStream(client, response, guard, url, max_bytes, chunk_size)
+            return stream
+
+        except (httpx.TimeoutException, httpx.NetworkError, httpx.HTTPStatusError) as e:
+            mapped = _map_http_error(e, client, guard, url, response_body)
+            if mapped is e:
+                raise
+            raise mapped from e
+
+        except BaseException:
+            guard.breaker.record_ignored()
+            raise
+    finally:
+        if stream is None:
+            await guard.bulkhead.__aexit__(None, None, None)
+
+
+@dataclass(frozen=True)
+class GatherResult:
+    """Outcome of one GET of a gather_get fan-out"""
+
+    url: str
+    params: Optional[dict[str, Any]] = None
+    data: Optional[dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+GetCall = Union[str, tuple[str, Optional[dict[str, Any]]]]
+
+
+async def gather_get(
+    client: httpx.AsyncClient,
+    calls: Sequence[GetCall],
+    *,
+    max_concurrency: int = 10,
+    timeout: Optional[float] = None,
+    **options: Any,
+) -> list[GatherResult]:
+    """
+    Run many safe_get calls concurrently and collect partial results
+
+    At most `max_concurrency` calls are in flight at once. Each call gets
+    `timeout` seconds from the moment it starts, within the request deadline
+    if there is one. A failing call does not affect the others: its
+    exception (TimeoutError, NetworkError, ServerError, HTTPStatusError for a
+    4XX, or any other error such as a non-JSON body) is stored in its result
+    instead of being raised.
+
+    Args:
+        client: HTTP client used for every call
+        calls: URLs, or (url, params) tuples
+        max_concurrency: Maximum number of calls in flight
+        timeout: Per-call timeout in seconds
+        **options: Extra safe_get arguments (guards, cache, single_flight...)
+
+    Returns:
+        One GatherResult per call, in the order of `calls`
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(call: GetCall) -> GatherResult:
+        url, params = (call, None) if isinstance(call, str) else call
+        async with semaphore:
+            if timeout is not None:
+                # Runs in its own task: the tighter deadline only applies here
+                deadline = time.monotonic() + timeout
+                current = deadline_context.get()
+                deadline_context.set(
+                    deadline if current is None else min(current, deadline)
+                )
+            try:
+                data = await safe_get(client, url, params=params, **options)
+            except Exception as e:
+                # One bad upstream must not cancel the rest of the fan-out
+                return GatherResult(url=url, params=params, error=e)
+            return GatherResult(url=url, params=params, data=data)
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(run(call)) for call in calls]
+    results = [task.result() for task in tasks]
+
+    failed = sum(1 for result in results if not result.ok)
+    logger.info(
+        "external_request.fan_out",
+        calls=len(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+    )
+    return results
 
 
 async def get_http_client(request: Request) -> httpx.AsyncClient:
@@ -80,3 +626,20 @@ async def get_http_client(request: Request) -> httpx.AsyncClient:
     if not hasattr(request.app.state, "http"):
         raise RuntimeError("HTTP client not initialized. Check lifespan configuration.")
     return request.app.state.http
+
+
+def get_upstream_client(name: str) -> Callable[[Request], httpx.AsyncClient]:
+    """
+    Dependency factory returning the pooled client of an upstream service
+    Upstreams without their own configuration share the default client
+    """
+
+    async def _get_upstream_client(request: Request) -> httpx.AsyncClient:
+        registry = getattr(request.app.state, "http_clients", None)
+        if registry is None:
+            raise RuntimeError(
+                "HTTP clients not initialized. Check lifespan configuration."
+            )
+        return registry.get(name)
+
+    return _get_upstream_client
@@ -0,0 +1,54 @@
+import time
+from contextvars import ContextVar
+from typing import Mapping, Optional
+
+# Inbound budget headers: absolute Unix timestamp (seconds) or remaining milliseconds
+DEADLINE_HEADER = "X-Request-Deadline"
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+# Deadline of the current request, on the time.monotonic() clock
+deadline_context: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def parse_deadline(
+    headers: Mapping[str, str], max_budget: Optional[float] = None
+) -> Optional[float]:
+    """
+    Monotonic deadline derived from the inbound budget headers
+
+    `X-Request-Timeout` (remaining milliseconds) is preferred as it does not
+    depend on clock synchronisation; otherwise `X-Request-Deadline` (Unix
+    timestamp in seconds) is converted to the local monotonic clock.
+
+    Args:
+        headers: Request headers
+        max_budget: Upper bound (in seconds) of the budget, applied to
+            requests without budget headers as well
+
+    Returns:
+        Deadline on the time.monotonic() clock, or None without a budget
+    """
+    budget = None
+    try:
+        if TIMEOUT_HEADER in headers:
+            budget = float(headers[TIMEOUT_HEADER]) / 1000
+        elif DEADLINE_HEADER in headers:
+            budget = float(headers[DEADLINE_HEADER]) - time.time()
+    except ValueError:
+        budget = None
+
+    if max_budget is not None and (budget is None or budget > max_budget):
+        budget = max_budget
+    if budget is None:
+        return None
+    return time.monotonic() + budget
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left before the current request deadline, or None without one"""
+    deadline = deadline_context.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
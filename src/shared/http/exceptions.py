@@ -16,6 +16,12 @@ class TimeoutError(ExternalServiceError):
     pass
 
 
+class DeadlineExceededError(TimeoutError):
+    """Raised when the request deadline leaves no time for the call"""
+
+    pass
+
+
 class NetworkError(ExternalServiceError):
     """Raised when network error occurs"""
 
@@ -26,3 +32,21 @@ class ServerError(ExternalServiceError):
     """Raised when server returns 5XX error"""
 
     pass
+
+
+class CircuitOpenError(ServerError):
+    """Raised when the circuit breaker of an upstream is open"""
+
+    pass
+
+
+class BulkheadFullError(ServerError):
+    """Raised when an upstream already has the maximum number of calls in flight"""
+
+    pass
+
+
+class ResponseTooLargeError(ServerError):
+    """Raised when an upstream response exceeds the configured size limit"""
+
+    pass
@@ -0,0 +1,206 @@
+import importlib.util
+import time
+from typing import Any
+
+import httpx
+import structlog
+
+from src.shared.config.http_config import HTTPClientSettings, UpstreamSettings
+
+logger = structlog.get_logger()
+
+DEFAULT_UPSTREAM = "default"
+
+# httpcore trace events emitted once a request holds a connection: either a
+# new connection is being opened, or the request is sent on a pooled one
+_CONNECTION_ACQUIRED_EVENTS = frozenset(
+    {
+        "connection.connect_tcp.started",
+        "http11.send_request_headers.started",
+        "http2.send_request_headers.started",
+    }
+)
+
+
+class PoolMetrics:
+    """Compteurs d'utilisation d'un pool de connexions"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.waiting = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.connections_opened = 0
+        self.pool_timeouts = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_time_total += seconds
+        if seconds > self.wait_time_max:
+            self.wait_time_max = seconds
+
+    def stats(self, connections: list[Any]) -> dict[str, Any]:
+        """
+        Statistiques du pool
+
+        Args:
+            connections: Connexions actuellement dans le pool (httpcore)
+
+        Returns:
+            Connexions utilisées / au repos, requêtes en attente et temps d'attente
+        """
+        idle = sum(1 for connection in connections if connection.is_idle())
+        completed = self.requests - self.waiting
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "pool_timeouts": self.pool_timeouts,
+            "wait_ms_avg": (
+                round(self.wait_time_total / completed * 1000, 3) if completed else 0.0
+            ),
+            "wait_ms_max": round(self.wait_time_max * 1000, 3),
+        }
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    Transport httpx mesurant l'utilisation de son pool de connexions
+
+    Le temps d'attente d'une requête est mesuré entre son entrée dans le pool
+    et le premier événement httpcore indiquant qu'elle dispose d'une
+    connexion. Les callbacks `trace` déjà présents sont conservés.
+    """
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.metrics = PoolMetrics()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        metrics = self.metrics
+        parent_trace = request.extensions.get("trace")
+        started = time.perf_counter()
+        acquired = False
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if not acquired and event_name in _CONNECTION_ACQUIRED_EVENTS:
+                acquired = True
+                metrics.waiting -= 1
+                metrics.record_wait(time.perf_counter() - started)
+            if event_name == "connection.connect_tcp.complete":
+                metrics.connections_opened += 1
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        metrics.requests += 1
+        metrics.waiting += 1
+        try:
+            return await super().handle_async_request(request)
+        except httpx.PoolTimeout:
+            metrics.pool_timeouts += 1
+            raise
+        finally:
+            if not acquired:
+                acquired = True
+                metrics.waiting -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return self.metrics.stats(self._pool.connections)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_transport(
+    settings: UpstreamSettings, name: str = DEFAULT_UPSTREAM
+) -> InstrumentedTransport:
+    """
+    Crée le transport instrumenté d'un service externe
+
+    Si HTTP/2 est demandé mais que `h2` n'est pas installé, le transport
+    utilise HTTP/1.1 et un avertissement est journalisé.
+
+    Args:
+        settings: Limites du pool, keep-alive et HTTP/2
+        name: Nom du service externe (pour les logs)
+
+    Returns:
+        Transport dont le pool est instrumenté
+    """
+    http2 = settings.http2
+    if http2 and not http2_available():
+        logger.warning("http_client.http2_unavailable", upstream=name)
+        http2 = False
+
+    return InstrumentedTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+    )
+
+
+def build_timeout(settings: UpstreamSettings) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=settings.connect_timeout,
+        read=settings.read_timeout,
+        write=settings.write_timeout,
+        pool=settings.pool_timeout,
+    )
+
+
+class HTTPClientRegistry:
+    """
+    Un client HTTP (et donc un pool de connexions) par service externe
+
+    Les services non déclarés dans `settings.upstreams` partagent le client
+    `default`. Les clients sont créés au premier accès.
+    """
+
+    def __init__(self, settings: HTTPClientSettings):
+        self.settings = settings
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, InstrumentedTransport] = {}
+
+    def get(self, name: str = DEFAULT_UPSTREAM) -> httpx.AsyncClient:
+        """
+        Retourne le client d'un service externe
+
+        Args:
+            name: Nom du service tel que déclaré dans `upstreams`
+
+        Returns:
+            Client dédié au service, ou client par défaut s'il n'est pas déclaré
+        """
+        if name not in self.settings.upstreams:
+            name = DEFAULT_UPSTREAM
+        client = self._clients.get(name)
+        if client is None:
+            settings = self.settings.upstreams.get(name, self.settings.default)
+            transport = build_transport(settings, name)
+            client = httpx.AsyncClient(
+                base_url=settings.base_url,
+                transport=transport,
+                timeout=build_timeout(settings),
+            )
+            self._transports[name] = transport
+            self._clients[name] = client
+        return client
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Statistiques des pools, par service externe"""
+        return {name: transport.stats() for name, transport in self._transports.items()}
+
+    async def aclose(self) -> None:
+        """Ferme tous les clients et leurs connexions"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
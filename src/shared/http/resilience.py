@@ -0,0 +1,271 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Literal
+
+import structlog
+
+from src.shared.config.http_config import HTTPClientSettings, http_client_settings
+from src.shared.http.exceptions import BulkheadFullError, CircuitOpenError
+
+logger = structlog.get_logger()
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à fenêtre glissante (closed → open → half-open → closed)
+
+    - closed : les appels passent ; leurs résultats sont comptés sur les
+      `window_seconds` dernières secondes. Au-delà de `minimum_calls` appels,
+      une part d'échecs >= `failure_rate_threshold` ouvre le disjoncteur.
+    - open : les appels échouent immédiatement pendant `open_seconds`.
+    - half_open : `half_open_max_calls` appels d'essai sont autorisés ; un
+      succès referme le disjoncteur, un échec le rouvre.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 30.0,
+        minimum_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        # (timestamp, succès) des appels de la fenêtre courante
+        self._calls: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == "open"
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._state = "half_open"
+            self._trial_calls = 0
+            logger.info("circuit_breaker.half_open", upstream=self.name)
+        return self._state
+
+    def _prune(self, now: float) -> None:
+        calls = self._calls
+        horizon = now - self.window_seconds
+        while calls and calls[0][0] < horizon:
+            _, success = calls.popleft()
+            if not success:
+                self._failures -= 1
+
+    def allow(self) -> bool:
+        """True si un appel peut être tenté maintenant"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._trial_calls < self.half_open_max_calls:
+            self._trial_calls += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state == "half_open":
+            self._close()
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        if self._state == "half_open":
+            self._open()
+            return
+        self._record(False)
+        if self._state == "closed" and len(self._calls) >= self.minimum_calls:
+            if self._failures / len(self._calls) >= self.failure_rate_threshold:
+                self._open()
+
+    def record_ignored(self) -> None:
+        """Appel interrompu sans résultat (ex: annulation) : libère l'essai"""
+        if self._state == "half_open" and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def _record(self, success: bool) -> None:
+        now = self._clock()
+        self._prune(now)
+        self._calls.append((now, success))
+        if not success:
+            self._failures += 1
+
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = self._clock()
+        logger.warning(
+            "circuit_breaker.opened",
+            upstream=self.name,
+            calls=len(self._calls),
+            failures=self._failures,
+        )
+
+    def _close(self) -> None:
+        self._state = "closed"
+        self._calls.clear()
+        self._failures = 0
+        logger.info("circuit_breaker.closed", upstream=self.name)
+
+    def stats(self) -> dict[str, Any]:
+        self._prune(self._clock())
+        return {
+            "state": self.state,
+            "calls": len(self._calls),
+            "failures": self._failures,
+            "rejected": self.rejected,
+        }
+
+
+class Bulkhead:
+    """
+    Limite le nombre d'appels simultanés vers un hôte
+
+    Quand toutes les places sont prises, un appel attend au plus `max_wait`
+    secondes (0 : échec immédiat) puis lève BulkheadFullError.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = 50, max_wait: float = 0.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def __aenter__(self) -> "Bulkhead":
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+        elif self.max_wait <= 0:
+            self._reject()
+        else:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                self._reject()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        logger.warning(
+            "bulkhead.rejected", upstream=self.name, max_concurrent=self.max_concurrent
+        )
+        raise BulkheadFullError(f"Too many concurrent calls to {self.name}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Latences des derniers appels réussis vers un hôte"""
+
+    def __init__(self, window: int = 256):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.hedges = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        """Quantile `q` (entre 0 et 1) des latences, en secondes"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "hedges": self.hedges,
+        }
+
+
+class UpstreamGuard:
+    """Disjoncteur, bulkhead et latences d'un hôte"""
+
+    def __init__(self, name: str, settings: HTTPClientSettings):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            name,
+            failure_rate_threshold=settings.breaker_failure_rate,
+            window_seconds=settings.breaker_window_seconds,
+            minimum_calls=settings.breaker_minimum_calls,
+            open_seconds=settings.breaker_open_seconds,
+        )
+        self.bulkhead = Bulkhead(
+            name,
+            max_concurrent=settings.bulkhead_max_concurrent,
+            max_wait=settings.bulkhead_max_wait,
+        )
+        self.latency = LatencyTracker()
+
+    def check(self) -> None:
+        """
+        Vérifie que le disjoncteur laisse passer l'appel
+
+        Raises:
+            CircuitOpenError: Si le disjoncteur est ouvert
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.name}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "breaker": self.breaker.stats(),
+            "bulkhead": self.bulkhead.stats(),
+            "latency": self.latency.stats(),
+        }
+
+
+class UpstreamGuards:
+    """Un UpstreamGuard par hôte, créé au premier appel"""
+
+    def __init__(self, settings: HTTPClientSettings):
+        self.settings = settings
+        self._guards: dict[str, UpstreamGuard] = {}
+
+    def get(self, host: str) -> UpstreamGuard:
+        guard = self._guards.get(host)
+        if guard is None:
+            guard = self._guards[host] = UpstreamGuard(host, self.settings)
+        return guard
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {host: guard.stats() for host, guard in self._guards.items()}
+
+    def clear(self) -> None:
+        self._guards.clear()
+
+
+# Disjoncteurs et bulkheads globaux, par hôte
+upstream_guards = UpstreamGuards(http_client_settings)
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into a single execution
+
+    While a call for a key is in flight, later callers with the same key
+    await its result instead of starting their own. The shared call runs in
+    its own task, so a caller being cancelled does not cancel it for the
+    others. Every caller receives the same result object.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` for `key`, or join the call already in flight
+
+        Args:
+            key: Identity of the call (e.g. the full request URL)
+            fn: Coroutine function doing the actual work
+
+        Returns:
+            Result of the shared call; its exception is raised to every caller
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._calls.pop(key, None)
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,172 @@
+import json
+import queue
+import sys
+import threading
+from typing import Any, Literal, Optional, TextIO
+
+OverflowPolicy = Literal["drop_newest", "drop_oldest", "block"]
+
+# Marks the end of the queue for the writer thread
+_STOP = object()
+
+
+class QueueLogSink:
+    """
+    Bounded queue of log events rendered and written by a background thread
+
+    The hot path only enqueues the event dict. The writer thread renders
+    events to JSON lines and writes them in batches of up to `batch_size`.
+    When the queue is full, `overflow_policy` decides what happens:
+
+    - drop_newest: the new event is dropped
+    - drop_oldest: the oldest queued event is dropped to make room
+    - block: the caller waits until there is room (backpressure)
+
+    An event that cannot be rendered, or a batch the stream rejects, is
+    counted in `errors` and skipped: the writer thread keeps draining the
+    queue, so "block" never waits on a dead writer.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO = sys.stdout,
+        maxsize: int = 10_000,
+        batch_size: int = 256,
+        overflow_policy: OverflowPolicy = "drop_newest",
+    ):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+
+    def enqueue(self, event_dict: dict[str, Any]) -> None:
+        """Queue an event without rendering it"""
+        try:
+            self._queue.put_nowait(event_dict)
+        except queue.Full:
+            if self.overflow_policy == "block":
+                self._queue.put(event_dict)
+            elif self.overflow_policy == "drop_oldest":
+                self._drop_oldest(event_dict)
+                return
+            else:
+                self.dropped += 1
+                return
+        self.enqueued += 1
+
+    def _drop_oldest(self, event_dict: dict[str, Any]) -> None:
+        try:
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(event_dict)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    @staticmethod
+    def render(event_dict: dict[str, Any]) -> str:
+        return json.dumps(event_dict, default=str, ensure_ascii=False)
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            lines = []
+            for event_dict in batch:
+                try:
+                    lines.append(self.render(event_dict))
+                except Exception:
+                    self.errors += 1
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                    self.written += len(lines)
+                except Exception:
+                    self.errors += len(lines)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write(batch)
+            if stop:
+                self._queue.task_done()
+                return
+
+    def start(self) -> None:
+        """Start the writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self) -> None:
+        """Wait until every queued event has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write the remaining events and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+        }
+
+
+class QueueLogger:
+    """structlog logger handing event dicts over to a QueueLogSink"""
+
+    def __init__(self, sink: QueueLogSink, name: str = ""):
+        self.sink = sink
+        self.name = name
+
+    def msg(self, **event_dict: Any) -> None:
+        self.sink.enqueue(event_dict)
+
+    debug = info = warning = warn = error = critical = exception = log = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory for QueueLogger"""
+
+    def __init__(self, sink: QueueLogSink):
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.sink, name=args[0] if args else "")
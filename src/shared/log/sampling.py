@@ -0,0 +1,47 @@
+import logging
+import random
+from typing import Callable
+
+from src.shared.config.logging_config import logging_settings
+
+
+class LogSampler:
+    """Decides whether a sampled log event is emitted"""
+
+    def __init__(self, rate: float, rand: Callable[[], float] = random.random):
+        self.rate = rate
+        self._rand = rand
+
+    def sample(self) -> bool:
+        if self.rate >= 1.0:
+            return True
+        if self.rate <= 0.0:
+            return False
+        return self._rand() < self.rate
+
+
+def _always_enabled(level: int) -> bool:
+    return True
+
+
+_level_check: Callable[[int], bool] = _always_enabled
+
+
+def set_level_check(check: Callable[[int], bool]) -> None:
+    """Set the function used by is_log_enabled (called by configure_structlog)"""
+    global _level_check
+    _level_check = check
+
+
+def is_log_enabled(level: int = logging.INFO) -> bool:
+    """
+    True if events at `level` are emitted by the current configuration
+
+    Lets hot paths skip building expensive log arguments for disabled levels.
+    """
+    return _level_check(level)
+
+
+# Samplers for hot-path logs
+request_sampler = LogSampler(logging_settings.request_sample_rate)
+order_log_sampler = LogSampler(logging_settings.order_log_sample_rate)
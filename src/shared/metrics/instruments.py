@@ -0,0 +1,32 @@
+from src.shared.config.metrics_config import metrics_settings
+from src.shared.metrics.registry import MetricsRegistry
+
+# Registre global des métriques exposées sur /metrics
+metrics_registry = MetricsRegistry(metrics_settings.multiprocess_dir)
+
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP, par route et statut",
+    ("method", "route", "status"),
+)
+
+http_requests_in_flight = metrics_registry.gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement"
+)
+
+orders_created_total = metrics_registry.counter(
+    "orders_created_total", "Commandes créées, à l'unité ou par lot", ("mode",)
+)
+
+outbound_request_duration_seconds = metrics_registry.histogram(
+    "outbound_request_duration_seconds",
+    "Durée des appels HTTP sortants, par hôte et résultat",
+    ("upstream", "outcome"),
+)
+
+jwt_verify_duration_seconds = metrics_registry.histogram(
+    "jwt_verify_duration_seconds",
+    "Durée de vérification des tokens JWT (hors cache)",
+    ("result",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
@@ -0,0 +1,381 @@
+import asyncio
+import json
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+# Buckets de latence (en secondes), de 1 ms à 10 s
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shard:
+    """Valeurs d'un thread : seul ce thread les modifie"""
+
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class _Child:
+    """
+    Série d'une métrique pour une combinaison de labels
+
+    Chaque thread écrit dans son propre shard (créé à sa première mesure) :
+    l'enregistrement ne prend aucun verrou, et la lecture additionne les
+    shards au moment du scrape.
+    """
+
+    __slots__ = ("_size", "_shards", "_local", "_lock")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._shards: list[_Shard] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> _Shard:
+        shard = _Shard(self._size)
+        with self._lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _totals(self) -> tuple[list[int], float]:
+        counts = [0] * self._size
+        total = 0.0
+        for shard in list(self._shards):
+            for i, count in enumerate(shard.counts):
+                counts[i] += count
+            total += shard.sum
+        return counts, total
+
+
+class CounterChild(_Child):
+    def __init__(self) -> None:
+        super().__init__(0)
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.sum += amount
+
+    def value(self) -> float:
+        return self._totals()[1]
+
+
+class GaugeChild(CounterChild):
+    """Jauge incrémentale (inc / dec), par exemple un nombre de requêtes en cours"""
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class HistogramChild(_Child):
+    __slots__ = ("_bounds",)
+
+    def __init__(self, bounds: Sequence[float]):
+        # Un compteur par borne, plus le bucket +Inf
+        super().__init__(len(bounds) + 1)
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.counts[bisect_left(self._bounds, value)] += 1
+        shard.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Compteurs par bucket (non cumulés), somme et nombre d'observations"""
+        counts, total = self._totals()
+        return {"counts": counts, "sum": total, "count": sum(counts)}
+
+
+class Metric:
+    """Métrique nommée, déclinée en séries par combinaison de labels"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lookup: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._default = None if self.labelnames else self.labels()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any) -> Any:
+        """
+        Série associée aux valeurs de labels (créée au premier appel)
+
+        Args:
+            *values: Valeurs des labels, dans l'ordre de `labelnames`
+        """
+        # Chemin rapide : valeurs brutes déjà vues, sans conversion en str
+        child = self._lookup.get(values)
+        if child is None:
+            child = self._resolve(values)
+        return child
+
+    def _resolve(self, values: tuple) -> Any:
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} attend les labels {self.labelnames}")
+        with self._lock:
+            child = self._children.setdefault(key, self._new_child())
+            self._lookup[values] = child
+        return child
+
+    def collect(self) -> dict[str, Any]:
+        """État sérialisable de la métrique (pour le rendu ou le mode multiprocess)"""
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                [list(key), self._sample(child)]
+                for key, child in list(self._children.items())
+            ],
+        }
+
+    def _sample(self, child: Any) -> Any:
+        return child.value()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def collect(self) -> dict[str, Any]:
+        collected = super().collect()
+        collected["buckets"] = list(self.buckets)
+        return collected
+
+    def _sample(self, child: HistogramChild) -> dict[str, Any]:
+        return child.snapshot()
+
+
+class MetricsRegistry:
+    """
+    Ensemble des métriques exposées sur /metrics
+
+    En mode multiprocess (plusieurs workers uvicorn), chaque processus écrit
+    régulièrement l'état de ses métriques dans `multiprocess_dir` ; le rendu
+    additionne les fichiers de tous les processus. Les jauges des processus
+    arrêtés sont ignorées, leurs compteurs et histogrammes sont conservés.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None):
+        self.multiprocess_dir = multiprocess_dir
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collect(self) -> dict[str, dict[str, Any]]:
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+    # Mode multiprocess
+
+    def _snapshot_path(self, pid: int) -> Path:
+        return Path(self.multiprocess_dir) / f"metrics-{pid}.json"
+
+    def write_snapshot(self) -> None:
+        """Écrit l'état des métriques de ce processus (remplacement atomique)"""
+        if self.multiprocess_dir is None:
+            return
+        path = self._snapshot_path(os.getpid())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.collect()), encoding="utf-8")
+        os.replace(tmp, path)
+
+    async def run_snapshots(self, interval: float) -> None:
+        """Écrit l'état des métriques toutes les `interval` secondes"""
+        while True:
+            await asyncio.to_thread(self.write_snapshot)
+            await asyncio.sleep(interval)
+
+    def _collect_all(self) -> dict[str, dict[str, Any]]:
+        merged = self.collect()
+        if self.multiprocess_dir is None:
+            return merged
+
+        own = self._snapshot_path(os.getpid())
+        for path in sorted(Path(self.multiprocess_dir).glob("metrics-*.json")):
+            if path == own:
+                continue
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+                alive = _pid_alive(int(path.stem.split("-", 1)[1]))
+            except (OSError, ValueError):
+                continue
+            for name, collected in snapshot.items():
+                if name not in merged:
+                    continue
+                if collected["type"] == "gauge" and not alive:
+                    continue
+                _merge_samples(merged[name], collected["samples"])
+        return merged
+
+    def render(self) -> str:
+        """Métriques au format texte de Prometheus"""
+        lines: list[str] = []
+        for name, collected in self._collect_all().items():
+            lines.append(f"# HELP {name} {_escape_help(collected['help'])}")
+            lines.append(f"# TYPE {name} {collected['type']}")
+            labelnames = collected["labelnames"]
+            for key, value in collected["samples"]:
+                labels = list(zip(labelnames, key))
+                if collected["type"] == "histogram":
+                    lines.extend(
+                        _histogram_lines(name, labels, collected["buckets"], value)
+                    )
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_samples(target: dict[str, Any], samples: Iterable[list]) -> None:
+    index = {tuple(key): i for i, (key, _value) in enumerate(target["samples"])}
+    for key, value in samples:
+        i = index.get(tuple(key))
+        if i is None:
+            index[tuple(key)] = len(target["samples"])
+            target["samples"].append([key, value])
+            continue
+        current = target["samples"][i][1]
+        if isinstance(current, dict):
+            target["samples"][i][1] = {
+                "counts": [a + b for a, b in zip(current["counts"], value["counts"])],
+                "sum": current["sum"] + value["sum"],
+                "count": current["count"] + value["count"],
+            }
+        else:
+            target["samples"][i][1] = current + value
+
+
+def _histogram_lines(
+    name: str, labels: list[tuple[str, str]], buckets: list[float], value: dict
+) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(buckets + ["+Inf"], value["counts"]):
+        cumulative += count
+        le = bound if bound == "+Inf" else _number(bound)
+        lines.append(f"{name}_bucket{_labels(labels + [('le', le)])} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(value['sum'])}")
+    lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+    return lines
+
+
+def _labels(labels: list[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
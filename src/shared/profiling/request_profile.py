@@ -0,0 +1,128 @@
+import hashlib
+import hmac
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+# En-tête signé demandant le profilage d'une requête : "<expiration>.<signature>"
+PROFILE_HEADER = "X-Profile"
+
+# Avec la valeur "response", le profil remplace la réponse (requêtes signées)
+PROFILE_OUTPUT_HEADER = "X-Profile-Output"
+
+
+@dataclass
+class Span:
+    """Étape chronométrée d'une requête, relative au début du profil"""
+
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+class RequestProfile:
+    """Étapes chronométrées d'une requête profilée"""
+
+    def __init__(self, correlation_id: Optional[str], method: str, path: str):
+        self.correlation_id = correlation_id
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.spans: list[Span] = []
+        # Instants repères posés par la route (début du handler, fin de l'endpoint)
+        self.marks: dict[str, float] = {}
+
+    def add_span(self, name: str, started: float, ended: float) -> None:
+        self.spans.append(
+            Span(
+                name=name,
+                start_ms=round((started - self.started) * 1000, 3),
+                duration_ms=round((ended - started) * 1000, 3),
+            )
+        )
+
+    def finish(self, status_code: Optional[int]) -> None:
+        self.status_code = status_code
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 3)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "correlation_id": self.correlation_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "spans": [asdict(span) for span in self.spans],
+        }
+
+
+# Profil de la requête en cours (None si elle n'est pas profilée)
+profile_context: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+
+class span:
+    """
+    Chronomètre un bloc dans le profil de la requête en cours
+
+    Sans profil actif, le bloc s'exécute sans mesure.
+
+    Exemple:
+        with span("auth"):
+            ...
+    """
+
+    __slots__ = ("name", "profile", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self.profile = profile_context.get()
+        if self.profile is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.profile is not None:
+            self.profile.add_span(self.name, self.started, time.perf_counter())
+
+
+def sign_profile_request(
+    secret: str, ttl_seconds: float = 300, now: Optional[float] = None
+) -> str:
+    """
+    Valeur d'en-tête X-Profile valable `ttl_seconds` secondes
+
+    Args:
+        secret: Secret partagé (PROFILING_SECRET)
+        ttl_seconds: Durée de validité de l'en-tête
+        now: Timestamp Unix courant (pour les tests)
+    """
+    expires = str(int((time.time() if now is None else now) + ttl_seconds))
+    return f"{expires}.{_signature(secret, expires)}"
+
+
+def verify_profile_request(
+    value: str, secret: str, max_ttl_seconds: float, now: Optional[float] = None
+) -> bool:
+    """
+    Vérifie un en-tête X-Profile : signature valide, non expiré, et expiration
+    à moins de `max_ttl_seconds` (un en-tête divulgué ne sert pas indéfiniment)
+    """
+    expires, _, signature = value.partition(".")
+    try:
+        remaining = int(expires) - (time.time() if now is None else now)
+    except ValueError:
+        return False
+    if not 0 < remaining <= max_ttl_seconds:
+        return False
+    return hmac.compare_digest(signature, _signature(secret, expires))
+
+
+def _signature(secret: str, expires: str) -> str:
+    return hmac.new(secret.encode(), expires.encode(), hashlib.sha256).hexdigest()
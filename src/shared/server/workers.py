@@ -0,0 +1,23 @@
+import multiprocessing
+
+import uvicorn
+
+
+def worker_processes() -> int:
+    """
+    Best-effort number of uvicorn worker processes serving the application
+
+    uvicorn starts each worker (--workers, or WEB_CONCURRENCY as its default)
+    in a spawned process whose arguments include the effective Config. A
+    single-process server, the child process of --reload, or any other
+    supervisor counts as one: the startup check relies on the declared
+    WEB_CONCURRENCY setting and only uses this to catch an undeclared
+    `uvicorn --workers N`.
+    """
+    if multiprocessing.parent_process() is None:
+        return 1
+    kwargs = getattr(multiprocessing.current_process(), "_kwargs", {})
+    config = kwargs.get("config")
+    if not isinstance(config, uvicorn.Config) or config.reload:
+        return 1
+    return config.workers
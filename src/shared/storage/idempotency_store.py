@@ -0,0 +1,156 @@
+import asyncio
+import sqlite3
+import time
+from typing import Optional
+
+from src.shared.storage.sqlite_pool import SqlitePool, SynchronousMode
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS idempotency_keys (
+        key TEXT PRIMARY KEY,
+        expires_at REAL NOT NULL,
+        fingerprint BLOB,
+        status_code INTEGER,
+        body BLOB
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idempotency_keys_expires_at "
+    "ON idempotency_keys (expires_at)",
+)
+
+_SELECT = (
+    "SELECT expires_at, fingerprint, status_code, body "
+    "FROM idempotency_keys WHERE key = ?"
+)
+_CLAIM = "INSERT OR REPLACE INTO idempotency_keys (key, expires_at) VALUES (?, ?)"
+_COMPLETE = (
+    "UPDATE idempotency_keys "
+    "SET expires_at = ?, fingerprint = ?, status_code = ?, body = ? WHERE key = ?"
+)
+_RELEASE = "DELETE FROM idempotency_keys WHERE key = ? AND status_code IS NULL"
+_PURGE = "DELETE FROM idempotency_keys WHERE expires_at <= ?"
+
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    with connection:
+        for statement in _SCHEMA:
+            connection.execute(statement)
+
+
+def _lookup(connection: sqlite3.Connection, key: str) -> Optional[tuple]:
+    return connection.execute(_SELECT, (key,)).fetchone()
+
+
+def _stored_response(row: tuple) -> Optional[tuple[bytes, int, bytes]]:
+    expires_at, fingerprint, status_code, body = row
+    if status_code is None:
+        return None
+    return fingerprint, status_code, body
+
+
+def _claim(
+    connection: sqlite3.Connection, key: str, now: float, lease: float
+) -> tuple[bool, Optional[tuple[bytes, int, bytes]]]:
+    """Return (claimed, stored response) for `key`"""
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        row = connection.execute(_SELECT, (key,)).fetchone()
+        if row is None or row[0] <= now:
+            connection.execute(_CLAIM, (key, now + lease))
+            return True, None
+    return False, _stored_response(row)
+
+
+def _complete(
+    connection: sqlite3.Connection,
+    key: str,
+    now: float,
+    expires_at: float,
+    response: tuple[bytes, int, bytes],
+) -> None:
+    with connection:
+        connection.execute(_COMPLETE, (expires_at, *response, key))
+        connection.execute(_PURGE, (now,))
+
+
+def _release(connection: sqlite3.Connection, key: str) -> None:
+    with connection:
+        connection.execute(_RELEASE, (key,))
+
+
+class SqliteIdempotencyStore:
+    """
+    Idempotency keys shared by the processes of a host, in a SQLite table
+
+    A process claims a key before executing the request; the claim is a
+    lease, so a key held by a process that died becomes claimable again
+    after `lease_seconds`. Other processes asking for the key meanwhile
+    poll until the response is stored, then replay it: polling reads the
+    key on a reader connection, with a backoff from `poll_interval` up to
+    `max_poll_interval`, and only takes the write lock to claim a key that
+    is missing or whose lease has expired, so waiters do not compete with
+    the writes of the process holding the key. Expired keys are purged when
+    responses are stored.
+
+    Responses are stored as (fingerprint, status code, body) tuples.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 30.0,
+        poll_interval: float = 0.01,
+        max_poll_interval: float = 0.2,
+        synchronous: SynchronousMode = "NORMAL",
+        clock=time.time,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._clock = clock
+        self._pool = SqlitePool(path, readers=1, synchronous=synchronous)
+
+    async def open(self) -> None:
+        await self._pool.write(_create_schema)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._pool.close)
+
+    async def claim(self, key: str) -> Optional[tuple[bytes, int, bytes]]:
+        """
+        Claim `key` for this process, or wait for the response stored for it
+
+        Returns:
+            None once the key is claimed (the caller executes the request,
+            then calls complete() or release()), otherwise the response
+            stored by the process that executed it
+        """
+        delay = self.poll_interval
+        while True:
+            row = await self._pool.read(_lookup, key)
+            now = self._clock()
+            if row is None or row[0] <= now:
+                # Looks claimable: _claim checks again under the write lock
+                claimed, response = await self._pool.write(
+                    _claim, key, now, self.lease_seconds
+                )
+                if claimed or response is not None:
+                    return response
+            else:
+                response = _stored_response(row)
+                if response is not None:
+                    return response
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    async def complete(
+        self, key: str, response: tuple[bytes, int, bytes], ttl_seconds: float
+    ) -> None:
+        now = self._clock()
+        await self._pool.write(_complete, key, now, now + ttl_seconds, response)
+
+    async def release(self, key: str) -> None:
+        """Give up a claim after a failed request, so a retry executes again"""
+        await self._pool.write(_release, key)
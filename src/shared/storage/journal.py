@@ -0,0 +1,209 @@
+import asyncio
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+FsyncPolicy = Literal["always", "group", "periodic", "never"]
+
+# Record framing: payload length and CRC32 of the payload, then the payload
+FRAME = struct.Struct("<II")
+
+
+def encode_record(payload: bytes) -> bytes:
+    """Frame a payload as stored in journal and snapshot files"""
+    return FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class JournalCorruptedError(Exception):
+    """A journal file is damaged somewhere other than its last record"""
+
+
+class Journal:
+    """
+    Append-only file of length-prefixed, checksummed records
+
+    Durability depends on `fsync_policy`:
+
+    - always: appends are written immediately, and every flush() fsyncs in
+      a worker thread before returning (one fsync per caller, not shared);
+    - group: appends are buffered in memory; flush() writes and fsyncs
+      everything buffered so far in a worker thread, and concurrent callers
+      share that fsync (group commit). Records appended while an fsync is in
+      progress go into the next one;
+    - periodic: appends are written immediately, the owner calls sync()
+      periodically from the background;
+    - never: appends are written immediately, the OS decides when to sync.
+
+    Callers acknowledge a write once flush() has returned; with the group
+    policy records are only on disk after that.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_policy: FsyncPolicy = "group",
+        group_commit_delay: float = 0.0,
+    ):
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.group_commit_delay = group_commit_delay
+        self._file = open(path, "ab", buffering=0)
+        self._buffer = bytearray()
+        self._appended = 0
+        self._durable = 0
+        self._commit_task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        self.fsyncs = 0
+
+    def append(self, payload: bytes) -> None:
+        self.append_many((payload,))
+
+    def append_many(self, payloads: Iterable[bytes]) -> None:
+        if self._error is not None:
+            raise self._error
+        data = bytearray()
+        count = 0
+        for payload in payloads:
+            data += encode_record(payload)
+            count += 1
+        self._appended += count
+
+        if self.fsync_policy == "group":
+            self._buffer += data
+            return
+        self._write(data)
+        if self.fsync_policy != "always":
+            self._durable = self._appended
+
+    async def flush(self) -> None:
+        """Wait until every record appended so far is durable per the policy"""
+        target = self._appended
+        if self.fsync_policy == "always":
+            if self._durable < target:
+                await self._sync_always(target)
+            return
+        while self._durable < target:
+            if self._error is not None:
+                raise self._error
+            if self._commit_task is None:
+                self._commit_task = asyncio.ensure_future(self._commit())
+            await asyncio.shield(self._commit_task)
+
+    async def _commit(self) -> None:
+        try:
+            if self.group_commit_delay:
+                await asyncio.sleep(self.group_commit_delay)
+            data, self._buffer = self._buffer, bytearray()
+            upto = self._appended
+            await asyncio.to_thread(self._write_and_sync, data)
+            self._durable = upto
+        except BaseException as e:
+            # Part of the batch may be on disk: refuse further writes
+            self._error = e
+            logger.error("journal.commit_failed", path=str(self.path), error=str(e))
+            raise
+        finally:
+            self._commit_task = None
+
+    async def _sync_always(self, target: int) -> None:
+        if self._error is not None:
+            raise self._error
+        try:
+            await asyncio.to_thread(self._sync)
+        except BaseException as e:
+            self._error = e
+            logger.error("journal.commit_failed", path=str(self.path), error=str(e))
+            raise
+        self._durable = max(self._durable, target)
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = self._file.write(view)
+            view = view[written:]
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+
+    def _write_and_sync(self, data: bytes) -> None:
+        if data:
+            self._write(data)
+        self._sync()
+
+    def sync(self) -> None:
+        """fsync what has been written (periodic policy)"""
+        self._sync()
+
+    async def close(self) -> None:
+        """Make every appended record durable and close the file"""
+        try:
+            await self.flush()
+            if self.fsync_policy in ("periodic", "never"):
+                await asyncio.to_thread(self.sync)
+        finally:
+            self._file.close()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "appended": self._appended,
+            "durable": self._durable,
+            "buffered_bytes": len(self._buffer),
+            "fsyncs": self.fsyncs,
+        }
+
+
+class RecordReader:
+    """
+    Iterate over the records of a journal or snapshot file through mmap
+
+    Yields (buffer, offset, length) so payloads can be decoded in place with
+    struct.unpack_from. Iteration stops at the first incomplete or corrupted
+    record; `valid_end` is then the size of the intact prefix of the file.
+    """
+
+    def __init__(self, path: Path, start: int = 0):
+        self.path = path
+        self.start = start
+        self.valid_end = start
+        self.size = 0
+
+    def __iter__(self) -> Iterator[tuple[mmap.mmap, int, int]]:
+        with open(self.path, "rb") as file:
+            self.size = os.fstat(file.fileno()).st_size
+            if self.size <= self.start:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                offset = self.start
+                while offset + FRAME.size <= self.size:
+                    length, crc = FRAME.unpack_from(buffer, offset)
+                    payload_start = offset + FRAME.size
+                    end = payload_start + length
+                    if end > self.size:
+                        break
+                    if zlib.crc32(buffer[payload_start:end]) != crc:
+                        break
+                    yield buffer, payload_start, length
+                    offset = end
+                    self.valid_end = offset
+
+    @property
+    def truncated(self) -> bool:
+        """True if bytes after the last intact record were ignored"""
+        return self.valid_end < self.size
+
+
+def fsync_directory(directory: Path) -> None:
+    """Persist renames and file creations in `directory`"""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Literal, TypeVar
+
+T = TypeVar("T")
+
+SynchronousMode = Literal["OFF", "NORMAL", "FULL"]
+
+
+class SqlitePool:
+    """
+    SQLite connections for asyncio code, one per thread
+
+    Queries run off the event loop: read() on a pool of reader threads,
+    write() on a single writer thread, since SQLite allows one writer at a
+    time. The database is in WAL mode so readers are never blocked by the
+    writer.
+
+    Each thread keeps its own connection, and each connection keeps its
+    compiled statements (sqlite3 statement cache), so queries sent with the
+    same SQL text and bound parameters are prepared once per connection.
+    connection() returns the connection of the calling thread, for the few
+    synchronous lookups that run on the event loop itself.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        readers: int = 4,
+        synchronous: SynchronousMode = "FULL",
+        busy_timeout: float = 5.0,
+    ):
+        self.path = path
+        self.synchronous = synchronous
+        self.busy_timeout = busy_timeout
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="sqlite-read")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="sqlite-write")
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _connect(self) -> sqlite3.Connection:
+        # Only used by the thread that created it, but closed by close()
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _call(self, fn: Callable[..., T], args: tuple) -> T:
+        return fn(self.connection(), *args)
+
+    async def read(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(connection, *args) on a reader thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._call, fn, args)
+
+    async def write(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(connection, *args) on the writer thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, self._call, fn, args)
+
+    def write_sync(self, fn: Callable[..., T], *args) -> T:
+        """write(), blocking the caller until it is done"""
+        return self._writer.submit(self._call, fn, args).result()
+
+    def close(self) -> None:
+        """Wait for running queries, then close every connection"""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
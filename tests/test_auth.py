@@ -1,7 +1,12 @@
+import jwt
 import pytest
 from fastapi.testclient import TestClient
 
+from src.api.dependencies.auth import AuthDependencies
 from src.main import app
+from src.shared.auth.jwt_service import JWTService
+from src.shared.auth.scopes import ScopeRegistry
+from src.shared.auth.token_cache import VerifiedTokenCache
 
 
 @pytest.fixture
@@ -62,3 +67,132 @@ def test_protected_route_with_valid_token(client, auth_token):
     # mais ne devrait pas échouer sur l'authentification (401/403)
     assert response.status_code != 401
     assert response.status_code != 403
+
+
+def test_token_cache_hits_on_reused_token(client, auth_token):
+    """Test que le second appel avec le même token utilise le cache"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    before = client.get("/auth/token-cache/stats").json()
+
+    client.get("/orders", headers=headers)
+    client.get("/orders", headers=headers)
+
+    after = client.get("/auth/token-cache/stats").json()
+    assert after["enabled"] is True
+    assert after["hits"] - before["hits"] >= 1
+
+
+def test_token_cache_lru_and_expiry():
+    """Test de l'éviction LRU et de l'expiration des entrées"""
+    now = [1000.0]
+    cache = VerifiedTokenCache(max_size=2, ttl_seconds=60, clock=lambda: now[0])
+
+    cache.put("a", "user-a", expires_at=2000)
+    cache.put("b", "user-b", expires_at=1010)
+    assert cache.get("a") == "user-a"
+    cache.put("c", "user-c", expires_at=2000)
+
+    # "b" était l'entrée la moins récemment utilisée
+    assert cache.get("b") is None
+    assert cache.get("c") == "user-c"
+
+    # L'entrée expire au ttl (1060) avant son exp (2000)
+    now[0] = 1060.0
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 2,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 2,
+    }
+
+
+def test_token_cache_does_not_outlive_exp():
+    """Test qu'une entrée n'est plus retournée après l'exp du token"""
+    now = [1000.0]
+    cache = VerifiedTokenCache(clock=lambda: now[0])
+    cache.put("token", "user", expires_at=1005)
+
+    assert cache.get("token") == "user"
+    now[0] = 1005.0
+    assert cache.get("token") is None
+
+
+@pytest.mark.parametrize("ttl_seconds, cached", [(None, False), (60.0, True)])
+def test_token_without_exp_is_authenticated(ttl_seconds, cached):
+    """Test qu'un token valide sans `exp` est accepté (caché au plus le TTL)"""
+    now = [1000.0]
+    cache = VerifiedTokenCache(ttl_seconds=ttl_seconds, clock=lambda: now[0])
+    auth = AuthDependencies(JWTService("secret"), token_cache=cache)
+    token = jwt.encode(
+        {"user_id": "issuer-user", "scopes": ["orders:read"], "type": "access"},
+        "secret",
+    )
+
+    user = auth._authenticate(token)
+
+    assert user.user_id == "issuer-user"
+    assert (cache.get(token) is user) is cached
+    now[0] += 60
+    assert cache.get(token) is None
+
+
+def test_scope_registry_masks_and_wildcards():
+    """Test de la compilation des scopes en masques"""
+    registry = ScopeRegistry(["orders:read", "orders:write", "products:read"])
+    read = registry.compile(["orders:read"])
+    read_write = registry.compile(["orders:read", "orders:write"])
+
+    assert registry.has_scopes(registry.to_mask(["orders:read"]), read)
+    assert not registry.has_scopes(registry.to_mask(["orders:read"]), read_write)
+    assert registry.has_scopes(registry.to_mask(["orders:*"]), read_write)
+    assert not registry.has_scopes(
+        registry.to_mask(["orders:*"]), registry.compile(["products:read"])
+    )
+    assert registry.has_scopes(registry.to_mask(["*"]), registry.compile(["orders:*"]))
+    assert registry.to_mask(["unknown:scope"]) == 0
+
+
+def test_scope_registry_rejects_wildcard_registration():
+    """Test qu'un wildcard ne peut pas être enregistré comme scope"""
+    with pytest.raises(ValueError):
+        ScopeRegistry().register("orders:*")
+
+
+def test_scope_registry_rejects_empty_requirements():
+    """Test qu'un wildcard sans scope enregistré ne requiert pas « rien »"""
+    registry = ScopeRegistry(["orders:read"])
+
+    with pytest.raises(ValueError):
+        registry.compile(["products:*"])
+    with pytest.raises(ValueError):
+        registry.compile([])
+    with pytest.raises(ValueError):
+        ScopeRegistry().compile(["*"])
+
+
+def test_wildcard_token_grants_orders_scopes(client):
+    """Test d'accès aux routes orders avec un token `orders:*`"""
+    token = client.post(
+        "/auth/token", json={"user_id": "admin", "scopes": ["orders:*"]}
+    ).json()["access_token"]
+
+    response = client.get("/orders", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+
+
+def test_missing_scope_is_forbidden(client):
+    """Test qu'un token sans le scope requis reçoit un 403"""
+    token = client.post(
+        "/auth/token", json={"user_id": "reader", "scopes": ["orders:read"]}
+    ).json()["access_token"]
+
+    response = client.post(
+        "/orders",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"nom_client": "hasna", "montant": 1.0, "devise": "EUR"},
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,111 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from structlog.testing import capture_logs
+
+from src.api.middleware.correlation_id import (
+    CorrelationIdMiddleware,
+    get_correlation_id,
+)
+from src.shared.log.sampling import LogSampler
+
+
+def build_client(**middleware_options) -> TestClient:
+    """Application minimale avec le middleware de correlation ID"""
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware, **middleware_options)
+
+    @app.get("/context")
+    async def context():
+        return {"correlation_id": get_correlation_id()}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=500, detail="boom")
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def client():
+    return build_client()
+
+
+def test_correlation_id_is_propagated(client):
+    """Test que l'ID reçu est exposé dans le contexte et la réponse"""
+    response = client.get("/context", headers={"X-Correlation-ID": "abc-123"})
+
+    assert response.headers["X-Correlation-ID"] == "abc-123"
+    assert response.json() == {"correlation_id": "abc-123"}
+
+
+def test_correlation_id_is_generated(client):
+    """Test de génération d'un ID quand l'en-tête est absent"""
+    response = client.get("/context")
+
+    correlation_id = response.headers["X-Correlation-ID"]
+    assert correlation_id.startswith("req_")
+    assert len(correlation_id) == len("req_") + 12
+    assert response.json() == {"correlation_id": correlation_id}
+
+
+def test_streaming_response_keeps_header_and_body(client):
+    """Test que les réponses en streaming passent sans être altérées"""
+    response = client.get("/stream", headers={"X-Correlation-ID": "stream-1"})
+
+    assert response.headers["X-Correlation-ID"] == "stream-1"
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+
+
+def test_unsampled_success_is_not_logged():
+    """Test qu'une requête réussie non échantillonnée n'est pas journalisée"""
+    client = build_client(sampler=LogSampler(0.0))
+
+    with capture_logs() as logs:
+        client.get("/context")
+
+    assert [log["event"] for log in logs] == []
+
+
+def test_errors_are_always_logged_with_details():
+    """Test qu'une erreur est journalisée même si elle n'est pas échantillonnée"""
+    client = build_client(sampler=LogSampler(0.0))
+
+    with capture_logs() as logs:
+        client.get("/fail?x=1", headers={"X-Correlation-ID": "err-1"})
+
+    (log,) = logs
+    assert log["event"] == "request.end"
+    assert log["status_code"] == 500
+    assert log["correlation_id"] == "err-1"
+    assert log["query_params"] == {"x": "1"}
+
+
+def test_slow_requests_are_always_logged():
+    """Test qu'une requête plus lente que le seuil est journalisée"""
+    client = build_client(sampler=LogSampler(0.0), slow_request_threshold_ms=0)
+
+    with capture_logs() as logs:
+        client.get("/context")
+
+    assert [(log["event"], log["slow"]) for log in logs] == [("request.end", True)]
+
+
+def test_sampled_requests_log_start_and_end():
+    """Test qu'une requête échantillonnée produit request.start et request.end"""
+    client = build_client(sampler=LogSampler(1.0))
+
+    with capture_logs() as logs:
+        client.get("/context")
+
+    assert [log["event"] for log in logs] == ["request.start", "request.end"]
+    assert "duration_ms" in logs[1]
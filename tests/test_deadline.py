@@ -0,0 +1,220 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middleware.correlation_id import CorrelationIdMiddleware
+from src.main import app
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import safe_get
+from src.shared.http.deadline import deadline_context, parse_deadline, remaining_budget
+from src.shared.http.exceptions import DeadlineExceededError, NetworkError
+from src.shared.http.resilience import UpstreamGuards, upstream_guards
+from src.shared.http.single_flight import SingleFlight
+
+UPSTREAM_URL = "https://upstream.test/data"
+
+
+def make_settings(**overrides):
+    options = dict(retry_attempts=3, retry_backoff_seconds=0.01)
+    options.update(overrides)
+    return HTTPClientSettings(**options)
+
+
+async def get(client, settings, guards=None):
+    return await safe_get(
+        client,
+        UPSTREAM_URL,
+        guards=guards or UpstreamGuards(settings),
+        cache=None,
+        single_flight=None,
+        settings=settings,
+    )
+
+
+def set_budget(seconds):
+    deadline_context.set(time.monotonic() + seconds)
+
+
+class TestParseDeadline:
+    def test_budget_headers(self):
+        now = time.monotonic()
+        assert parse_deadline({}) is None
+        assert parse_deadline({"X-Request-Timeout": "250"}) == pytest.approx(
+            now + 0.25, abs=0.05
+        )
+        assert parse_deadline(
+            {"X-Request-Deadline": str(time.time() + 2)}
+        ) == pytest.approx(now + 2, abs=0.05)
+        assert parse_deadline({"X-Request-Timeout": "abc"}) is None
+
+    def test_max_budget(self):
+        now = time.monotonic()
+        assert parse_deadline({}, max_budget=1.0) == pytest.approx(now + 1, abs=0.05)
+        assert parse_deadline(
+            {"X-Request-Timeout": "5000"}, max_budget=1.0
+        ) == pytest.approx(now + 1, abs=0.05)
+
+    def test_middleware_stores_deadline(self):
+        test_app = FastAPI()
+        test_app.add_middleware(CorrelationIdMiddleware)
+
+        @test_app.get("/budget")
+        async def budget():
+            return {"remaining": remaining_budget()}
+
+        client = TestClient(test_app)
+        assert client.get("/budget").json() == {"remaining": None}
+        remaining = client.get("/budget", headers={"X-Request-Timeout": "500"}).json()
+        assert 0 < remaining["remaining"] <= 0.5
+
+
+class TestDeadlineAwareRetries:
+    @respx.mock
+    async def test_retries_network_errors(self):
+        route = respx.get(UPSTREAM_URL).mock(
+            side_effect=[httpx.ConnectError("boom"), httpx.Response(200, json={})]
+        )
+        async with httpx.AsyncClient() as client:
+            assert await get(client, make_settings()) == {}
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_retry_backoff_never_exceeds_deadline(self):
+        route = respx.get(UPSTREAM_URL).mock(side_effect=httpx.ConnectError("boom"))
+        settings = make_settings(retry_attempts=5, retry_backoff_seconds=0.2)
+        set_budget(0.1)
+
+        started = time.monotonic()
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(NetworkError):
+                await get(client, settings)
+
+        assert route.call_count == 1
+        assert time.monotonic() - started < 0.1
+
+    @respx.mock
+    async def test_slow_upstream_is_cut_at_deadline(self):
+        async def slow(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={})
+
+        respx.get(UPSTREAM_URL).mock(side_effect=slow)
+        settings = make_settings()
+        guards = UpstreamGuards(settings)
+        set_budget(0.05)
+
+        started = time.monotonic()
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(DeadlineExceededError):
+                await get(client, settings, guards)
+
+        assert time.monotonic() - started < 0.5
+        # Un budget trop court n'est pas un échec de l'hôte
+        assert guards.stats()["upstream.test"]["breaker"]["failures"] == 0
+
+    @respx.mock
+    async def test_remaining_budget_is_forwarded(self):
+        route = respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(200, json={}))
+        set_budget(2.0)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            await get(client, make_settings())
+
+        request = route.calls.last.request
+        assert 0 < int(request.headers["X-Request-Timeout"]) <= 2000
+        assert request.extensions["timeout"]["read"] <= 2.0
+
+    async def test_expired_deadline_fails_before_sending(self):
+        set_budget(-1)
+        async with httpx.AsyncClient() as client:
+            with pytest.raises(DeadlineExceededError):
+                await get(client, make_settings())
+
+    @respx.mock
+    async def test_coalesced_call_uses_each_caller_deadline(self):
+        async def slow(request):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json={"ok": True})
+
+        route = respx.get(UPSTREAM_URL).mock(side_effect=slow)
+        settings = make_settings()
+        flight = SingleFlight()
+
+        async def caller(budget):
+            set_budget(budget)
+            return await safe_get(
+                client,
+                UPSTREAM_URL,
+                guards=UpstreamGuards(settings),
+                cache=None,
+                single_flight=flight,
+                settings=settings,
+            )
+
+        async with httpx.AsyncClient() as client:
+            # Le premier appelant (budget court) ne coupe pas l'appel partagé
+            # pour le second, et le troisième s'arrête à sa propre échéance
+            started = time.monotonic()
+            short, long, shorter = await asyncio.gather(
+                caller(0.05), caller(2.0), caller(0.02), return_exceptions=True
+            )
+
+        assert isinstance(short, DeadlineExceededError)
+        assert long == {"ok": True}
+        assert isinstance(shorter, DeadlineExceededError)
+        assert time.monotonic() - started < 1.0
+        assert route.call_count == 1
+        assert "X-Request-Timeout" not in route.calls.last.request.headers
+
+
+class TestHedgedRequests:
+    @respx.mock
+    async def test_second_attempt_after_p95(self):
+        delays = [0.5, 0.0]
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(delays[len(calls) - 1])
+            return httpx.Response(200, json={"ok": True})
+
+        respx.get(UPSTREAM_URL).mock(side_effect=handler)
+        settings = make_settings(hedge_enabled=True, hedge_min_samples=5)
+        guards = UpstreamGuards(settings)
+        latency = guards.get("upstream.test").latency
+        for _ in range(5):
+            latency.record(0.02)
+
+        started = time.monotonic()
+        async with httpx.AsyncClient() as client:
+            assert await get(client, settings, guards) == {"ok": True}
+
+        assert time.monotonic() - started < 0.3
+        assert len(calls) == 2
+        assert latency.hedges == 1
+
+    @respx.mock
+    async def test_no_hedging_without_enough_samples(self):
+        route = respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(200, json={}))
+        settings = make_settings(hedge_enabled=True)
+        async with httpx.AsyncClient() as client:
+            await get(client, settings)
+        assert route.call_count == 1
+
+
+@respx.mock
+def test_exhausted_budget_maps_to_504():
+    """Test : un budget épuisé renvoie 504 sans appeler l'hôte"""
+    upstream_guards.clear()
+    route = respx.get("https://httpbin.org/get").mock(
+        return_value=httpx.Response(200, json={})
+    )
+    with TestClient(app) as client:
+        response = client.get("/external-demo", headers={"X-Request-Timeout": "0"})
+
+    assert response.status_code == 504
+    assert route.call_count == 0
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import httpx
+import respx
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import gather_get
+from src.shared.http.exceptions import NetworkError, ServerError, TimeoutError
+from src.shared.http.resilience import UpstreamGuards, upstream_guards
+
+BASE_URL = "https://upstream.test"
+
+
+def options():
+    settings = HTTPClientSettings(retry_attempts=1)
+    return dict(
+        guards=UpstreamGuards(settings),
+        cache=None,
+        single_flight=None,
+        settings=settings,
+    )
+
+
+@respx.mock
+async def test_gather_get_bounds_concurrency_and_keeps_order():
+    """Test : au plus `max_concurrency` appels simultanés, résultats dans l'ordre"""
+    state = {"in_flight": 0, "max": 0}
+
+    async def handler(request):
+        state["in_flight"] += 1
+        state["max"] = max(state["max"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return httpx.Response(200, json={"i": request.url.params["i"]})
+
+    respx.get(f"{BASE_URL}/items").mock(side_effect=handler)
+    calls = [(f"{BASE_URL}/items", {"i": str(i)}) for i in range(10)]
+
+    async with httpx.AsyncClient() as client:
+        results = await gather_get(client, calls, max_concurrency=3, **options())
+
+    assert state["max"] == 3
+    assert [result.data for result in results] == [{"i": str(i)} for i in range(10)]
+    assert all(result.ok for result in results)
+
+
+@respx.mock
+async def test_gather_get_returns_partial_results():
+    """Test : chaque échec est conservé dans son résultat, avec le même mapping"""
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={})
+
+    respx.get(f"{BASE_URL}/ok").mock(return_value=httpx.Response(200, json={"a": 1}))
+    respx.get(f"{BASE_URL}/down").mock(return_value=httpx.Response(503))
+    respx.get(f"{BASE_URL}/unreachable").mock(side_effect=httpx.ConnectError("boom"))
+    respx.get(f"{BASE_URL}/missing").mock(return_value=httpx.Response(404))
+    respx.get(f"{BASE_URL}/slow").mock(side_effect=slow)
+    respx.get(f"{BASE_URL}/html").mock(
+        return_value=httpx.Response(200, text="<html>maintenance</html>")
+    )
+
+    started = time.monotonic()
+    async with httpx.AsyncClient() as client:
+        results = await gather_get(
+            client,
+            [
+                f"{BASE_URL}/ok",
+                f"{BASE_URL}/down",
+                f"{BASE_URL}/unreachable",
+                f"{BASE_URL}/missing",
+                f"{BASE_URL}/slow",
+                f"{BASE_URL}/html",
+            ],
+            timeout=0.05,
+            **options(),
+        )
+
+    assert time.monotonic() - started < 0.5
+    ok, down, unreachable, missing, slow_result, html = results
+    assert ok.data == {"a": 1}
+    assert isinstance(down.error, ServerError)
+    assert isinstance(unreachable.error, NetworkError)
+    assert isinstance(missing.error, httpx.HTTPStatusError)
+    assert isinstance(slow_result.error, TimeoutError)
+    assert isinstance(html.error, ValueError)
+
+
+@respx.mock
+def test_fan_out_endpoint():
+    """Test de /external-demo/fan-out contre un httpbin simulé"""
+    upstream_guards.clear()
+
+    def handler(request):
+        if request.url.params["call"] == "1":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"args": dict(request.url.params)})
+
+    respx.get("https://httpbin.org/get").mock(side_effect=handler)
+
+    with TestClient(app) as client:
+        response = client.get("/external-demo/fan-out", params={"count": 3})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert body["results"][0]["data"]["args"] == {"demo": "SMCP", "call": "0"}
+    assert body["results"][1]["status"] == "error"
+    assert body["results"][1]["error"]["code"] == "SERVER_ERROR"
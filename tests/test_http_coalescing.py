@@ -0,0 +1,202 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.shared.cache.http_cache import (
+    CacheControl,
+    HTTPResponseCache,
+    parse_cache_control,
+)
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import safe_get
+from src.shared.http.resilience import UpstreamGuards
+from src.shared.http.single_flight import SingleFlight
+
+UPSTREAM_URL = "https://upstream.test/data"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def guards():
+    return UpstreamGuards(HTTPClientSettings())
+
+
+def slow_upstream(delay=0.05, headers=None):
+    """Upstream simulé comptant ses appels"""
+    calls = {"count": 0}
+
+    async def handler(request):
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        return httpx.Response(
+            200, json={"version": calls["count"]}, headers=headers or {}
+        )
+
+    return handler, calls
+
+
+def test_parse_cache_control():
+    """Test de l'interprétation de Cache-Control"""
+    assert parse_cache_control(None) == CacheControl()
+    assert parse_cache_control("public, max-age=60") == CacheControl(max_age=60)
+    assert parse_cache_control(
+        "max-age=10, s-maxage=30, stale-while-revalidate=5"
+    ) == CacheControl(max_age=30, stale_while_revalidate=5)
+    assert parse_cache_control("no-store").no_store
+    assert parse_cache_control("private, max-age=60").no_store
+    assert parse_cache_control("max-age=abc") == CacheControl()
+
+
+def test_http_response_cache_freshness():
+    """Test des états fresh / stale / expiré"""
+    clock = FakeClock()
+    cache = HTTPResponseCache(clock=clock)
+    cache.put("k", "v", CacheControl(max_age=10, stale_while_revalidate=5))
+
+    assert cache.get("k") == ("v", "fresh")
+    clock.now += 12
+    assert cache.get("k") == ("v", "stale")
+    clock.now += 5
+    assert cache.get("k") == (None, None)
+
+    assert not cache.put("k", "v", CacheControl())
+    assert not cache.put("k", "v", CacheControl(no_store=True))
+    assert cache.stats()["stale_hits"] == 1
+
+
+async def test_single_flight_shares_result_and_errors():
+    """Test du partage du résultat et des erreurs entre appels concurrents"""
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 1, "shared": 4, "in_flight": 0}
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_single_flight_survives_caller_cancellation():
+    """Test : l'annulation d'un appelant n'annule pas l'appel partagé"""
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.create_task(flight.do("k", work))
+    second = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+
+
+@respx.mock
+async def test_concurrent_identical_requests_hit_upstream_once(guards):
+    """Test : N requêtes identiques concurrentes → un seul appel amont"""
+    handler, calls = slow_upstream()
+    respx.get(UPSTREAM_URL).mock(side_effect=handler)
+    flight = SingleFlight()
+
+    async with httpx.AsyncClient() as client:
+        results = await asyncio.gather(
+            *(
+                safe_get(
+                    client,
+                    UPSTREAM_URL,
+                    params={"q": "1"},
+                    guards=guards,
+                    cache=None,
+                    single_flight=flight,
+                )
+                for _ in range(50)
+            )
+        )
+        # Des paramètres différents ne sont pas regroupés
+        await safe_get(
+            client,
+            UPSTREAM_URL,
+            params={"q": "2"},
+            guards=guards,
+            cache=None,
+            single_flight=flight,
+        )
+
+    assert calls["count"] == 2
+    assert results == [{"version": 1}] * 50
+
+
+@respx.mock
+async def test_cache_serves_fresh_then_revalidates_stale(guards):
+    """Test du cache : fresh sans appel amont, stale servi puis rafraîchi"""
+    handler, calls = slow_upstream(
+        delay=0.01, headers={"Cache-Control": "max-age=10, stale-while-revalidate=30"}
+    )
+    respx.get(UPSTREAM_URL).mock(side_effect=handler)
+    clock = FakeClock()
+    cache = HTTPResponseCache(clock=clock)
+    flight = SingleFlight()
+
+    async def get():
+        return await safe_get(
+            client, UPSTREAM_URL, guards=guards, cache=cache, single_flight=flight
+        )
+
+    async with httpx.AsyncClient() as client:
+        assert await get() == {"version": 1}
+        assert await get() == {"version": 1}
+        assert calls["count"] == 1
+
+        clock.now += 11
+        # Valeurs périmées servies immédiatement, un seul rafraîchissement
+        assert await asyncio.gather(get(), get(), get()) == [{"version": 1}] * 3
+        await asyncio.sleep(0.05)
+        assert calls["count"] == 2
+        assert await get() == {"version": 2}
+
+
+@respx.mock
+def test_external_demo_coalesces_concurrent_requests():
+    """Test de bout en bout : requêtes concurrentes sur /external-demo"""
+    handler, calls = slow_upstream(delay=0.1)
+    respx.get("https://httpbin.org/get").mock(side_effect=handler)
+
+    with TestClient(app) as client:
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as http:
+                return await asyncio.gather(
+                    *(http.get("/external-demo") for _ in range(20))
+                )
+
+        responses = client.portal.call(burst)
+        assert all(response.status_code == 200 for response in responses)
+        assert calls["count"] == 1
+        assert client.get("/external/cache/stats").json()["coalescing"]["shared"] >= 19
@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.shared.config.http_config import HTTPClientSettings, UpstreamSettings
+from src.shared.http import pool as pool_module
+from src.shared.http.pool import HTTPClientRegistry
+
+
+@pytest.fixture
+async def upstream():
+    """Serveur HTTP/1.1 minimal (keep-alive) répondant après `delay` secondes"""
+    state = {"delay": 0.0}
+
+    async def handle(reader, writer):
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(state["delay"])
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    state["url"] = f"http://127.0.0.1:{port}"
+    yield state
+    server.close()
+
+
+def make_registry(**upstreams: UpstreamSettings) -> HTTPClientRegistry:
+    return HTTPClientRegistry(HTTPClientSettings(upstreams=upstreams))
+
+
+class TestHTTPClientRegistry:
+    async def test_undeclared_upstreams_share_default_client(self):
+        registry = make_registry(billing=UpstreamSettings(read_timeout=2.0))
+        try:
+            default = registry.get()
+            assert registry.get("unknown") is default
+            billing = registry.get("billing")
+            assert billing is not default
+            assert billing.timeout.read == 2.0
+            assert set(registry.stats()) == {"default", "billing"}
+        finally:
+            await registry.aclose()
+
+    async def test_http2_falls_back_without_h2(self, monkeypatch):
+        monkeypatch.setattr(pool_module, "http2_available", lambda: False)
+        transport = pool_module.build_transport(UpstreamSettings(http2=True))
+        assert transport._pool._http2 is False
+        await transport.aclose()
+
+
+class TestPoolMetrics:
+    async def test_waiting_requests_and_connection_reuse(self, upstream):
+        upstream["delay"] = 0.05
+        registry = make_registry(
+            svc=UpstreamSettings(base_url=upstream["url"], max_connections=1)
+        )
+        client = registry.get("svc")
+        events = []
+
+        async def trace(event_name, info):
+            events.append(event_name)
+
+        try:
+            responses = await asyncio.gather(
+                *(client.get("/", extensions={"trace": trace}) for _ in range(3))
+            )
+            assert [response.text for response in responses] == ["ok"] * 3
+
+            stats = registry.stats()["svc"]
+            assert stats["requests"] == 3
+            assert stats["waiting"] == 0
+            assert stats["connections_opened"] == 1
+            assert stats["connections"] == 1
+            assert stats["idle"] == 1
+            assert stats["wait_ms_max"] >= 40
+            # Les callbacks trace de l'appelant sont toujours appelés
+            assert "connection.connect_tcp.started" in events
+        finally:
+            await registry.aclose()
+
+    async def test_pool_timeout_is_counted(self, upstream):
+        upstream["delay"] = 0.2
+        registry = make_registry(
+            svc=UpstreamSettings(
+                base_url=upstream["url"], max_connections=1, pool_timeout=0.02
+            )
+        )
+        client = registry.get("svc")
+        try:
+            results = await asyncio.gather(
+                client.get("/"), client.get("/"), return_exceptions=True
+            )
+            assert sum(isinstance(r, httpx.PoolTimeout) for r in results) == 1
+            stats = registry.stats()["svc"]
+            assert stats["pool_timeouts"] == 1
+            assert stats["waiting"] == 0
+        finally:
+            await registry.aclose()
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from src.shared.cache.idempotency_cache import IdempotencyCache, IdempotentResponse
+from src.shared.storage.idempotency_store import SqliteIdempotencyStore
+
+
+def make_response(body: bytes = b"{}") -> IdempotentResponse:
+    return IdempotentResponse(fingerprint=b"f", status_code=201, body=body)
+
+
+async def test_concurrent_duplicates_share_one_execution():
+    """Test des requêtes concurrentes attendant la première exécution"""
+    cache = IdempotencyCache()
+    calls = 0
+
+    async def produce():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return make_response(b"first")
+
+    results = await asyncio.gather(*(cache.run("key", produce) for _ in range(5)))
+
+    assert calls == 1
+    assert [replayed for _, replayed in results] == [False] + [True] * 4
+    assert {response.body for response, _ in results} == {b"first"}
+    assert await cache.run("key", produce) == (make_response(b"first"), True)
+    assert calls == 1
+
+
+async def test_failure_is_not_stored():
+    """Test d'une première exécution en échec : la suivante est rejouée"""
+    cache = IdempotencyCache()
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def succeed():
+        return make_response()
+
+    with pytest.raises(RuntimeError):
+        await cache.run("key", fail)
+    assert await cache.run("key", succeed) == (make_response(), False)
+
+
+def test_ttl_and_size_bounds():
+    """Test de l'expiration et de l'éviction LRU"""
+    now = [0.0]
+    cache = IdempotencyCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", make_response(b"a"))
+    cache.put("b", make_response(b"b"))
+    assert cache.get("a").body == b"a"
+    cache.put("c", make_response(b"c"))
+
+    assert cache.get("b") is None
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 2
+
+
+async def open_worker_cache(tmp_path) -> IdempotencyCache:
+    """Cache d'un worker, partageant ses clés via la base SQLite"""
+    cache = IdempotencyCache(store=SqliteIdempotencyStore(str(tmp_path / "keys.db")))
+    await cache.open()
+    return cache
+
+
+async def test_keys_are_shared_between_workers(tmp_path):
+    """Test d'une clé exécutée par un worker et rejouée par un autre"""
+    first, second = await open_worker_cache(tmp_path), await open_worker_cache(tmp_path)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def produce():
+        started.set()
+        await release.wait()
+        return make_response(b"first")
+
+    async def duplicate():
+        raise AssertionError("executed twice")
+
+    in_flight = asyncio.ensure_future(first.run(("user", "key"), produce))
+    await started.wait()
+    waiting = asyncio.ensure_future(second.run(("user", "key"), duplicate))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+    release.set()
+
+    assert await in_flight == (make_response(b"first"), False)
+    assert await waiting == (make_response(b"first"), True)
+    await first.close()
+    await second.close()
+
+
+async def test_failed_claim_is_released(tmp_path):
+    """Test d'un échec chez un worker : un autre worker peut exécuter la clé"""
+    first, second = await open_worker_cache(tmp_path), await open_worker_cache(tmp_path)
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def succeed():
+        return make_response()
+
+    with pytest.raises(RuntimeError):
+        await first.run("key", fail)
+    assert await second.run("key", succeed) == (make_response(), False)
+    await first.close()
+    await second.close()
+
+
+async def test_waiting_for_a_claimed_key_does_not_write(tmp_path):
+    """Test : l'attente d'une clé réservée ne prend pas le verrou d'écriture"""
+    path = str(tmp_path / "keys.db")
+    holder, waiter = SqliteIdempotencyStore(path), SqliteIdempotencyStore(path)
+    await holder.open()
+    await waiter.open()
+    assert await holder.claim("key") is None
+    writes = []
+    write = waiter._pool.write
+
+    async def counting_write(fn, *args):
+        writes.append(fn)
+        return await write(fn, *args)
+
+    waiter._pool.write = counting_write
+    waiting = asyncio.ensure_future(waiter.claim("key"))
+    await asyncio.sleep(0.1)
+    assert not waiting.done()
+    await holder.complete("key", (b"fp", 201, b"{}"), ttl_seconds=60)
+
+    assert await waiting == (b"fp", 201, b"{}")
+    assert writes == []
+    await holder.close()
+    await waiter.close()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from fastapi import HTTPException
+
+from src.shared.auth.jwks import JWKSKeyCache
+from src.shared.auth.jwt_service import JWTService
+
+
+def make_key_pair(algorithm: str, kid: str) -> tuple[str, dict]:
+    """Retourne la clé privée PEM et la JWK publique correspondante"""
+    if algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        jwk = json.loads(jwt.algorithms.OKPAlgorithm.to_jwk(private_key.public_key()))
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return pem, {**jwk, "kid": kid, "alg": algorithm, "use": "sig"}
+
+
+def write_jwks(path, *jwks) -> None:
+    path.write_text(json.dumps({"keys": list(jwks)}))
+
+
+@pytest.mark.parametrize("algorithm", ["ES256", "EdDSA"])
+def test_verify_token_with_jwks(tmp_path, algorithm):
+    """Test de vérification d'un token asymétrique avec la clé du JWKS"""
+    pem, jwk = make_key_pair(algorithm, "key-1")
+    jwks_file = tmp_path / "jwks.json"
+    write_jwks(jwks_file, jwk)
+    key_cache = JWKSKeyCache(str(jwks_file))
+    key_cache.load()
+    service = JWTService(
+        "unused", algorithm, key_cache=key_cache, signing_key=pem, key_id="key-1"
+    )
+
+    token = service.create_access_token("user-1", ["orders:read"])
+
+    assert jwt.get_unverified_header(token)["kid"] == "key-1"
+    assert service.verify_token(token)["user_id"] == "user-1"
+
+
+def test_unknown_kid_is_rejected(tmp_path):
+    """Test qu'un token signé par une clé absente du JWKS est refusé"""
+    _, jwk = make_key_pair("ES256", "key-1")
+    other_pem, _ = make_key_pair("ES256", "key-2")
+    jwks_file = tmp_path / "jwks.json"
+    write_jwks(jwks_file, jwk)
+    key_cache = JWKSKeyCache(str(jwks_file))
+    key_cache.load()
+    signer = JWTService(
+        "unused", "ES256", key_cache=key_cache, signing_key=other_pem, key_id="key-2"
+    )
+    token = signer.create_access_token("user-1", [])
+
+    with pytest.raises(HTTPException) as exc_info:
+        signer.verify_token(token)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_asymmetric_algorithm_requires_jwks():
+    """Test qu'un algorithme asymétrique sans JWKS est refusé"""
+    with pytest.raises(ValueError):
+        JWTService("secret", "ES256")
+
+
+async def test_key_rotation_triggers_background_refresh(tmp_path):
+    """Test de rotation : un nouveau kid déclenche un rafraîchissement"""
+    old_pem, old_jwk = make_key_pair("ES256", "old")
+    new_pem, new_jwk = make_key_pair("ES256", "new")
+    jwks_file = tmp_path / "jwks.json"
+    write_jwks(jwks_file, old_jwk)
+
+    key_cache = JWKSKeyCache(str(jwks_file), min_refresh_interval=0)
+    await key_cache.start()
+    try:
+        service = JWTService(
+            "unused", "ES256", key_cache=key_cache, signing_key=new_pem, key_id="new"
+        )
+        token = service.create_access_token("user-1", [])
+        write_jwks(jwks_file, old_jwk, new_jwk)
+
+        # Première tentative : kid inconnu, rafraîchissement demandé en fond
+        with pytest.raises(HTTPException):
+            service.verify_token(token)
+        for _ in range(100):
+            if key_cache.get_key("new") is not None:
+                break
+            await asyncio.sleep(0.01)
+
+        assert service.verify_token(token)["user_id"] == "user-1"
+        assert key_cache.get_key("old") is not None
+    finally:
+        await key_cache.stop()
+
+
+async def test_refresh_failure_keeps_previous_keys(tmp_path):
+    """Test qu'un JWKS invalide ne supprime pas les clés en cache"""
+    _, jwk = make_key_pair("ES256", "key-1")
+    jwks_file = tmp_path / "jwks.json"
+    write_jwks(jwks_file, jwk)
+    key_cache = JWKSKeyCache(str(jwks_file))
+    await key_cache.refresh()
+
+    jwks_file.write_text("not json")
+    await key_cache.refresh()
+
+    assert key_cache.get_key("key-1") is not None
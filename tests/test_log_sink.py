@@ -0,0 +1,128 @@
+import io
+import json
+
+import structlog
+
+from src.api.middleware.correlation_id import (
+    configure_structlog,
+    correlation_id_context,
+)
+from src.shared.log.queue_sink import QueueLogSink
+from src.shared.log.sampling import LogSampler, set_level_check
+
+
+def test_events_are_written_as_json_lines():
+    """Test que les événements sont rendus en JSON par le thread d'écriture"""
+    stream = io.StringIO()
+    sink = QueueLogSink(stream=stream, batch_size=2)
+    sink.start()
+
+    for i in range(5):
+        sink.enqueue({"event": "test", "i": i})
+    sink.flush()
+    sink.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["i"] for line in lines] == [0, 1, 2, 3, 4]
+    assert sink.stats()["written"] == 5
+
+
+def test_drop_newest_when_queue_is_full():
+    """Test de la politique drop_newest : les nouveaux événements sont perdus"""
+    stream = io.StringIO()
+    sink = QueueLogSink(stream=stream, maxsize=2, overflow_policy="drop_newest")
+
+    for i in range(4):
+        sink.enqueue({"i": i})
+    sink.start()
+    sink.close()
+
+    assert [json.loads(line)["i"] for line in stream.getvalue().splitlines()] == [0, 1]
+    assert sink.stats()["dropped"] == 2
+
+
+def test_drop_oldest_when_queue_is_full():
+    """Test de la politique drop_oldest : les plus anciens sont remplacés"""
+    stream = io.StringIO()
+    sink = QueueLogSink(stream=stream, maxsize=2, overflow_policy="drop_oldest")
+
+    for i in range(4):
+        sink.enqueue({"i": i})
+    sink.start()
+    sink.close()
+
+    assert [json.loads(line)["i"] for line in stream.getvalue().splitlines()] == [2, 3]
+    assert sink.stats()["dropped"] == 2
+
+
+def test_writer_survives_bad_events_and_stream_errors():
+    """Test qu'une erreur d'écriture n'arrête pas le thread (ni bloque « block »)"""
+
+    class Unrenderable:
+        def __str__(self):
+            raise RuntimeError("boom")
+
+    class FlakyStream(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.failures = 1
+
+        def write(self, text):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("disk full")
+            return super().write(text)
+
+    stream = FlakyStream()
+    sink = QueueLogSink(stream=stream, maxsize=1, batch_size=1, overflow_policy="block")
+    sink.start()
+
+    sink.enqueue({"i": 0})
+    sink.enqueue({"i": Unrenderable()})
+    for i in range(2, 5):
+        sink.enqueue({"i": i})
+    sink.flush()
+    sink.close()
+
+    assert [json.loads(line)["i"] for line in stream.getvalue().splitlines()] == [
+        2,
+        3,
+        4,
+    ]
+    assert sink.stats()["errors"] == 2
+    assert sink.stats()["written"] == 3
+
+
+def test_configure_structlog_with_sink():
+    """Test du pipeline structlog asynchrone avec filtrage par niveau"""
+    saved_config = structlog.get_config()
+    stream = io.StringIO()
+    sink = QueueLogSink(stream=stream)
+    sink.start()
+    token = correlation_id_context.set("req_test")
+    try:
+        configure_structlog(sink, level="INFO")
+        logger = structlog.get_logger("test")
+        logger.debug("ignored")
+        logger.info("order.test", amount=1.0)
+        sink.close()
+    finally:
+        correlation_id_context.reset(token)
+        structlog.configure(**saved_config)
+        set_level_check(lambda level: True)
+
+    (line,) = stream.getvalue().splitlines()
+    event = json.loads(line)
+    assert event["event"] == "order.test"
+    assert event["level"] == "info"
+    assert event["correlation_id"] == "req_test"
+    assert event["logger"] == "test"
+    assert "timestamp" in event
+
+
+def test_log_sampler_rates():
+    """Test des taux d'échantillonnage"""
+    assert LogSampler(1.0).sample() is True
+    assert LogSampler(0.0).sample() is False
+    assert LogSampler(0.5, rand=lambda: 0.4).sample() is True
+    assert LogSampler(0.5, rand=lambda: 0.6).sample() is False
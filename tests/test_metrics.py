@@ -0,0 +1,166 @@
+import os
+import threading
+
+import pytest
+
+from src.shared.metrics.instruments import (
+    jwt_verify_duration_seconds,
+    orders_created_total,
+)
+from src.shared.metrics.registry import MetricsRegistry
+
+
+def sample_value(text: str, line_prefix: str) -> float:
+    """Valeur de la première ligne du rendu commençant par `line_prefix`"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} absent de:\n{text}")
+
+
+class TestMetricsRegistry:
+    def test_render_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs traités", ("kind",))
+        gauge = registry.gauge("jobs_running", "Jobs en cours")
+        counter.labels("a").inc()
+        counter.labels("a").inc(2)
+        counter.labels('b"x').inc()
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        text = registry.render()
+
+        assert "# HELP jobs_total Jobs traités" in text
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a"} 3' in text
+        assert 'jobs_total{kind="b\\"x"} 1' in text
+        assert "# TYPE jobs_running gauge" in text
+        assert "jobs_running 1" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latence", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert sample_value(text, "latency_seconds_sum") == pytest.approx(3.65)
+
+    def test_wrong_label_count_is_rejected(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            registry.counter("jobs_total", "Doublon")
+
+    def test_threads_record_without_losing_updates(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits")
+
+        def work():
+            for _ in range(10_000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert "hits_total 80000" in registry.render()
+
+
+class TestMultiprocess:
+    def make_registry(self, directory) -> MetricsRegistry:
+        registry = MetricsRegistry(str(directory))
+        registry.counter("jobs_total", "Jobs", ("kind",))
+        registry.gauge("jobs_running", "Jobs en cours")
+        registry.histogram("latency_seconds", "Latence", buckets=(1,))
+        return registry
+
+    def test_render_merges_other_workers(self, tmp_path):
+        worker = self.make_registry(tmp_path)
+        worker._metrics["jobs_total"].labels("a").inc(2)
+        worker._metrics["jobs_running"].inc(3)
+        worker._metrics["latency_seconds"].observe(0.5)
+        # Instantané d'un autre worker (PID du parent, donc vivant)
+        worker._snapshot_path = lambda pid: tmp_path / f"metrics-{os.getppid()}.json"
+        worker.write_snapshot()
+
+        registry = self.make_registry(tmp_path)
+        registry._metrics["jobs_total"].labels("a").inc()
+        registry._metrics["jobs_total"].labels("b").inc()
+        registry._metrics["latency_seconds"].observe(2)
+        text = registry.render()
+
+        assert 'jobs_total{kind="a"} 3' in text
+        assert 'jobs_total{kind="b"} 1' in text
+        assert "jobs_running 3" in text
+        assert 'latency_seconds_bucket{le="1"} 1' in text
+        assert "latency_seconds_count 2" in text
+
+    def test_dead_worker_keeps_counters_but_not_gauges(self, tmp_path, monkeypatch):
+        worker = self.make_registry(tmp_path)
+        worker._metrics["jobs_total"].labels("a").inc(5)
+        worker._metrics["jobs_running"].inc(4)
+        worker._snapshot_path = lambda pid: tmp_path / "metrics-999999.json"
+        worker.write_snapshot()
+
+        monkeypatch.setattr(
+            "src.shared.metrics.registry._pid_alive", lambda pid: pid != 999999
+        )
+        text = self.make_registry(tmp_path).render()
+
+        assert 'jobs_total{kind="a"} 5' in text
+        assert "jobs_running 0" in text
+
+    def test_own_snapshot_is_not_counted_twice(self, tmp_path):
+        registry = self.make_registry(tmp_path)
+        registry._metrics["jobs_total"].labels("a").inc()
+        registry.write_snapshot()
+
+        assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+        assert 'jobs_total{kind="a"} 1' in registry.render()
+
+
+class TestMetricsEndpoint:
+    def test_requests_are_labelled_by_route_template(self, client, sample_order_data):
+        token = client.post("/auth/token/orders-write?user_id=metrics").json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+        created_before = orders_created_total.labels("single").value()
+        verified_before = jwt_verify_duration_seconds.labels("valid").snapshot()
+
+        order = client.post("/orders", json=sample_order_data, headers=headers).json()
+        client.get(f"/orders/{order['order']}", headers=headers)
+        client.get("/does-not-exist")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert (
+            'http_request_duration_seconds_count{method="GET",'
+            'route="/orders/{order_id}",status="200"}'
+        ) in text
+        assert 'route="<unmatched>",status="404"' in text
+        assert "http_requests_in_flight 1" in text
+        assert orders_created_total.labels("single").value() == created_before + 1
+        verified = jwt_verify_duration_seconds.labels("valid").snapshot()
+        assert verified["count"] > verified_before["count"]
+
+    def test_invalid_token_is_timed(self, client):
+        before = jwt_verify_duration_seconds.labels("invalid").snapshot()["count"]
+
+        client.get("/orders", headers={"Authorization": "Bearer not-a-jwt"})
+
+        after = jwt_verify_duration_seconds.labels("invalid").snapshot()["count"]
+        assert after == before + 1
@@ -0,0 +1,217 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.domain.repositories.columnar_order_repository import ColumnarOrderRepository
+from src.domain.repositories.factory import build_order_repository
+from src.domain.repositories.journaled_order_repository import (
+    JournaledOrderRepository,
+)
+from src.domain.repositories.order_repository import InMemoryOrderRepository
+from src.domain.schemas.order import OrderOut
+from src.shared.config.order_config import OrderStoreSettings
+from src.shared.storage.journal import JournalCorruptedError
+
+
+def make_order(i: int = 0, created_by=None) -> OrderOut:
+    return OrderOut(
+        order_id=uuid.uuid4(),
+        customer_name=f"client-é{i}",
+        total_amount=10.0 + i,
+        currency="EUR" if i % 2 else "USD",
+        created_by=created_by,
+    )
+
+
+async def open_repository(directory, inner=None, **options) -> JournaledOrderRepository:
+    options.setdefault("snapshot_interval", 0)
+    repository = JournaledOrderRepository(
+        inner or InMemoryOrderRepository(), str(directory), **options
+    )
+    await repository.open()
+    return repository
+
+
+@pytest.mark.parametrize("fsync_policy", ["always", "group", "periodic", "never"])
+async def test_orders_survive_restart(tmp_path, fsync_policy):
+    repository = await open_repository(tmp_path, fsync_policy=fsync_policy)
+    orders = [make_order(i, created_by="admin" if i == 0 else None) for i in range(5)]
+    repository.add(orders[0])
+    repository.add_many(orders[1:])
+    await repository.flush()
+    await repository.close()
+
+    reopened = await open_repository(tmp_path, inner=ColumnarOrderRepository())
+
+    assert len(reopened) == 5
+    assert [order for _, order in reopened.scan()] == orders
+    assert reopened.get(orders[0].order_id).created_by == "admin"
+    assert reopened.find_by_currency("EUR") == orders[1::2]
+    await reopened.close()
+
+
+async def test_clear_is_replayed(tmp_path):
+    repository = await open_repository(tmp_path)
+    repository.add(make_order(1))
+    repository.clear()
+    kept = make_order(2)
+    repository.add(kept)
+    await repository.close()
+
+    reopened = await open_repository(tmp_path)
+
+    assert [order for _, order in reopened.scan()] == [kept]
+    await reopened.close()
+
+
+async def test_group_commit_shares_fsyncs(tmp_path):
+    repository = await open_repository(tmp_path, fsync_policy="group")
+
+    async def create(i):
+        repository.add(make_order(i))
+        await repository.flush()
+
+    await asyncio.gather(*(create(i) for i in range(50)))
+
+    stats = repository.stats()
+    assert stats["durable"] == 50
+    assert stats["fsyncs"] < 50
+    await repository.close()
+
+
+async def test_always_policy_syncs_on_flush(tmp_path):
+    repository = await open_repository(tmp_path, fsync_policy="always")
+    repository.add(make_order(1))
+
+    assert repository.stats()["durable"] == 0
+    await repository.flush()
+
+    stats = repository.stats()
+    assert stats["durable"] == 1
+    assert stats["fsyncs"] == 1
+    await repository.close()
+
+
+async def test_torn_tail_is_truncated(tmp_path):
+    repository = await open_repository(tmp_path, fsync_policy="always")
+    orders = [make_order(i) for i in range(3)]
+    repository.add_many(orders)
+    await repository.close()
+    segment = tmp_path / "journal-00000000.log"
+    intact = segment.stat().st_size
+    with open(segment, "ab") as file:
+        file.write(b"\x40\x00\x00\x00partial")
+
+    reopened = await open_repository(tmp_path)
+
+    assert len(reopened) == 3
+    assert segment.stat().st_size == intact
+    reopened.add(make_order(4))
+    await reopened.close()
+    assert len(await open_repository(tmp_path)) == 4
+
+
+async def test_damaged_middle_segment_is_rejected(tmp_path):
+    repository = await open_repository(tmp_path)
+    repository.add(make_order(1))
+    await repository.close()
+    (tmp_path / "journal-00000000.log").write_bytes(b"\x00" * 20)
+    (tmp_path / "journal-00000001.log").write_bytes(b"")
+
+    with pytest.raises(JournalCorruptedError):
+        await open_repository(tmp_path)
+
+
+async def test_snapshot_compacts_segments(tmp_path):
+    repository = await open_repository(tmp_path)
+    before = [make_order(i) for i in range(10)]
+    repository.add_many(before)
+    await repository.flush()
+
+    path = await repository.snapshot()
+    after = make_order(11)
+    repository.add(after)
+    await repository.close()
+
+    assert path.name == "snapshot-00000001.bin"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "LOCK",
+        "journal-00000001.log",
+        "snapshot-00000001.bin",
+    ]
+    reopened = await open_repository(tmp_path)
+    assert [order for _, order in reopened.scan()] == before + [after]
+    assert reopened.stats()["records_since_snapshot"] == 1
+    await reopened.close()
+
+
+async def test_periodic_snapshot(tmp_path):
+    repository = await open_repository(
+        tmp_path, snapshot_interval=0.01, snapshot_min_records=2
+    )
+    repository.add_many([make_order(i) for i in range(3)])
+    await repository.flush()
+
+    for _ in range(100):
+        if (tmp_path / "snapshot-00000001.bin").exists():
+            break
+        await asyncio.sleep(0.01)
+
+    assert (tmp_path / "snapshot-00000001.bin").exists()
+    await repository.close()
+
+
+async def test_periodic_fsync_survives_segment_swaps(tmp_path):
+    repository = await open_repository(
+        tmp_path, fsync_policy="periodic", fsync_interval=0.001
+    )
+    for i in range(20):
+        repository.add(make_order(i))
+        await repository.snapshot()
+    journal = repository._journal
+    failures = []
+
+    def failing_sync():
+        failures.append(True)
+        raise OSError("fsync failed")
+
+    async def wait_until(predicate):
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+    journal.sync = failing_sync
+    await asyncio.wait_for(wait_until(lambda: failures), 2)
+    del journal.sync
+    synced = journal.stats()["fsyncs"]
+    # Le fsync périodique continue après l'erreur
+    await asyncio.wait_for(wait_until(lambda: journal.stats()["fsyncs"] > synced), 2)
+
+    assert not any(task.done() for task in repository._tasks)
+    await repository.close()
+
+
+async def test_journal_is_private_to_one_process(tmp_path):
+    repository = await open_repository(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        await open_repository(tmp_path)
+
+    await repository.close()
+    await (await open_repository(tmp_path)).close()
+
+
+def test_repository_requires_open(tmp_path):
+    repository = JournaledOrderRepository(InMemoryOrderRepository(), str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        repository.add(make_order())
+
+
+def test_build_journaled_repository(tmp_path):
+    repository = build_order_repository(
+        OrderStoreSettings(backend="columnar", journal_dir=str(tmp_path))
+    )
+
+    assert isinstance(repository, JournaledOrderRepository)
+    assert isinstance(repository.inner, ColumnarOrderRepository)
@@ -0,0 +1,195 @@
+import asyncio
+import multiprocessing
+import uuid
+
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+import src.main
+from src.domain.repositories.columnar_order_repository import ColumnarOrderRepository
+from src.domain.repositories.factory import build_order_repository, check_workers
+from src.domain.repositories.order_repository import InMemoryOrderRepository
+from src.domain.repositories.sqlite_order_repository import SqliteOrderRepository
+from src.domain.schemas.order import OrderOut
+from src.shared.config.order_config import OrderStoreSettings
+from src.shared.server.workers import worker_processes
+
+
+def make_order(customer_name: str = "hasna", currency: str = "EUR") -> OrderOut:
+    return OrderOut(
+        order_id=uuid.uuid4(),
+        customer_name=customer_name,
+        total_amount=10.0,
+        currency=currency,
+    )
+
+
+@pytest.fixture(
+    params=[InMemoryOrderRepository, ColumnarOrderRepository, SqliteOrderRepository]
+)
+def repository(request, tmp_path):
+    """Chaque test est exécuté sur toutes les implémentations"""
+    if request.param is not SqliteOrderRepository:
+        yield request.param()
+        return
+    repository = SqliteOrderRepository(str(tmp_path / "orders.db"))
+    asyncio.run(repository.open())
+    yield repository
+    asyncio.run(repository.close())
+
+
+class TestOrderRepository:
+    """Tests communs aux repositories de commandes"""
+
+    def test_add_and_get(self, repository):
+        order = make_order()
+        repository.add(order)
+
+        assert repository.get(order.order_id) == order
+        assert len(repository) == 1
+
+    def test_get_unknown_returns_none(self, repository):
+        repository.add(make_order())
+
+        assert repository.get(uuid.uuid4()) is None
+
+    def test_secondary_indexes(self, repository):
+        first = make_order("alice", "EUR")
+        second = make_order("bob", "USD")
+        third = make_order("alice", "USD")
+        for order in (first, second, third):
+            repository.add(order)
+
+        assert repository.find_by_customer("alice") == [first, third]
+        assert repository.find_by_currency("USD") == [second, third]
+        assert repository.find_by_customer("nobody") == []
+        assert repository.find_by_currency("JPY") == []
+
+    def test_clear(self, repository):
+        order = make_order()
+        repository.add(order)
+        repository.clear()
+
+        assert len(repository) == 0
+        assert repository.get(order.order_id) is None
+        assert repository.find_by_currency("EUR") == []
+
+    def test_scan(self, repository):
+        orders = [
+            make_order("alice", "EUR"),
+            make_order("bob", "USD"),
+            make_order("alice", "USD"),
+        ]
+        orders[1].total_amount = 50.0
+        for order in orders:
+            repository.add(order)
+
+        assert [order for _, order in repository.scan()] == orders
+        assert [position for position, _ in repository.scan(after=0)] == [1, 2]
+        assert [o for _, o in repository.scan(currency="USD")] == orders[1:]
+        assert [o for _, o in repository.scan(1, customer_name="alice")] == [orders[2]]
+        assert [o for _, o in repository.scan(min_amount=20)] == [orders[1]]
+        assert [o for _, o in repository.scan(max_amount=20)] == [orders[0], orders[2]]
+        assert list(repository.scan(customer_name="bob", currency="EUR")) == []
+        assert list(repository.scan(customer_name="nobody")) == []
+        assert list(repository.scan(currency="JPY")) == []
+
+    def test_scan_page_async(self, repository):
+        orders = [make_order("alice", "EUR"), make_order("bob", "USD")]
+        orders.append(make_order("alice", "USD"))
+        for order in orders:
+            repository.add(order)
+
+        def page(*args, **filters):
+            pairs = asyncio.run(repository.scan_page_async(*args, **filters))
+            return [order for _, order in pairs]
+
+        assert page(None, 2) == orders[:2]
+        assert page(1, 2) == orders[2:]
+        assert page(None, 10, customer_name="alice", currency="USD") == orders[2:]
+
+    def test_scan_after_negative_position(self, repository):
+        orders = [make_order() for _ in range(3)]
+        for order in orders:
+            repository.add(order)
+
+        assert [order for _, order in repository.scan(after=-3)] == orders
+        assert [o for _, o in repository.scan(-3, currency="EUR")] == orders
+
+    def test_many_orders(self, repository):
+        created = [make_order(f"client-{i % 7}") for i in range(5_000)]
+        for order in created:
+            repository.add(order)
+
+        assert len(repository) == 5_000
+        assert all(repository.get(order.order_id) == order for order in created)
+
+
+def test_columnar_keeps_created_by():
+    repository = ColumnarOrderRepository()
+    order = make_order()
+    order.created_by = "admin"
+    repository.add(order)
+
+    assert repository.get(order.order_id).created_by == "admin"
+
+
+@pytest.mark.parametrize(
+    "backend,expected",
+    [
+        ("memory", InMemoryOrderRepository),
+        ("columnar", ColumnarOrderRepository),
+        ("sqlite", SqliteOrderRepository),
+    ],
+)
+def test_build_order_repository(backend, expected):
+    repository = build_order_repository(OrderStoreSettings(backend=backend))
+
+    assert isinstance(repository, expected)
+
+
+def test_several_workers_need_shared_storage():
+    check_workers(OrderStoreSettings(backend="sqlite"), workers=4)
+    check_workers(OrderStoreSettings(backend="memory"), workers=1)
+
+    with pytest.raises(RuntimeError):
+        check_workers(OrderStoreSettings(backend="memory"), workers=2)
+
+
+def report_worker_processes(config, result):
+    result.put(worker_processes())
+
+
+@pytest.mark.parametrize(
+    "options, expected", [({"workers": 4}, 4), ({"workers": 4, "reload": True}, 1)]
+)
+def test_worker_processes_reads_uvicorn_config(options, expected):
+    # Worker started the way uvicorn does: spawned with its Config in kwargs
+    context = multiprocessing.get_context("spawn")
+    result = context.Queue()
+    config = uvicorn.Config("src.main:app", **options)
+    worker = context.Process(
+        target=report_worker_processes, kwargs={"config": config, "result": result}
+    )
+    worker.start()
+    try:
+        assert result.get(timeout=30) == expected
+    finally:
+        worker.join(timeout=30)
+
+    assert worker_processes() == 1
+
+
+@pytest.mark.parametrize("declared, detected", [(2, 1), (1, 2)])
+def test_startup_fails_with_private_storage_and_workers(
+    monkeypatch, declared, detected
+):
+    # Workers déclarés (WEB_CONCURRENCY) ou détectés dans la config uvicorn
+    monkeypatch.setattr(src.main.server_settings, "web_concurrency", declared)
+    monkeypatch.setattr(src.main, "worker_processes", lambda: detected)
+    monkeypatch.setattr(src.main.order_store_settings, "backend", "memory")
+
+    with pytest.raises(RuntimeError):
+        with TestClient(src.main.app):
+            pass
@@ -60,3 +60,68 @@ class TestOrderService:
 
         assert str(non_existent_id) in str(exc_info.value)
         assert "not found" in str(exc_info.value)
+
+    def test_create_orders_batch(self):
+        """Test création de plusieurs commandes en une seule insertion"""
+        # Arrange
+        batch = [
+            OrderIn(customer_name=f"Client {i}", total_amount=10.0, currency="EUR")
+            for i in range(3)
+        ]
+
+        # Act
+        result = self.service.create_orders(batch)
+
+        # Assert
+        assert len(result) == 3
+        assert len(orders) == 3
+        assert self.service.get_order(result[2].order_id).customer_name == "Client 2"
+
+    async def test_list_orders_pagination(self):
+        """Test pagination par curseur"""
+        # Arrange
+        created = self.service.create_orders(
+            [
+                OrderIn(customer_name=f"Client {i}", total_amount=1.0, currency="EUR")
+                for i in range(3)
+            ]
+        )
+
+        # Act
+        first_page, cursor = await self.service.list_orders(limit=2)
+        last_page, last_cursor = await self.service.list_orders(after=cursor, limit=2)
+
+        # Assert
+        assert first_page == created[:2]
+        assert last_page == created[2:]
+        assert last_cursor is None
+
+    async def test_stream_orders(self):
+        """Test streaming de toutes les commandes"""
+        # Arrange
+        created = self.service.create_orders(
+            [
+                OrderIn(customer_name="Client", total_amount=1.0, currency="EUR")
+                for _ in range(1200)
+            ]
+        )
+
+        # Act
+        streamed = [order async for order in self.service.stream_orders()]
+
+        # Assert
+        assert streamed == created
+
+    async def test_fetch_order(self):
+        """Test récupération asynchrone d'une commande"""
+        # Arrange
+        order_data = OrderIn(customer_name="Jane", total_amount=150.0, currency="GBP")
+        created_order = self.service.create_order(order_data)
+
+        # Act
+        result = await self.service.fetch_order(created_order.order_id)
+
+        # Assert
+        assert result == created_order
+        with pytest.raises(OrderNotFoundException):
+            await self.service.fetch_order(uuid.uuid4())
@@ -0,0 +1,289 @@
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic_core import to_json
+
+from src.api.routes.orders import (
+    MAX_BATCH_SIZE,
+    order_idempotency_cache,
+    order_repository,
+)
+from src.main import app
+
+
+@pytest.fixture
+def client():
+    """Client de test FastAPI"""
+    order_repository.clear()
+    order_idempotency_cache.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """En-têtes d'authentification avec les scopes orders:read et orders:write"""
+    response = client.post("/auth/token/orders-write?user_id=test-user")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def make_payload(i: int) -> dict:
+    return {"nom_client": f"client-{i}", "montant": 10.0 + i, "devise": "EUR"}
+
+
+class TestCreateOrderIdempotency:
+    """Tests pour POST /orders avec Idempotency-Key"""
+
+    def test_retry_replays_first_response(self, client, auth_headers):
+        headers = {**auth_headers, "Idempotency-Key": "retry-1"}
+
+        first = client.post("/orders", headers=headers, json=make_payload(1))
+        retry = client.post("/orders", headers=headers, json=make_payload(1))
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.content == first.content
+        assert "idempotent-replayed" not in first.headers
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert len(order_repository) == 1
+
+    def test_key_reused_for_another_order(self, client, auth_headers):
+        headers = {**auth_headers, "Idempotency-Key": "retry-2"}
+        client.post("/orders", headers=headers, json=make_payload(1))
+
+        response = client.post("/orders", headers=headers, json=make_payload(2))
+
+        assert response.status_code == 409
+        assert len(order_repository) == 1
+
+    def test_keys_are_scoped_per_user(self, client, auth_headers):
+        token = client.post("/auth/token/orders-write?user_id=other-user").json()
+        other_headers = {
+            "Authorization": f"Bearer {token['access_token']}",
+            "Idempotency-Key": "shared",
+        }
+        client.post(
+            "/orders",
+            headers={**auth_headers, "Idempotency-Key": "shared"},
+            json=make_payload(1),
+        )
+
+        response = client.post("/orders", headers=other_headers, json=make_payload(1))
+
+        assert response.status_code == 201
+        assert len(order_repository) == 2
+
+
+class TestCreateOrdersBatch:
+    """Tests pour POST /orders:batch"""
+
+    def test_batch_json_array(self, client, auth_headers):
+        payload = [make_payload(i) for i in range(3)]
+
+        response = client.post("/orders:batch", headers=auth_headers, json=payload)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 3
+        assert data["failed"] == 0
+        assert [result["index"] for result in data["results"]] == [0, 1, 2]
+        order_id = data["results"][1]["order"]["order"]
+        assert client.get(f"/orders/{order_id}", headers=auth_headers).json() == (
+            data["results"][1]["order"]
+        )
+
+    def test_batch_ndjson(self, client, auth_headers):
+        body = "\n".join(json.dumps(make_payload(i)) for i in range(2)) + "\n"
+
+        response = client.post(
+            "/orders:batch",
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            content=body,
+        )
+
+        assert response.status_code == 201
+        assert response.json()["created"] == 2
+
+    def test_batch_partial_failure(self, client, auth_headers):
+        payload = [make_payload(0), {"nom_client": "x", "montant": -1, "devise": "eur"}]
+
+        response = client.post("/orders:batch", headers=auth_headers, json=payload)
+
+        assert response.status_code == 207
+        data = response.json()
+        assert (data["created"], data["failed"]) == (1, 1)
+        assert data["results"][0]["status"] == "created"
+        failed = data["results"][1]
+        assert failed["status"] == "error"
+        assert {error["field"] for error in failed["errors"]} == {"montant", "devise"}
+        assert len(order_repository) == 1
+
+    def test_batch_all_or_nothing(self, client, auth_headers):
+        payload = [make_payload(0), {"nom_client": "x"}]
+
+        response = client.post(
+            "/orders:batch?all_or_nothing=true", headers=auth_headers, json=payload
+        )
+
+        assert response.status_code == 422
+        statuses = [result["status"] for result in response.json()["results"]]
+        assert statuses == ["rejected", "error"]
+        assert len(order_repository) == 0
+
+    def test_batch_not_an_array(self, client, auth_headers):
+        response = client.post(
+            "/orders:batch", headers=auth_headers, json=make_payload(0)
+        )
+
+        assert response.status_code == 422
+
+    def test_batch_too_large(self, client, auth_headers):
+        payload = [make_payload(i) for i in range(MAX_BATCH_SIZE + 1)]
+
+        response = client.post("/orders:batch", headers=auth_headers, json=payload)
+
+        assert response.status_code == 413
+        assert len(order_repository) == 0
+
+    def test_batch_too_large_is_rejected_before_item_errors(self, client, auth_headers):
+        payload = [{"montant": -1}] * (MAX_BATCH_SIZE + 1)
+        lines = b"\n".join(to_json(make_payload(i)) for i in range(MAX_BATCH_SIZE + 1))
+
+        invalid = client.post("/orders:batch", headers=auth_headers, json=payload)
+        ndjson = client.post(
+            "/orders:batch",
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+            content=lines,
+        )
+
+        assert invalid.status_code == 413
+        assert ndjson.status_code == 413
+        assert len(order_repository) == 0
+
+    def test_batch_requires_authentication(self, client):
+        response = client.post("/orders:batch", json=[make_payload(0)])
+
+        assert response.status_code in (401, 403)
+
+
+class TestListOrders:
+    """Tests pour GET /orders"""
+
+    def create_orders(self, client, auth_headers, payload):
+        response = client.post("/orders:batch", headers=auth_headers, json=payload)
+        return [result["order"] for result in response.json()["results"]]
+
+    def test_pagination(self, client, auth_headers):
+        created = self.create_orders(
+            client, auth_headers, [make_payload(i) for i in range(5)]
+        )
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/orders", headers=auth_headers, params=params)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == created
+
+    def test_filters(self, client, auth_headers):
+        payload = [
+            {"nom_client": "alice", "montant": 10.0, "devise": "EUR"},
+            {"nom_client": "bob", "montant": 50.0, "devise": "USD"},
+            {"nom_client": "alice", "montant": 90.0, "devise": "USD"},
+        ]
+        self.create_orders(client, auth_headers, payload)
+
+        def amounts(**params):
+            response = client.get("/orders", headers=auth_headers, params=params)
+            return [order["montant"] for order in response.json()["items"]]
+
+        assert amounts(nom_client="alice") == [10.0, 90.0]
+        assert amounts(devise="USD") == [50.0, 90.0]
+        assert amounts(nom_client="alice", devise="USD") == [90.0]
+        assert amounts(montant_min=20, montant_max=60) == [50.0]
+        assert amounts(devise="JPY") == []
+
+    def test_invalid_cursor(self, client, auth_headers):
+        response = client.get("/orders?cursor=%%%", headers=auth_headers)
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("position", ["-3", " 2", "1_0", "007", "²", str(2**63)])
+    @pytest.mark.parametrize("accept", ["application/json", "application/x-ndjson"])
+    def test_non_canonical_cursor(self, client, auth_headers, position, accept):
+        self.create_orders(client, auth_headers, [make_payload(i) for i in range(5)])
+        cursor = base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+        response = client.get(
+            "/orders",
+            headers={**auth_headers, "Accept": accept},
+            params={"cursor": cursor, "limit": 10},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["details"][0]["message"] == "Invalid cursor"
+
+    def test_ndjson_streaming(self, client, auth_headers):
+        created = self.create_orders(
+            client, auth_headers, [make_payload(i) for i in range(250)]
+        )
+
+        response = client.get(
+            "/orders",
+            headers={**auth_headers, "Accept": "application/x-ndjson"},
+            params={"devise": "EUR"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == created
+
+
+class TestGetOrderCache:
+    """Tests du cache de réponses et des ETags de GET /orders/{order_id}"""
+
+    def create_order(self, client, auth_headers):
+        response = client.post("/orders", headers=auth_headers, json=make_payload(0))
+        return response.json()["order"]
+
+    def test_etag_and_not_modified(self, client, auth_headers):
+        order_id = self.create_order(client, auth_headers)
+
+        first = client.get(f"/orders/{order_id}", headers=auth_headers)
+        etag = first.headers["ETag"]
+        second = client.get(
+            f"/orders/{order_id}", headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert first.json()["nom_client"] == "client-0"
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert second.content == b""
+
+    def test_other_etag_returns_body(self, client, auth_headers):
+        order_id = self.create_order(client, auth_headers)
+
+        response = client.get(
+            f"/orders/{order_id}", headers={**auth_headers, "If-None-Match": '"other"'}
+        )
+
+        assert response.status_code == 200
+
+    def test_cache_invalidated_when_orders_change(self, client, auth_headers):
+        order_id = self.create_order(client, auth_headers)
+        assert (
+            client.get(f"/orders/{order_id}", headers=auth_headers).status_code == 200
+        )
+
+        order_repository.clear()
+
+        response = client.get(f"/orders/{order_id}", headers=auth_headers)
+        assert response.status_code == 404
@@ -0,0 +1,111 @@
+import json
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.middleware.correlation_id import CorrelationIdMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
+from src.api.routes.auth import router as auth_router
+from src.api.routes.orders import router as orders_router
+from src.shared.config.profiling_config import ProfilingSettings
+from src.shared.log.sampling import LogSampler
+from src.shared.profiling.request_profile import (
+    PROFILE_HEADER,
+    PROFILE_OUTPUT_HEADER,
+    sign_profile_request,
+    verify_profile_request,
+)
+
+SECRET = "profiling-secret"
+
+
+def make_client(tmp_path, sample_rate: float = 0.0) -> TestClient:
+    settings = ProfilingSettings(
+        secret=SECRET, sample_rate=sample_rate, output_dir=str(tmp_path)
+    )
+    app = FastAPI()
+    app.include_router(auth_router)
+    app.include_router(orders_router)
+    app.add_middleware(
+        ProfilingMiddleware, settings=settings, sampler=LogSampler(sample_rate)
+    )
+    app.add_middleware(CorrelationIdMiddleware)
+    return TestClient(app)
+
+
+def auth_headers(client: TestClient) -> dict:
+    token = client.post("/auth/token/orders-write?user_id=profiler").json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+class TestSignature:
+    def test_signed_value_is_accepted(self):
+        value = sign_profile_request(SECRET, ttl_seconds=60, now=1000)
+        assert verify_profile_request(value, SECRET, 3600, now=1000)
+
+    @pytest.mark.parametrize(
+        "value, now",
+        [
+            (sign_profile_request("other-secret", 60, now=1000), 1000),
+            (sign_profile_request(SECRET, 60, now=1000), 1061),
+            (sign_profile_request(SECRET, 7200, now=1000), 1000),
+            ("not-a-signature", 1000),
+        ],
+    )
+    def test_invalid_values_are_rejected(self, value, now):
+        assert not verify_profile_request(value, SECRET, 3600, now=now)
+
+
+class TestProfilingMiddleware:
+    def test_signed_request_returns_profile(self, tmp_path, sample_order_data):
+        client = make_client(tmp_path)
+        headers = {
+            **auth_headers(client),
+            PROFILE_HEADER: sign_profile_request(SECRET),
+            PROFILE_OUTPUT_HEADER: "response",
+            "X-Correlation-ID": "req_profiled",
+        }
+
+        response = client.post("/orders", json=sample_order_data, headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["X-Profiled-Status"] == "201"
+        assert response.headers["X-Correlation-ID"] == "req_profiled"
+        profile = response.json()
+        assert profile["correlation_id"] == "req_profiled"
+        assert profile["path"] == "/orders"
+        assert profile["status_code"] == 201
+        names = [span["name"] for span in profile["spans"]]
+        assert {"auth", "validation", "service", "serialisation"} <= set(names)
+        assert "function calls" in profile["top_functions"]
+
+    def test_sampled_request_is_dumped(self, tmp_path, sample_order_data):
+        client = make_client(tmp_path, sample_rate=1.0)
+        headers = {**auth_headers(client), "X-Correlation-ID": "req_sampled/../x"}
+
+        response = client.post("/orders", json=sample_order_data, headers=headers)
+
+        assert response.status_code == 201
+        summaries = sorted(tmp_path.glob("*req_sampled____x.json"))
+        assert len(summaries) == 1
+        summary = json.loads(summaries[0].read_text())
+        assert summary["correlation_id"] == "req_sampled/../x"
+        assert summary["status_code"] == 201
+        stats = pstats.Stats(str(summaries[0].with_suffix(".prof")))
+        assert stats.total_calls > 0
+
+    def test_unsigned_request_is_not_profiled(self, tmp_path, sample_order_data):
+        client = make_client(tmp_path)
+        headers = {
+            **auth_headers(client),
+            PROFILE_HEADER: sign_profile_request("wrong-secret"),
+            PROFILE_OUTPUT_HEADER: "response",
+        }
+
+        response = client.post("/orders", json=sample_order_data, headers=headers)
+
+        assert response.status_code == 201
+        assert "X-Profiled-Status" not in response.headers
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,57 @@
+import json
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from src.api.responses.pydantic_response import PydanticJSONResponse
+from src.domain.schemas.order import OrderOut, OrderPage
+
+
+def make_order(created_by=None) -> OrderOut:
+    return OrderOut(
+        order_id=uuid.uuid4(),
+        customer_name="client-é",
+        total_amount=99.99,
+        currency="EUR",
+        created_by=created_by,
+    )
+
+
+def test_models_are_serialised_by_alias():
+    """Test que les modèles utilisent les alias, comme response_model"""
+    order = make_order()
+
+    body = json.loads(PydanticJSONResponse(order).body)
+
+    assert body == {
+        "order": str(order.order_id),
+        "nom_client": "client-é",
+        "montant": 99.99,
+        "devise": "EUR",
+        "created_by": None,
+    }
+
+
+def test_non_model_content():
+    """Test des listes et dictionnaires, y compris de modèles"""
+    order = make_order()
+
+    assert PydanticJSONResponse([1, "a", None]).body == b'[1,"a",null]'
+    assert PydanticJSONResponse({"status": "ok"}).body == b'{"status":"ok"}'
+    assert json.loads(PydanticJSONResponse({"items": [order]}).body) == {
+        "items": [jsonable_encoder(order)]
+    }
+
+
+def test_same_bytes_as_json_response():
+    """Test : octets identiques à la réponse JSONResponse précédente"""
+    order = make_order(created_by="admin")
+    page = OrderPage(items=[order, make_order()], next_cursor="abc")
+
+    for content in (order, page):
+        response = PydanticJSONResponse(content, status_code=201)
+        previous = JSONResponse(jsonable_encoder(content), status_code=201)
+
+        assert response.body == previous.body
+        assert response.headers["content-type"] == previous.headers["content-type"]
@@ -0,0 +1,195 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import safe_get
+from src.shared.http.exceptions import BulkheadFullError, CircuitOpenError, ServerError
+from src.shared.http.resilience import (
+    Bulkhead,
+    CircuitBreaker,
+    UpstreamGuards,
+    upstream_guards,
+)
+
+UPSTREAM_URL = "https://upstream.test/data"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **kwargs):
+    options = dict(
+        failure_rate_threshold=0.5,
+        window_seconds=10.0,
+        minimum_calls=4,
+        open_seconds=5.0,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("upstream.test", clock=clock, **options)
+
+
+class TestCircuitBreaker:
+    def test_opens_when_failure_rate_reaches_threshold(self):
+        breaker = make_breaker(FakeClock())
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        assert breaker.stats()["rejected"] == 1
+
+    def test_needs_minimum_calls(self):
+        breaker = make_breaker(FakeClock())
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == "closed"
+
+    def test_old_calls_leave_the_window(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now += 11
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        assert breaker.stats()["calls"] == 1
+
+    def test_half_open_trial(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, minimum_calls=1)
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now += 5
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        # Un seul appel d'essai à la fois
+        assert breaker.allow() is False
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now += 5
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.stats()["calls"] == 0
+
+    def test_ignored_call_releases_trial(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, minimum_calls=1)
+        breaker.record_failure()
+        clock.now += 5
+        assert breaker.allow() is True
+        breaker.record_ignored()
+        assert breaker.allow() is True
+
+
+class TestBulkhead:
+    async def test_rejects_when_full(self):
+        bulkhead = Bulkhead("upstream.test", max_concurrent=1)
+        async with bulkhead:
+            assert bulkhead.in_flight == 1
+            with pytest.raises(BulkheadFullError):
+                async with bulkhead:
+                    pass
+        assert bulkhead.stats() == {"in_flight": 0, "max_concurrent": 1, "rejected": 1}
+
+    async def test_waits_up_to_max_wait(self):
+        bulkhead = Bulkhead("upstream.test", max_concurrent=1, max_wait=1.0)
+
+        async def hold():
+            async with bulkhead:
+                await asyncio.sleep(0.01)
+
+        async def enter():
+            async with bulkhead:
+                return True
+
+        results = await asyncio.gather(hold(), enter())
+        assert results[1] is True
+        assert bulkhead.rejected == 0
+
+
+class TestSafeGetGuards:
+    @pytest.fixture
+    def guards(self):
+        return UpstreamGuards(
+            HTTPClientSettings(breaker_minimum_calls=2, bulkhead_max_concurrent=1)
+        )
+
+    @respx.mock
+    async def test_open_circuit_fails_fast(self, guards):
+        route = respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(503))
+        async with httpx.AsyncClient() as client:
+            for _ in range(2):
+                with pytest.raises(ServerError):
+                    await safe_get(client, UPSTREAM_URL, guards=guards)
+
+            with pytest.raises(CircuitOpenError):
+                await safe_get(client, UPSTREAM_URL, guards=guards)
+
+        assert route.call_count == 2
+        assert guards.stats()["upstream.test"]["breaker"]["state"] == "open"
+
+    @respx.mock
+    async def test_client_errors_do_not_open_circuit(self, guards):
+        respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(404))
+        async with httpx.AsyncClient() as client:
+            for _ in range(3):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await safe_get(client, UPSTREAM_URL, guards=guards)
+
+        assert guards.stats()["upstream.test"]["breaker"]["state"] == "closed"
+
+    @respx.mock
+    async def test_bulkhead_limits_concurrent_calls(self, guards):
+        async def slow(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"ok": True})
+
+        respx.get(UPSTREAM_URL).mock(side_effect=slow)
+        async with httpx.AsyncClient() as client:
+            # Coalescing disabled: identical calls would share a single flight
+            results = await asyncio.gather(
+                safe_get(client, UPSTREAM_URL, guards=guards, single_flight=None),
+                safe_get(client, UPSTREAM_URL, guards=guards, single_flight=None),
+                return_exceptions=True,
+            )
+
+        assert results[0] == {"ok": True}
+        assert isinstance(results[1], BulkheadFullError)
+
+
+class TestCircuitOpenResponse:
+    @respx.mock
+    def test_open_circuit_maps_to_502(self):
+        upstream_guards.clear()
+        respx.get("https://httpbin.org/get").mock(return_value=httpx.Response(500))
+        try:
+            with TestClient(app) as client:
+                breaker = upstream_guards.get("httpbin.org").breaker
+                breaker.minimum_calls = 1
+                assert client.get("/external-demo").status_code == 502
+                assert breaker.state == "open"
+
+                response = client.get("/external-demo")
+                assert response.status_code == 502
+                assert response.json()["details"][0]["code"] == "SERVER_ERROR"
+                stats = client.get("/external/circuit-breakers").json()
+                assert stats["httpbin.org"]["breaker"]["rejected"] == 1
+        finally:
+            upstream_guards.clear()
@@ -0,0 +1,29 @@
+from src.shared.cache.response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_etag_matches():
+    """Test de la comparaison faible des ETags pour If-None-Match"""
+    etag = make_etag(b"body")
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_response_cache_lru_and_generation():
+    """Test de l'éviction LRU et de l'invalidation par génération"""
+    cache = ResponseCache(max_size=2)
+    cache.put("a", b"a")
+    cache.put("b", b"b")
+    assert cache.get("a").body == b"a"
+    cache.put("c", b"c")
+
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert cache.get("a", generation=1) is None
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
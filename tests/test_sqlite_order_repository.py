@@ -0,0 +1,151 @@
+import asyncio
+import sqlite3
+import uuid
+
+import pytest
+
+from src.domain.repositories.sqlite_order_repository import SqliteOrderRepository
+from src.domain.schemas.order import OrderOut
+
+
+def make_order(i: int = 0, created_by=None) -> OrderOut:
+    return OrderOut(
+        order_id=uuid.uuid4(),
+        customer_name=f"client-{i % 2}",
+        total_amount=10.0 + i,
+        currency="EUR" if i % 2 else "USD",
+        created_by=created_by,
+    )
+
+
+async def open_repository(tmp_path, **options) -> SqliteOrderRepository:
+    repository = SqliteOrderRepository(str(tmp_path / "orders.db"), **options)
+    await repository.open()
+    return repository
+
+
+async def test_orders_survive_restart(tmp_path):
+    repository = await open_repository(tmp_path)
+    orders = [make_order(i, created_by="admin" if i == 0 else None) for i in range(5)]
+    repository.add(orders[0])
+    repository.add_many(orders[1:])
+    await repository.flush()
+    await repository.close()
+
+    reopened = await open_repository(tmp_path, synchronous="NORMAL")
+
+    assert len(reopened) == 5
+    assert [order for _, order in reopened.scan()] == orders
+    assert await reopened.get_async(orders[0].order_id) == orders[0]
+    assert reopened.get(orders[0].order_id).created_by == "admin"
+    assert reopened.find_by_currency("EUR") == orders[1::2]
+    assert reopened.find_by_customer("client-0") == orders[0::2]
+    assert [p for p, _ in reopened.scan(after=2, min_amount=12)] == [3, 4]
+    reopened.add(make_order(6))
+    assert [p for p, _ in reopened.scan(after=3)] == [4, 5]
+    await reopened.close()
+
+
+async def test_concurrent_creates_share_commits(tmp_path):
+    repository = await open_repository(tmp_path)
+
+    async def create(i):
+        repository.add(make_order(i))
+        await repository.flush()
+
+    await asyncio.gather(*(create(i) for i in range(50)))
+
+    stats = repository.stats()
+    assert stats["durable"] == 50
+    assert stats["queued"] == 0
+    assert stats["commits"] < 50
+    assert len(repository) == 50
+    await repository.close()
+
+
+async def test_processes_share_the_database(tmp_path):
+    first = await open_repository(tmp_path)
+    second = await open_repository(tmp_path)
+    orders = [make_order(i) for i in range(4)]
+
+    # Both allocated positions 0 and 1 before either committed
+    first.add_many(orders[:2])
+    second.add_many(orders[2:])
+    await first.flush()
+    await second.flush()
+
+    assert [p for p, _ in first.scan()] == [0, 1, 2, 3]
+    assert [order for _, order in second.scan()] == orders
+    assert await first.get_async(orders[3].order_id) == orders[3]
+    second.add(make_order(5))
+    await second.flush()
+    assert len(first) == 5
+    await first.close()
+    await second.close()
+
+
+async def test_concurrent_lookups_are_batched(tmp_path):
+    repository = await open_repository(tmp_path)
+    orders = [make_order(i) for i in range(20)]
+    repository.add_many(orders)
+    await repository.flush()
+    missing = uuid.uuid4()
+
+    found = await asyncio.gather(
+        *(repository.get_async(order.order_id) for order in orders),
+        repository.get_async(missing),
+    )
+
+    assert found == orders + [None]
+    await repository.close()
+
+
+async def test_queued_orders_are_readable(tmp_path):
+    repository = await open_repository(tmp_path)
+    stored = make_order(1)
+    repository.add(stored)
+    await repository.flush()
+    queued = make_order(3)
+    repository.add(queued)
+
+    assert await repository.get_async(queued.order_id) == queued
+    assert await repository.get_async(uuid.uuid4()) is None
+    assert repository.find_by_currency("EUR") == [stored, queued]
+    assert [order for _, order in repository.scan()] == [stored, queued]
+    assert len(repository) == 2
+    assert await repository.scan_page_async(limit=1) == [(0, stored)]
+    assert await repository.scan_page_async(limit=5) == [(0, stored), (1, queued)]
+    await repository.close()
+
+
+async def test_failed_commit_only_fails_its_batch(tmp_path):
+    repository = await open_repository(tmp_path)
+    order = make_order()
+    repository.add(order)
+    await repository.flush()
+    # Same order_id: the unique index rejects the batch
+    repository.add(order.model_copy(update={"customer_name": "other"}))
+    failing = asyncio.ensure_future(repository.flush())
+    await asyncio.sleep(0)
+    # Queued while the failing batch is being committed
+    later = make_order(2)
+    repository.add(later)
+
+    await repository.flush()
+    with pytest.raises(sqlite3.IntegrityError):
+        await failing
+
+    after = make_order(3)
+    repository.add(after)
+    await repository.flush()
+    assert [o for _, o in repository.scan()] == [order, later, after]
+    await repository.close()
+
+
+def test_repository_requires_open(tmp_path):
+    repository = SqliteOrderRepository(str(tmp_path / "orders.db"))
+
+    with pytest.raises(RuntimeError):
+        repository.add(make_order())
+    with pytest.raises(RuntimeError):
+        repository.get(uuid.uuid4())
@@ -0,0 +1,117 @@
+import httpx
+import pytest
+import respx
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.shared.config.http_config import HTTPClientSettings
+from src.shared.http.client import safe_stream
+from src.shared.http.exceptions import ResponseTooLargeError, ServerError
+from src.shared.http.resilience import UpstreamGuards, upstream_guards
+
+UPSTREAM_URL = "https://upstream.test/large"
+CHUNK = b"x" * 1024
+
+
+class ChunkProducer:
+    """Corps amont produit à la demande, comptant les morceaux générés"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.produced = 0
+
+    async def __aiter__(self):
+        for _ in range(self.chunks):
+            self.produced += 1
+            yield CHUNK
+
+
+@pytest.fixture
+def guards():
+    return UpstreamGuards(HTTPClientSettings())
+
+
+@respx.mock
+async def test_stream_relays_chunks_without_buffering(guards):
+    """Test : les morceaux sont relayés au fur et à mesure"""
+    producer = ChunkProducer(100)
+    respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(200, content=producer))
+
+    async with httpx.AsyncClient() as client:
+        stream = await safe_stream(client, UPSTREAM_URL, guards=guards, chunk_size=1024)
+        assert producer.produced == 0
+
+        received = 0
+        async for chunk in stream:
+            received += len(chunk)
+            # Le corps n'est jamais lu en entier avant d'être relayé
+            assert producer.produced <= received // 1024 + 1
+
+    assert received == 100 * 1024
+    assert stream.completed
+    assert stream.bytes_sent == received
+    assert guards.stats()["upstream.test"]["bulkhead"]["in_flight"] == 0
+
+
+@respx.mock
+async def test_stream_rejects_large_content_length(guards):
+    """Test : un Content-Length trop grand échoue avant tout relais"""
+    respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(200, content=b"x" * 2048))
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ResponseTooLargeError):
+            await safe_stream(client, UPSTREAM_URL, guards=guards, max_bytes=1024)
+
+    assert guards.stats()["upstream.test"]["bulkhead"]["in_flight"] == 0
+
+
+@respx.mock
+async def test_stream_cut_past_max_bytes(guards):
+    """Test : sans Content-Length, le flux est coupé au-delà de la limite"""
+    producer = ChunkProducer(100)
+    respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(200, content=producer))
+
+    async with httpx.AsyncClient() as client:
+        stream = await safe_stream(
+            client, UPSTREAM_URL, guards=guards, max_bytes=4096, chunk_size=1024
+        )
+        with pytest.raises(ResponseTooLargeError):
+            async for _ in stream:
+                pass
+
+    assert producer.produced < 10
+    assert not stream.completed
+    assert guards.stats()["upstream.test"]["bulkhead"]["in_flight"] == 0
+
+
+@respx.mock
+async def test_stream_maps_server_errors(guards):
+    """Test : une 5XX amont est convertie en ServerError"""
+    respx.get(UPSTREAM_URL).mock(return_value=httpx.Response(503, text="down"))
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ServerError):
+            await safe_stream(client, UPSTREAM_URL, guards=guards)
+
+    stats = guards.stats()["upstream.test"]
+    assert stats["breaker"]["failures"] == 1
+    assert stats["bulkhead"]["in_flight"] == 0
+
+
+@respx.mock
+def test_stream_endpoint():
+    """Test de /external-demo/stream contre un httpbin simulé"""
+    upstream_guards.clear()
+    respx.get("https://httpbin.org/stream-bytes/4096").mock(
+        return_value=httpx.Response(
+            200,
+            content=ChunkProducer(4),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+    )
+
+    with TestClient(app) as client:
+        response = client.get("/external-demo/stream", params={"size": 4096})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.content == CHUNK * 4
+    assert upstream_guards.stats()["httpbin.org"]["bulkhead"]["in_flight"] == 0